@@ -7,15 +7,23 @@ Created on Wed Jun 25 17:54:14 2014
 from classes import errorClassesSHM as EC
 import numpy as np
 import annexCeqns as ISO
+import buildingCoeffs as BC
+import stateSpace as SS
+import hourlyResults as HR
+import helpFncs as hF
 #import pdb
 
+# fields of an hourlyResults array in the order of calcNodeTemperatures
+NODE_RESULT_FIELDS = ('phi_m_tot', 'theta_m_t', 'theta_m', 'theta_s',
+                      'theta_air', 'theta_op')
+
 
 
 def checkMode(theta_air_0, theta_set_c, theta_set_h, deadBand):
 
     cooling = theta_air_0 >= theta_set_c + deadBand
 
-    heating = theta_air_0 <= theta_set_h - deadBand    
+    heating = theta_air_0 <= theta_set_h - deadBand
 
     if cooling:
 
@@ -26,32 +34,102 @@ def checkMode(theta_air_0, theta_set_c, theta_set_h, deadBand):
         theta_air_set = theta_set_h
 
     return theta_air_set
-    
-def getAirTemperatures(phi_ia,
-                       phi_m,
-                       phi_st,
-                       phi_h_max,
-                       phi_c_max,
-                       phi_hc_need,
-                       theta_e,
-                       theta_m_t_1,
-                       theta_sup,
-                       C_m,
-                       H_1,
-                       H_2,
-                       H_3,
-                       H_em,
-                       H_is,
-                       H_ms,
-                       H_vent,
-                       H_win):
+
+def checkTemperatures(theta_e, theta_m_t_1, theta_sup):
+    """
+    Raise TempOutOfBoundError if any of the temperatures driving the current
+    timestep is outside of the range -100 to 100 °C.
+    """
     temps = [theta_e, theta_m_t_1, theta_sup]
     for degCentigrade in temps:
         check = degCentigrade < 100 and degCentigrade > -100
         if not check:
             raise EC.TempOutOfBoundError('Error in calculating the temperature'+
             ' for the current timestep.  Temperature is out of range.')
-    
+
+def findInvalidHours(phi_ia, phi_m, phi_st, theta_e, theta_sup):
+    """
+    Check the hourly inputs of a whole calculation period at once.
+
+    Input:
+    phi_ia, phi_m, phi_st - hourly heat flows to the air, mass and surface
+                            nodes [W]
+    theta_e, theta_sup - hourly external and supply air temperatures [C]
+    Arrays of n hours, or n hours by N buildings in which case an hour is
+    reported when the input of any building is invalid.
+
+    Output:
+    report - dict of input name to the indices of the hours in which it is
+             invalid.  Temperatures must be within -100 to 100 C and heat
+             flows must be finite.  Valid inputs are left out, so an empty
+             dict means the inputs can be run with validated = True.
+    """
+    report = {}
+    args = [('phi_ia', phi_ia, False), ('phi_m', phi_m, False),
+            ('phi_st', phi_st, False), ('theta_e', theta_e, True),
+            ('theta_sup', theta_sup, True)]
+    for name, arg, isTemp in args:
+        arg = np.asarray(arg, dtype = float)
+        if isTemp:
+            # written so that nan is caught as well
+            with np.errstate(invalid = 'ignore'):
+                bad = ~((arg < 100) & (arg > -100))
+        else:
+            bad = ~np.isfinite(arg)
+        if bad.ndim > 1:
+            bad = bad.reshape((bad.shape[0], -1)).any(axis = 1)
+        hours = np.flatnonzero(bad)
+        if len(hours) > 0:
+            report[name] = hours
+    return report
+
+def validateHourlyInputs(phi_ia, phi_m, phi_st, theta_e, theta_sup):
+    """
+    Raise one error for all the invalid hours found by findInvalidHours,
+    instead of stopping at the first of them during the run.
+    TempOutOfBoundError is raised when a temperature is out of range,
+    otherwise ValueError for heat flows that are not finite.
+    """
+    report = findInvalidHours(phi_ia, phi_m, phi_st, theta_e, theta_sup)
+    if not report:
+        return
+
+    lines = []
+    for name in sorted(report):
+        hours = report[name]
+        listed = ', '.join([str(hour) for hour in hours[:10]])
+        if len(hours) > 10:
+            listed += ', ...'
+        lines.append('%s invalid in %d hours: %s' % (name, len(hours),
+                                                      listed))
+    message = 'Invalid hourly inputs.\n' + '\n'.join(lines)
+
+    if 'theta_e' in report or 'theta_sup' in report:
+        raise EC.TempOutOfBoundError(message)
+    raise ValueError(message)
+
+def calcNodeTemperatures(phi_ia,
+                         phi_m,
+                         phi_st,
+                         phi_hc_need,
+                         theta_e,
+                         theta_m_t_1,
+                         theta_sup,
+                         C_m,
+                         H_1,
+                         H_2,
+                         H_3,
+                         H_em,
+                         H_is,
+                         H_ms,
+                         H_vent,
+                         H_win):
+    """
+    Solve the Annex C network for one timestep without any bounds checking.
+
+    Output:
+    tuple of (phi_m_tot, theta_m_t, theta_m, theta_s, theta_air, theta_op)
+    """
     phi_m_tot = ISO.calcQ_mtot(Q_m = phi_m, Q_st = phi_st, Q_ia = phi_ia,
                                Q_d = phi_hc_need, H_em = H_em, H_win = H_win,
                                H_v = H_vent, H_1 = H_1, H_2 = H_2, H_3= H_3,
@@ -59,34 +137,28 @@ def getAirTemperatures(phi_ia,
 
     theta_m_t = ISO.calcTheta_mt(theta_mt_1 = theta_m_t_1, C_m = C_m,
                                  H_3 = H_3, H_em = H_em, Q_mtot = phi_m_tot)
-    
+
     theta_m = ISO.calcTheta_m(theta_m_t, theta_m_t_1)
-    
+
     theta_s = ISO.calcTheta_s(Q_st = phi_st, Q_ia = phi_ia, Q_d = phi_hc_need,
-                              H_ms = H_ms, H_win = H_win, H_v = H_vent, 
+                              H_ms = H_ms, H_win = H_win, H_v = H_vent,
                               H_1 = H_1, theta_e = theta_e,
                               theta_airin = theta_sup, theta_m = theta_m)
-    
+
     theta_air = ISO.calcTheta_i(Q_ia = phi_ia, Q_d = phi_hc_need,
                                 H_is = H_is, H_v = H_vent,
                                 theta_s = theta_s, theta_airin = theta_sup)
-    
+
     theta_op = ISO.calcTheta_op(theta_i = theta_air, theta_s = theta_s)
-    
-    result = np.array([phi_m_tot, theta_m_t, theta_m, theta_s, theta_air,
-                       theta_op])
-    return result
 
-def calcBuildingDemand(
-                       phi_ia,
+    return phi_m_tot, theta_m_t, theta_m, theta_s, theta_air, theta_op
+
+def getAirTemperatures(phi_ia,
                        phi_m,
                        phi_st,
                        phi_h_max,
                        phi_c_max,
-                       phi_hc_need_10,
-                       theta_set_c,
-                       theta_set_h,
-                       deadBand,
+                       phi_hc_need,
                        theta_e,
                        theta_m_t_1,
                        theta_sup,
@@ -98,142 +170,406 @@ def calcBuildingDemand(
                        H_is,
                        H_ms,
                        H_vent,
-                       H_win):
-  
+                       H_win,
+                       validated = False,
+                       out = None):
+    """
+    Node temperatures of one timestep for a given heating/cooling need.
+
+    Output:
+    result - array of phi_m_tot, theta_m_t, theta_m, theta_s, theta_air and
+             theta_op.  When out is a row of an hourlyResults array the
+             values are written to its fields instead and out is returned.
+    """
+    if not validated:
+        checkTemperatures(theta_e, theta_m_t_1, theta_sup)
+
+    nodes = calcNodeTemperatures(phi_ia, phi_m, phi_st, phi_hc_need, theta_e,
+                                 theta_m_t_1, theta_sup, C_m, H_1, H_2, H_3,
+                                 H_em, H_is, H_ms, H_vent, H_win)
+    if out is None:
+        return np.array(nodes)
+
+    for name, value in zip(NODE_RESULT_FIELDS, nodes):
+        out[name] = value
+    return out
+
+def solveHourDemand(
+                    phi_ia,
+                    phi_m,
+                    phi_st,
+                    phi_h_max,
+                    phi_c_max,
+                    phi_hc_need_10,
+                    theta_set_c,
+                    theta_set_h,
+                    deadBand,
+                    theta_e,
+                    theta_m_t_1,
+                    theta_sup,
+                    C_m,
+                    H_1,
+                    H_2,
+                    H_3,
+                    H_em,
+                    H_is,
+                    H_ms,
+                    H_vent,
+                    H_win):
+    """
+    Steps 1 to 4 of the calculation procedure in C.4 of ISO 13790-2008 for a
+    single hour.  Temperatures are not bounds checked.
+
+    Output:
+    tuple of (actual need, theta_m_t, unrestricted need, theta_air)
+    """
     # step 1
-    phi_hc_need = 0 
+    phi_hc_need = 0
 
-    resStep1 = getAirTemperatures(phi_ia, phi_m, phi_st, phi_h_max, phi_c_max,
-                       phi_hc_need, theta_e, theta_m_t_1, theta_sup, C_m, H_1,
-                       H_2, H_3, H_em, H_is, H_ms, H_vent, H_win)
+    resStep1 = calcNodeTemperatures(phi_ia, phi_m, phi_st, phi_hc_need,
+                                    theta_e, theta_m_t_1, theta_sup, C_m, H_1,
+                                    H_2, H_3, H_em, H_is, H_ms, H_vent, H_win)
 
     theta_air_0 = resStep1[4]
 
     theta_m_t = resStep1[1]
-    
-    cond1 = resStep1[4] >= theta_set_h - deadBand 
 
-    cond2 = resStep1[4] <= theta_set_c + deadBand
-    #pdb.set_trace()
-    if  cond1 and cond2:
+    cond1 = theta_air_0 >= theta_set_h - deadBand
 
-        phi_hc_need_ac = phi_hc_need
+    cond2 = theta_air_0 <= theta_set_c + deadBand
 
-        phi_hc_need_un = phi_hc_need
+    if  cond1 and cond2:
 
-        theta_air_ac = resStep1[4]
-
-        result = np.array([phi_hc_need_ac, theta_m_t, phi_hc_need_un,
-                           theta_air_ac])
-    else:
-        #pdb.set_trace()
+        return phi_hc_need, theta_m_t, phi_hc_need, theta_air_0
 
     # step 2 (if necessary)
-        theta_air_set = checkMode(theta_air_0, theta_set_c, theta_set_h,
-                                  deadBand)
+    theta_air_set = checkMode(theta_air_0, theta_set_c, theta_set_h,
+                              deadBand)
 
-        resStep2 = getAirTemperatures(phi_ia, phi_m, phi_st, phi_h_max, 
-                       phi_c_max, phi_hc_need_10, theta_e, theta_m_t_1,
-                       theta_sup, C_m, H_1, H_2, H_3, H_em, H_is,
-                       H_ms, H_vent, H_win)
+    resStep2 = calcNodeTemperatures(phi_ia, phi_m, phi_st, phi_hc_need_10,
+                                    theta_e, theta_m_t_1, theta_sup, C_m, H_1,
+                                    H_2, H_3, H_em, H_is, H_ms, H_vent, H_win)
 
-        theta_air_10 = resStep2[4]
+    theta_air_10 = resStep2[4]
 
-        delT_set = (theta_air_set - theta_air_0)
+    delT_set = (theta_air_set - theta_air_0)
 
-        delT_10 = (theta_air_10 - theta_air_0)
-        
-        phi_hc_need_un = phi_hc_need_10*delT_set/delT_10
+    delT_10 = (theta_air_10 - theta_air_0)
 
-        # step 3    
-        #pdb.set_trace()
-        powCheck1 = phi_hc_need_un >= phi_c_max
+    phi_hc_need_un = phi_hc_need_10*delT_set/delT_10
 
-        powCheck2 = phi_hc_need_un <= phi_h_max
-        
-        if powCheck1 and powCheck2:
-            
-            resStep3 = getAirTemperatures(phi_ia, phi_m, phi_st, phi_h_max, 
-                       phi_c_max, phi_hc_need_un, theta_e, theta_m_t_1,
-                       theta_sup, C_m, H_1, H_2, H_3, H_em, H_is,
-                       H_ms, H_vent, H_win)
+    # step 3
+    powCheck1 = phi_hc_need_un >= phi_c_max
 
-            theta_m_t = resStep3[1]
+    powCheck2 = phi_hc_need_un <= phi_h_max
 
-            phi_hc_need_ac = phi_hc_need_un
+    if powCheck1 and powCheck2:
 
-            theta_air_ac = theta_air_set
+        resStep3 = calcNodeTemperatures(phi_ia, phi_m, phi_st, phi_hc_need_un,
+                                        theta_e, theta_m_t_1, theta_sup, C_m,
+                                        H_1, H_2, H_3, H_em, H_is, H_ms,
+                                        H_vent, H_win)
 
-            result = np.array([phi_hc_need_ac, theta_m_t, phi_hc_need_un,
-                               theta_air_ac])
-        
-        # step 4 (if necessary)
-        else:
-            #pdb.set_trace()
+        return phi_hc_need_un, resStep3[1], phi_hc_need_un, theta_air_set
 
-            if phi_hc_need_un < 0:
+    # step 4 (if necessary)
+    if phi_hc_need_un < 0:
 
-                phi_hc_need_max = phi_c_max
+        phi_hc_need_max = phi_c_max
 
-            elif phi_hc_need_un > 0:
+    elif phi_hc_need_un > 0:
 
-                phi_hc_need_max = phi_h_max
+        phi_hc_need_max = phi_h_max
 
-            else:
+    else:
 
-                raise EC.ZoneResponseError('For some reason the un-restricted ' 
-                 + 'heating/cooling need is zero, but we are in Step 4 of the '
-                 + 'calculation.')
-            
-            resStep4 = getAirTemperatures(phi_ia, phi_m, phi_st, phi_h_max, 
-                       phi_c_max, phi_hc_need_max, theta_e, theta_m_t_1,
-                       theta_sup, C_m, H_1, H_2, H_3, H_em, H_is,
-                       H_ms, H_vent, H_win)
-            
-            phi_hc_need_ac = phi_hc_need_max
+        raise EC.ZoneResponseError('For some reason the un-restricted '
+         + 'heating/cooling need is zero, but we are in Step 4 of the '
+         + 'calculation.')
 
-            theta_m_t = resStep4[1]
+    resStep4 = calcNodeTemperatures(phi_ia, phi_m, phi_st, phi_hc_need_max,
+                                    theta_e, theta_m_t_1, theta_sup, C_m, H_1,
+                                    H_2, H_3, H_em, H_is, H_ms, H_vent, H_win)
 
-            theta_air_ac = resStep4[4]
+    return phi_hc_need_max, resStep4[1], phi_hc_need_un, resStep4[4]
 
-            result = np.array([phi_hc_need_ac, theta_m_t, phi_hc_need_un,
-                               theta_air_ac])
-    #pdb.set_trace()
-    return result
+def calcBuildingDemand(
+                       phi_ia,
+                       phi_m,
+                       phi_st,
+                       phi_h_max,
+                       phi_c_max,
+                       phi_hc_need_10,
+                       theta_set_c,
+                       theta_set_h,
+                       deadBand,
+                       theta_e,
+                       theta_m_t_1,
+                       theta_sup,
+                       C_m,
+                       H_1,
+                       H_2,
+                       H_3,
+                       H_em,
+                       H_is,
+                       H_ms,
+                       H_vent,
+                       H_win,
+                       validated = False,
+                       out = None):
+    """
+    Steps 1 to 4 of C.4 for one hour.
+
+    Output:
+    result - array of actual need, theta_m_t, unrestricted need and
+             theta_air.  When out is a row of an hourlyResults array the
+             values are written to its fields instead and out is returned.
+    """
+    if not validated:
+        checkTemperatures(theta_e, theta_m_t_1, theta_sup)
+
+    demand = solveHourDemand(phi_ia, phi_m, phi_st, phi_h_max, phi_c_max,
+                             phi_hc_need_10, theta_set_c, theta_set_h,
+                             deadBand, theta_e, theta_m_t_1, theta_sup, C_m,
+                             H_1, H_2, H_3, H_em, H_is, H_ms, H_vent, H_win)
+    if out is None:
+        return np.array(demand)
+
+    for name, value in zip(HR.DEMAND_FIELDS, demand):
+        out[name] = value
+    return out
+
+def calcBuildingDemandWrap(phi_ia,
+                           phi_m,
+                           phi_st,
+                           theta_e,
+                           theta_sup,
+                           theta_set_c,
+                           theta_set_h,
+                           deadBand,
+                           phi_h_max,
+                           phi_c_max,
+                           phi_hc_need_10,
+                           theta_m_0,
+                           C_m,
+                           H_1,
+                           H_2,
+                           H_3,
+                           H_em,
+                           H_is,
+                           H_ms,
+                           H_vent,
+                           H_win,
+                           solver = 'iso',
+                           validated = False,
+                           out = None,
+                           strict = True,
+                           startDay = None,
+                           calendar = None):
+    """
+    Run calcBuildingDemand over every hour of the calculation period.  The
+    mass temperature theta_m_t of each hour is carried forward as theta_m_t_1
+    of the next hour.
+
+    Input:
+    phi_ia, phi_m, phi_st - hourly heat flows to the air, mass and surface
+                            nodes per annex C.2 [W]
+    theta_e - hourly external air temperature [C]
+    theta_sup - hourly supply air temperature [C]
+    theta_set_c, theta_set_h - cooling and heating set points [C]
+    deadBand - dead band around the set points [K]
+    phi_h_max, phi_c_max - heating (positive) and cooling (negative)
+                           capacity [W]
+    The set points, dead band and capacities are single values, one value
+    per hour, or a tuple of weekday and weekend profiles of 24 hours, see
+    helpFncs.expandHourly.
+    phi_hc_need_10 - heating power used to probe the zone response [W].
+                     Not used by the analytic solver.
+    theta_m_0 - mass temperature at the end of the hour before the period [C]
+    C_m, H_1, H_2, H_3, H_em, H_is, H_ms, H_vent, H_win - time invariant
+                            building coefficients
+                            H_vent may also be given with one value per
+                            hour, e.g. from the ventilation flow of
+                            genIntGains.  H_1, H_2 and H_3 must then be None
+                            and are calculated once for every distinct
+                            value, see buildingCoeffs.coefficientLevels.
+    solver - 'iso' follows the steps of C.4 with three evaluations of the
+             network per conditioned hour.  'analytic' uses the state space
+             form of stateSpace, with the need taken from the free floating
+             air temperature and the need sensitivities of
+             buildingCoeffs.BuildingCoefficients.
+    validated - the hourly inputs are checked with validateHourlyInputs
+                before the run, which reports every invalid hour at once.
+                Set to True for inputs that have already been checked to
+                skip this and the check of the mass temperature in every
+                hour.
+    out - optional results array of N hours from hourlyResults.createResults.
+          The solver writes the need and theta_m_t straight into it and the
+          other node temperatures are then filled in for all hours at once.
+    strict - raise TempOutOfBoundError, ValueError or ZoneResponseError for
+             the first hour that can not be solved.  With strict False these
+             hours are flagged in the status field of the results and the
+             run carries on, see hourlyResults for the flags.  Hours with
+             invalid inputs are not solved and the next hour starts from the
+             last finite mass temperature.
+    startDay - day of the week of the first hour, 1 to 7.  Needed when any
+               of the settings is given as weekday and weekend profiles.
+    calendar - simCalendar.SimulationCalendar of the period, used instead of
+               startDay.  A calendar of several years is run in one go, so
+               the mass temperature carries over the year boundaries.
+
+    Output:
+    result - N x 4 array with the columns actual need, theta_m_t,
+             unrestricted need and theta_air for every hour, or out with all
+             of its fields filled in when out is given.  With strict False
+             the results array is always returned, allocated when out is
+             not given.
+    """
+    if solver not in ['iso', 'analytic']:
+        raise ValueError("Valid solvers are: 'iso', 'analytic'.")
+
+    theta_e = np.asarray(theta_e, dtype = float)
+    nHours = len(theta_e)
+
+    hourly = [np.ones(nHours)*np.asarray(arg, dtype = float) for arg in
+              [phi_ia, phi_m, phi_st, theta_e, theta_sup]]
+    hourly += [hF.expandHourly(arg, nHours, startDay, calendar) for arg in
+               [theta_set_c, theta_set_h, deadBand, phi_h_max, phi_c_max]]
+    phi_ia, phi_m, phi_st, theta_e, theta_sup, theta_set_c, theta_set_h, \
+    deadBand, phi_h_max, phi_c_max = hourly
+
+    if out is None and not strict:
+        out = HR.createResults(nHours)
+
+    if out is None:
+        result = np.zeros((nHours, 4))
+        status = None
+    else:
+        if out.shape != (nHours,):
+            raise ValueError('out must hold one result per hour.')
+        result = HR.demandColumns(out)
+        status = out['status']
+        status[:] = HR.STATUS_OK
+
+    invalidHours = np.array([], dtype = int)
+    if not validated and strict:
+        validateHourlyInputs(phi_ia, phi_m, phi_st, theta_e, theta_sup)
+    elif not validated:
+        report = findInvalidHours(phi_ia, phi_m, phi_st, theta_e, theta_sup)
+        if report:
+            invalidHours = np.unique(np.concatenate(report.values()))
+            status[invalidHours] |= HR.STATUS_OUT_OF_RANGE
+
+    if np.ndim(H_vent) > 0:
+        if len(H_vent) != nHours:
+            raise ValueError('An hourly H_vent must have one value per hour.')
+        if not (H_1 is None and H_2 is None and H_3 is None):
+            raise ValueError('H_1, H_2 and H_3 are calculated from an hourly ' +
+                             'H_vent and must be None.')
+        coefLevels, level = BC.coefficientLevels(C_m, H_em, H_is, H_ms,
+                                                 H_vent, H_win)
+        coef = BC.pickLevels(coefLevels, level)
+        H_1, H_2, H_3, H_vent = coef.H_1, coef.H_2, coef.H_3, coef.H_vent
+    else:
+        coefLevels = None
+        coef = BC.BuildingCoefficients(C_m, H_em, H_is, H_ms, H_vent, H_win,
+                                       H_1 = H_1, H_2 = H_2, H_3 = H_3)
 
-def calcBuildingDemandWrap():
-    # This is the wrapper to the calcBuildingDemand function.
-    #     phi_ia,
-#                       phi_m,
-#                       phi_st,
-#                       phi_h_max,
-#                       phi_c_max,
-#                       phi_hc_need_10,
-#                       theta_set_c,
-#                       theta_set_h,
-#                       deadBand,
-#                       theta_e,
-#                       theta_m_t_1,
-#                       theta_sup,
-#                       C_m,
-#                       H_1,
-#                       H_2,
-#                       H_3,
-#                       H_em,
-#                       H_is,
-#                       H_ms,
-#                       H_vent,
-#                       H_win
-    # This function calls the pre-functions required.  I guess these could all
-    # be methods of the ISOBuilding class, but....
-    
-    # Which are time dependent inputs to calcBuildingDemand and which aren't?
-    
-    # What is the proper specification of the loop?
-    # This function needs Qint and Qsol for each hour that calcBuildingDemand 
-    # is to be calculated..
-    
-    # What are the inputs?
-    
-    pass
-    
\ No newline at end of file
+    if solver == 'analytic':
+        if coefLevels is None:
+            ss = SS.StateSpaceCoefficients(coef)
+        else:
+            # the state space coefficients of each level, looked up per hour
+            ss = BC.pickLevels(SS.StateSpaceCoefficients(coefLevels), level)
+        b, r = SS.calcDriverTerms(ss, phi_ia, phi_m, phi_st, theta_e,
+                                  theta_sup)
+        b[invalidHours] = np.nan
+        r[invalidHours] = np.nan
+        # hours with invalid inputs are expected to give nan in lenient runs
+        invalidValues = np.geterr()['invalid'] if strict else 'ignore'
+        with np.errstate(invalid = invalidValues):
+            SS.runStateSpace(ss, b, r, theta_set_c, theta_set_h, deadBand,
+                             phi_h_max, phi_c_max, theta_m_0,
+                             checkBounds = not validated, out = result,
+                             strict = strict, status = status)
+    else:
+        solveIsoHours(result, hourly, phi_hc_need_10, theta_m_0, C_m, H_1,
+                      H_2, H_3, H_em, H_is, H_ms, H_vent, H_win, validated,
+                      strict = strict, status = status,
+                      invalidHours = invalidHours)
+
+    if out is None:
+        return result
+    return HR.fillNodeTemperatures(coef, out, phi_ia, phi_m, phi_st, theta_e,
+                                   theta_sup, theta_m_0)
+
+def solveIsoHours(result, hourly, phi_hc_need_10, theta_m_0, C_m, H_1, H_2,
+                  H_3, H_em, H_is, H_ms, H_vent, H_win, validated,
+                  strict = True, status = None, invalidHours = ()):
+    """
+    Hour loop of calcBuildingDemandWrap for the iso solver.  Writes the rows
+    of the N x 4 array result in place, and the hourlyResults flags of every
+    hour to status when given.  With strict False the hours in invalidHours
+    are not solved, and a mass temperature that is not finite is replaced by
+    the last finite one, as in stateSpace.runStateSpace.  H_1, H_2, H_3 and
+    H_vent are single values or one value per hour.
+    """
+    # Python floats make the scalar arithmetic of the hour loop much cheaper
+    # than indexing numpy arrays element by element.
+    phi_ia, phi_m, phi_st, theta_e, theta_sup, theta_set_c, theta_set_h, \
+    deadBand, phi_h_max, phi_c_max = [arg.tolist() for arg in hourly]
+    nHours = len(theta_e)
+    H_1, H_2, H_3, H_vent = [(np.ones(nHours)*arg).tolist() for arg in
+                             [H_1, H_2, H_3, H_vent]]
+    invalidHours = set(invalidHours)
+
+    theta_m_t_1 = theta_m_0
+    for hour in range(nHours):
+
+        if hour in invalidHours:
+            result[hour] = (0.0, np.nan, 0.0, np.nan)
+            theta_m_t_1 = np.nan
+            continue
+
+        if not strict and not np.isfinite(theta_m_t_1):
+            # restart after an hour that was not solved
+            theta_m_t_1 = SS.lastFinite(result[:hour, 1], theta_m_0)
+
+        # the inputs of the whole period are checked by the caller, so only
+        # the mass temperature is left to check every hour
+        if not validated and not (theta_m_t_1 < 100 and theta_m_t_1 > -100):
+            if strict:
+                raise EC.TempOutOfBoundError('Error in calculating the ' +
+                    'temperature for the current timestep.  Temperature is ' +
+                    'out of range.')
+            status[hour] |= HR.STATUS_OUT_OF_RANGE
+
+        try:
+            resHour = solveHourDemand(phi_ia[hour], phi_m[hour],
+                                      phi_st[hour], phi_h_max[hour],
+                                      phi_c_max[hour], phi_hc_need_10,
+                                      theta_set_c[hour], theta_set_h[hour],
+                                      deadBand[hour],
+                                      theta_e[hour], theta_m_t_1,
+                                      theta_sup[hour], C_m, H_1[hour],
+                                      H_2[hour], H_3[hour], H_em, H_is, H_ms,
+                                      H_vent[hour], H_win)
+        except EC.ZoneResponseError:
+            if strict:
+                raise
+            status[hour] |= HR.STATUS_ZERO_NEED
+            resStep1 = calcNodeTemperatures(phi_ia[hour], phi_m[hour],
+                                            phi_st[hour], 0.0, theta_e[hour],
+                                            theta_m_t_1, theta_sup[hour], C_m,
+                                            H_1[hour], H_2[hour], H_3[hour],
+                                            H_em, H_is, H_ms, H_vent[hour],
+                                            H_win)
+            resHour = (0.0, resStep1[1], 0.0, resStep1[4])
+
+        if status is not None and resHour[0] != resHour[2]:
+            status[hour] |= HR.STATUS_LIMITED
+        result[hour] = resHour
+
+        theta_m_t_1 = resHour[1]
+
+    return result
@@ -231,7 +231,7 @@ def calcQ_mtot(Q_m, Q_st, Q_ia, Q_d,
     return Q_mtot
 
 def calcQ_int(phi_oc, phi_app, phi_light, phi_wa, phi_hvac, phi_proc,
-              phi_adj, adjFac = 0.5):
+              phi_adj, adjFac = 0.5, checkArgs = True):
     """
     
     Summation of heat sources for the hour.  Per equation 35 of ISO 13790-2008.
@@ -247,12 +247,30 @@ def calcQ_int(phi_oc, phi_app, phi_light, phi_wa, phi_hvac, phi_proc,
     adjFac - adjustment factor for gains from unconditioned adjacent spaces.
              Find actual value from ISO 15193
     phi_adj - heat gained from an adjacent unconditioned Space [W]
+    checkArgs - check that the arguments are all floats or all arrays of
+                the same shape.  Turn off for gains that are already known
+                to be consistent, e.g. inside an hourly loop.
     
     Outputs:
     
     Qint - internal heat gain of the thermal zone for the hour of 
            calculation. [W]
     
+    """
+    if checkArgs:
+        checkQ_intArgs(phi_oc, phi_app, phi_light, phi_wa, phi_hvac, phi_proc,
+                       phi_adj)
+    
+    Qint = phi_oc + phi_app + phi_light + phi_wa + phi_hvac + phi_proc\
+    + (1-adjFac)*phi_adj
+    
+    return Qint
+
+def checkQ_intArgs(phi_oc, phi_app, phi_light, phi_wa, phi_hvac, phi_proc,
+                   phi_adj):
+    """
+    Raise ScheduleError unless the internal gain arguments of calcQ_int are
+    either all floats or all numpy arrays of the same shape.
     """
     phi_args = [phi_oc, phi_app, phi_light, 
                 phi_wa, phi_hvac, phi_proc, phi_adj]
@@ -266,16 +284,10 @@ def calcQ_int(phi_oc, phi_app, phi_light, phi_wa, phi_hvac, phi_proc,
         + '  Either all float or all numpy ndarray.')
     
     if check2:
-        check3 = np.all(map(np.shape,
-                            phi_args))
+        check3 = len(set(map(np.shape, phi_args))) == 1
         if not check3:
-            raise EC.SchuedleError('Internal gain arguments must be the same'
+            raise EC.ScheduleError('Internal gain arguments must be the same'
             + ' shape.')
-    
-    Qint = phi_oc + phi_app + phi_light + phi_wa + phi_hvac + phi_proc\
-    + (1-adjFac)*phi_adj
-    
-    return Qint
 
 def calcPhi_oc(occDen, area, actLev, schFra):
     """
@@ -372,6 +384,127 @@ def calcPhi_genDis(qAvg, lenDis, schFra):
     
     return phi_genDis   
     
+def calcPhi_ocArray(occDen, area, actLev, schFra):
+    """
+    Occupant gains of many buildings and hours at once, per calcPhi_oc.
+    
+    Input
+    occDen - peak occupant density, one value or one per building
+             [people/m2]
+    area - conditioned floor area, one value or one per building [m2]
+    actLev - activity level, one value, one per building, or a buildings
+             x hours array [W/person].  An hourly activity level of a
+             single building is a 1 x hours array.
+    schFra - fraction of peak occupancy, hours or buildings x hours []
+    
+    Output
+    phi_oc - buildings x hours array of the occupant gains [W]
+    """
+    perBldg = [occDen, area]
+    hourly = [schFra]
+    if np.ndim(actLev) < 2:
+        perBldg.append(actLev)
+    else:
+        hourly.append(actLev)
+    cols, rows, shape = checkGainArrays(perBldg, hourly)
+    
+    return fillGainArray(cols, rows, shape)
+
+def calcPhi_genArray(peaDen, area, schFra):
+    """
+    General gains of many buildings and hours at once, per calcPhi_gen.
+    
+    Input
+    peaDen - peak power density, one value or one per building [W/m2]
+    area - conditioned floor area, one value or one per building [m2]
+    schFra - fraction of peak use, hours or buildings x hours []
+    
+    Output
+    phi_gen - buildings x hours array of the gains [W]
+    """
+    cols, rows, shape = checkGainArrays([peaDen, area], [schFra])
+    
+    return fillGainArray(cols, rows, shape)
+
+def calcPhi_genDisArray(qAvg, lenDis, schFra):
+    """
+    Distribution gains of many buildings and hours at once, per
+    calcPhi_genDis.  Negative values are allowed for sinks.
+    
+    Input
+    qAvg - average recoverable heat, one value or one per building [W/m]
+    lenDis - length of pipe, one value or one per building [m]
+    schFra - fraction of use, hours or buildings x hours []
+    
+    Output
+    phi_genDis - buildings x hours array of the gains [W]
+    """
+    cols, rows, shape = checkGainArrays([qAvg, lenDis], [schFra],
+                                        signed = True)
+    
+    return fillGainArray(cols, rows, shape)
+
+def checkGainArrays(perBldg, hourly, signed = False):
+    """
+    Check the arguments of the array gain functions in one pass.
+    
+    Input
+    perBldg - list of values given once, or once per building
+    hourly - list of values given per hour, as hours or buildings x hours
+    signed - allow negative values
+    
+    Output
+    cols - perBldg as buildings x 1 arrays
+    rows - hourly as 1 x hours or buildings x hours arrays
+    shape - (buildings, hours) of the gains
+    
+    Raises ScheduleError for arrays of more dimensions, counts of buildings
+    or hours that disagree, values that are not finite and, unless signed,
+    negative values.
+    """
+    cols = [np.asarray(value, dtype = float) for value in perBldg]
+    rows = [np.asarray(value, dtype = float) for value in hourly]
+    if any([col.ndim > 1 for col in cols]):
+        raise EC.ScheduleError('Densities, areas and lengths must be single ' +
+                               'values or one value per building.')
+    if any([row.ndim == 0 or row.ndim > 2 for row in rows]):
+        raise EC.ScheduleError('Schedules must be hours or buildings x ' +
+                               'hours arrays.')
+    rows = [row.reshape((1, -1)) if row.ndim == 1 else row for row in rows]
+    
+    nBldgs = set([col.size for col in cols if col.ndim == 1] +
+                 [row.shape[0] for row in rows if row.shape[0] != 1])
+    nHours = set([row.shape[1] for row in rows])
+    if len(nBldgs) > 1 or len(nHours) > 1:
+        raise EC.ScheduleError('All arguments must have the same number of ' +
+                               'buildings and hours.')
+    
+    for value in cols + rows:
+        if not np.all(np.isfinite(value)):
+            raise EC.ScheduleError('Gain arguments must be finite.')
+        if not signed and np.any(value < 0):
+            raise EC.ScheduleError('Gains should be positive.  Check inputs.')
+    
+    shape = (nBldgs.pop() if nBldgs else 1, nHours.pop())
+    return [col.reshape((-1, 1)) for col in cols], rows, shape
+
+def fillGainArray(cols, rows, shape):
+    """
+    Element-wise product of the checked arguments as a buildings x hours
+    array.  The per building values are multiplied first, so there is a
+    single product over the hours.
+    """
+    peak = np.ones((shape[0], 1))
+    for col in cols:
+        peak = peak*col
+    hourly = rows[0]
+    for row in rows[1:]:
+        hourly = hourly*row
+    
+    phi = np.empty(shape)
+    np.multiply(peak, hourly, out = phi)
+    return phi
+
 def caclPhi_sol_k(shdFac, effArea, solIrr, skyFac, phi_sky):
     """
     Equation 43 of ISO 13790-2008
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:05:47 2026
+
+@author: mstreet
+"""
+import numpy as np
+import annexCeqns as ISO
+
+# The coefficients of the Annex C network do not change from hour to hour.
+# BuildingCoefficients computes them once, together with the denominators
+# of equations C.4 to C.11, and the step functions below use them to solve
+# an hour.  The step functions work element wise, so a BuildingCoefficients
+# built from arrays of N buildings steps all N buildings at once.
+
+
+class BuildingCoefficients(object):
+    """
+    Read only store of the time invariant coefficients of one building (or
+    of N buildings when built from arrays).
+
+    Input:
+    C_m - effective mass of the building [J/K]
+    H_em - transmission coeff. between exterior and mass node [W/K]
+    H_is - coupling conductance between nodes i & s [W/K]
+    H_ms - coupling conductance between nodes m & s [W/K]
+    H_vent - ventilation heat transfer coefficient [W/K]
+    H_win - transmission coeff. of windows [W/K]
+    H_1, H_2, H_3 - optional, calculated with annexCeqns when not given.
+
+    Derived attributes:
+    c - C_m in Wh/K, h - H_3 + H_em
+    a_mt - c - 0.5*h, inv_b_mt - 1/(c + 0.5*h) of eqn. C.4
+    r_32 - H_3/H_2 of eqn. C.5
+    inv_H_vent - 1/H_vent
+    inv_b_s - 1/(H_ms + H_win + H_1) of eqn. C.10
+    inv_b_i - 1/(H_is + H_vent) of eqn. C.11
+    dTheta_m_t, dTheta_air - response of theta_m_t and theta_air to one
+                             watt of heating/cooling need [K/W]
+    """
+    __slots__ = ('C_m', 'H_1', 'H_2', 'H_3', 'H_em', 'H_is', 'H_ms',
+                 'H_vent', 'H_win', 'c', 'h', 'a_mt', 'inv_b_mt', 'r_32',
+                 'inv_H_vent', 'inv_b_s', 'inv_b_i', 'dTheta_m_t',
+                 'dTheta_air')
+
+    def __init__(self, C_m, H_em, H_is, H_ms, H_vent, H_win,
+                 H_1 = None, H_2 = None, H_3 = None):
+        if H_1 is None:
+            H_1 = ISO.calcH_1(H_vent, H_is)
+        if H_2 is None:
+            H_2 = ISO.calcH_2(H_1, H_win)
+        if H_3 is None:
+            H_3 = ISO.calcH_3(H_2, H_ms)
+
+        c = C_m/3600.0
+        h = H_3 + H_em
+        inv_b_mt = 1.0/(c + 0.5*h)
+        inv_H_vent = 1.0/H_vent
+        inv_b_s = 1.0/(H_ms + H_win + H_1)
+        inv_b_i = 1.0/(H_is + H_vent)
+
+        dTheta_m_t = H_3*H_1*inv_H_vent*inv_b_mt/H_2
+        dTheta_s = (0.5*H_ms*dTheta_m_t + H_1*inv_H_vent)*inv_b_s
+        dTheta_air = (H_is*dTheta_s + 1.0)*inv_b_i
+
+        values = dict(C_m = C_m, H_1 = H_1, H_2 = H_2, H_3 = H_3,
+                      H_em = H_em, H_is = H_is, H_ms = H_ms, H_vent = H_vent,
+                      H_win = H_win, c = c, h = h, a_mt = c - 0.5*h,
+                      inv_b_mt = inv_b_mt, r_32 = H_3/H_2,
+                      inv_H_vent = inv_H_vent, inv_b_s = inv_b_s,
+                      inv_b_i = inv_b_i, dTheta_m_t = dTheta_m_t,
+                      dTheta_air = dTheta_air)
+
+        for name in self.__slots__:
+            value = np.array(values[name], dtype = float)
+            if value.ndim == 0:
+                value = float(value)
+            else:
+                value.flags.writeable = False
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('BuildingCoefficients are read only.')
+
+    def __delattr__(self, name):
+        raise AttributeError('BuildingCoefficients are read only.')
+
+def coefficientLevels(C_m, H_em, H_is, H_ms, H_vent, H_win):
+    """
+    Coefficients for a ventilation coefficient that changes from hour to
+    hour.  Ventilation usually follows a few schedule levels, so the
+    coefficients are calculated once for every distinct value of H_vent
+    and each hour only looks up its level, see pickLevels.  The levels of
+    each building are found separately, so the table grows with the
+    number of levels of a building and not with the size of a portfolio.
+
+    Input:
+    C_m, H_em, H_is, H_ms, H_win - single values, or N values for N
+                                   buildings
+    H_vent - hourly ventilation coefficient, n hours or n hours by N
+             buildings [W/K].  H_1, H_2 and H_3 are calculated from it.
+
+    Output:
+    coef - BuildingCoefficients of the L distinct values of H_vent, with
+           arrays of L values, or N x L for N buildings with L the most
+           levels of any building, see uniqueColumns
+    level - index of the level of every hour, with the shape of H_vent
+    """
+    H_vent = np.asarray(H_vent, dtype = float)
+    if H_vent.ndim not in [1, 2]:
+        raise ValueError('An hourly H_vent must be n hours or n hours by N ' +
+                         'buildings.')
+
+    if H_vent.ndim == 1:
+        levels, level = np.unique(H_vent, return_inverse = True)
+    else:
+        # buildings x levels
+        levels, level = uniqueColumns(H_vent)
+        nBldgs = H_vent.shape[1]
+        C_m, H_em, H_is, H_ms, H_win = \
+            [(np.ones(nBldgs)*np.asarray(arg, dtype = float)).reshape((-1, 1))
+             for arg in [C_m, H_em, H_is, H_ms, H_win]]
+    args = np.broadcast_arrays(*[np.asarray(arg, dtype = float) for arg in
+                                 [C_m, H_em, H_is, H_ms, levels, H_win]])
+    return BuildingCoefficients(*args), level
+
+def uniqueColumns(values):
+    """
+    np.unique of every column of an n x N array, found with one sort along
+    the columns.
+
+    Output:
+    levels - N x L array of the distinct values of every column in
+             ascending order, with L the most distinct values of any
+             column.  Shorter rows are padded with their largest value.
+    index - n x N index of every value in its row of levels
+    """
+    nBldgs = values.shape[1]
+    bldgs = np.arange(nBldgs)
+    order = np.argsort(values, axis = 0, kind = 'mergesort')
+    ordered = values[order, bldgs]
+    isNew = np.ones(values.shape, dtype = bool)
+    isNew[1:] = ordered[1:] != ordered[:-1]
+    rank = np.cumsum(isNew, axis = 0) - 1
+
+    levels = np.repeat(ordered[-1].reshape((-1, 1)), rank[-1].max() + 1,
+                       axis = 1)
+    levels[bldgs, rank] = ordered
+    index = np.empty_like(rank)
+    index[order, bldgs] = rank
+    return levels, index
+
+def pickLevels(coef, level, names = None):
+    """
+    Coefficients of every hour from the coefficients of the levels given by
+    coefficientLevels.  Works for BuildingCoefficients and for the
+    stateSpace.StateSpaceCoefficients derived from them.
+
+    Input:
+    coef - coefficients of L levels, or N buildings x L levels
+    level - level index of the hours, e.g. n hours or n x N, or of a single
+            hour of N buildings
+    names - optional attributes to pick, all of them by default.  The
+            others are left unset.
+
+    Output:
+    coefficients of the same class with arrays of the shape of level
+    """
+    picked = object.__new__(type(coef))
+    for name in (coef.__slots__ if names is None else names):
+        value = getattr(coef, name)
+        if np.ndim(value) == 1:
+            value = value[level]
+        elif np.ndim(value) == 2:
+            value = value[np.arange(value.shape[0]), level]
+        if np.ndim(value) > 0:
+            value.flags.writeable = False
+        object.__setattr__(picked, name, value)
+    return picked
+
+def stepFreeFloat(coef, phi_ia, phi_m, phi_st, theta_e, theta_m_t_1,
+                  theta_sup):
+    """
+    Step 1 of C.4, the zone state for the hour with no heating or cooling.
+
+    Output:
+    theta_m_t_0 - mass temperature at the end of the hour [C]
+    theta_air_0 - air temperature [C]
+    """
+    q_air = theta_sup + phi_ia*coef.inv_H_vent
+    q_s = phi_st + coef.H_win*theta_e + coef.H_1*q_air
+    phi_m_tot = phi_m + coef.H_em*theta_e + coef.r_32*q_s
+    theta_m_t_0 = (theta_m_t_1*coef.a_mt + phi_m_tot)*coef.inv_b_mt
+    theta_m = 0.5*(theta_m_t_0 + theta_m_t_1)
+    theta_s = (coef.H_ms*theta_m + q_s)*coef.inv_b_s
+    theta_air_0 = (coef.H_is*theta_s + coef.H_vent*theta_sup +
+                   phi_ia)*coef.inv_b_i
+    return theta_m_t_0, theta_air_0
+
+def stepNodeTemperatures(coef, phi_ia, phi_m, phi_st, phi_hc_need, theta_e,
+                         theta_m_t_1, theta_sup):
+    """
+    Equations C.4 to C.11 for a given heating/cooling need.
+
+    Output:
+    tuple of (phi_m_tot, theta_m_t, theta_m, theta_s, theta_air, theta_op)
+    """
+    q_ia = phi_ia + phi_hc_need
+    q_s = (phi_st + coef.H_win*theta_e +
+           coef.H_1*(theta_sup + q_ia*coef.inv_H_vent))
+    phi_m_tot = phi_m + coef.H_em*theta_e + coef.r_32*q_s
+    theta_m_t = (theta_m_t_1*coef.a_mt + phi_m_tot)*coef.inv_b_mt
+    theta_m = 0.5*(theta_m_t + theta_m_t_1)
+    theta_s = (coef.H_ms*theta_m + q_s)*coef.inv_b_s
+    theta_air = (coef.H_is*theta_s + coef.H_vent*theta_sup +
+                 q_ia)*coef.inv_b_i
+    theta_op = 0.3*theta_air + 0.7*theta_s
+    return phi_m_tot, theta_m_t, theta_m, theta_s, theta_air, theta_op
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:12:05 2026
+
+@author: mstreet
+"""
+import numpy as np
+
+# Lookup tables of the 365 day calendar used by helpFncs.  Dates are
+# converted by indexing the tables, so whole arrays of (month, day, hour)
+# are converted at once.
+#
+# DAY_OF_YEAR[month, day] is the day of the year 1 to 365, or 0 for a date
+# that does not exist.  Day 0 and month 0 are never valid.
+# DAY_OF_WEEK[startDay, dayOfYear] is the day of the week 1 to 7 of a day of
+# the year when the year starts on startDay, numbered as helpFncs.genSchd.
+
+DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+MONTH_OFFSET = np.concatenate(([0], np.cumsum(DAYS_IN_MONTH)[:-1]))
+
+DAY_OF_YEAR = np.zeros((13, 32), dtype = int)
+for _month in range(1, 13):
+    _days = np.arange(1, DAYS_IN_MONTH[_month - 1] + 1)
+    DAY_OF_YEAR[_month, _days] = MONTH_OFFSET[_month - 1] + _days
+DAY_OF_YEAR.flags.writeable = False
+del _month, _days
+
+DAY_OF_WEEK = np.zeros((8, 366), dtype = int)
+DAY_OF_WEEK[1:, 1:] = ((np.arange(1, 8).reshape((7, 1)) +
+                        np.arange(365) - 1)%7 + 1)
+DAY_OF_WEEK.flags.writeable = False
+
+
+def dayOfYear(month, day):
+    """
+    Vectorised conversion of month and day to the day of the year.
+
+    Input:
+    month - integer month 1 to 12, or an array of months
+    day - integer day of the month, or an array of days
+
+    Output:
+    doy - day of the year 1 to 365, with the shape of month and day
+
+    Raises ValueError listing the invalid dates.
+    """
+    month = np.asarray(month)
+    day = np.asarray(day)
+    checkInteger(month, 'Month')
+    checkInteger(day, 'Day')
+
+    month, day = np.broadcast_arrays(month.astype(int), day.astype(int))
+    inTable = (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+    doy = np.zeros(month.shape, dtype = int)
+    doy[inTable] = DAY_OF_YEAR[month[inTable], day[inTable]]
+
+    invalid = doy == 0
+    if np.any(invalid):
+        dates = zip(month[invalid].tolist(), day[invalid].tolist())
+        raise ValueError('Invalid (month, day) dates: ' +
+                         ', '.join([str(date) for date in dates[:10]]))
+    return doy
+
+def hourOfYear(month, day, hour):
+    """
+    Vectorised hour of the year of (month, day, hour), with the hours of a
+    day numbered 1 to 24.  The first hour of the year is 1.
+
+    Raises ValueError for invalid dates or hours outside of 1 to 24.
+    """
+    hour = np.asarray(hour)
+    checkInteger(hour, 'Hour')
+    if np.any((hour < 1) | (hour > 24)):
+        raise ValueError('Hours must be integers between 1 and 24.')
+    return (dayOfYear(month, day) - 1)*24 + hour.astype(int)
+
+def dayOfWeek(doy, startDay):
+    """
+    Vectorised day of the week 1 to 7 of days of the year 1 to 365, for a
+    year that starts on startDay.
+    """
+    if startDay not in range(1, 8):
+        raise ValueError('Invalid start day for the week.')
+    return DAY_OF_WEEK[startDay, doy]
+
+def datesToHours(dates):
+    """
+    Hour of the year of every row of an array of (month, day, hour).
+    """
+    dates = np.asarray(dates)
+    if dates.shape[-1] != 3:
+        raise ValueError('Dates must be given as (month, day, hour).')
+    return hourOfYear(dates[..., 0], dates[..., 1], dates[..., 2])
+
+def checkInteger(values, name):
+    """
+    Raise ValueError unless all values are whole numbers.
+    """
+    if values.dtype.kind in 'iu':
+        return
+    if values.dtype.kind != 'f' or np.any(values != np.floor(values)):
+        raise ValueError(name + ' must be an integer.')
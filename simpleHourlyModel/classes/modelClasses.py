@@ -5,6 +5,8 @@ Created on Tue Jul 15 16:26:12 2014
 @author: mstreet
 """
 import pdb
+import numpy as np
+import errorClassesSHM as EC
 
 
 class ConstructionMaterial():
@@ -44,9 +46,13 @@ class BuiltUpSurface():
     
     Build the surface from outside to inside.
     
+    shdFac is the shading reduction factor for external obstacles of the
+    surface per 11.4.4 of ISO 13790-2008.
+    
     """
-    surf = []
-    def __init__(self, layers = []):
+    def __init__(self, layers = [], shdFac = 1.0):
+        self.surf = []
+        self.shdFac = shdFac
         tilt = []
         azi = []
         area = []
@@ -71,20 +77,46 @@ class BuiltUpSurface():
         self.extSur = self.surf[0]
         self.intSur = self.surf[-1]
 
+class GlazedSurface():
+    """
+    Class for defining a window or other glazed element of the envelope.
+    
+    Input:
+    tilt, azimuth - orientation of the element [deg], with azimuths of
+                    0 - S, 90 - E, -90 - W as solarEqns.surfaceIrradiation
+    area - overall projected area [m2]
+    Uval - thermal transmittance [W/m2K]
+    gGl - total solar energy transmittance of the glazing
+    frmFra - frame area fraction
+    movShd - reduction factor for moveable shading
+    shdFac - reduction factor for external obstacles
+    emiLon - longwave emissivity of the outer surface
+    """
+    def __init__(self, tilt, azimuth, area, Uval, gGl, frmFra, movShd = 1.0,
+                 shdFac = 1.0, emiLon = 0.837):
+        self.tilt = tilt
+        self.azi = azimuth
+        self.area = area
+        self.Utot = Uval
+        self.gGl = gGl
+        self.frmFra = frmFra
+        self.movShd = movShd
+        self.shdFac = shdFac
+        self.emiLon = emiLon
+
 class ZoneEnvelope():
     """
     Class for defining the envelope of a simple zone.  Separates envelope 
-    constructions into BuiltUpSurfaces that act as solar sources and those 
-    that do not.
+    constructions into BuiltUpSurfaces and GlazedSurfaces that act as solar
+    sources and those that do not.
     """
-    zoneSol = []
-    zoneInt = []
-    
     def __init__(self, volume, conFlrArea, solar = [], internal = []):
         self.vol = volume
         self.Aflr = conFlrArea
+        self.zoneSol = []
+        self.zoneInt = []
         for surface in solar:
-            assert isinstance(surface, BuiltUpSurface)
+            assert isinstance(surface, (BuiltUpSurface, GlazedSurface))
             self.zoneSol.append(surface)
         
         for surface in internal:
@@ -94,11 +126,21 @@ class ZoneEnvelope():
 class ZoneSchedule():
     """
     Class to store generic 24 hour fractional schedule data.
+    
+    The fractions are kept as a read-only array, so schedules can be shared
+    between buildings.  key is the content of the schedule, equal for
+    schedules with equal fractions.
     """
     def __init__(self, fraction):
-        # need to make sure it is only 24 long
-        # need to make sure this is only values between 0 and 1.
+        fraction = np.array(fraction, dtype = float)
+        if fraction.shape != (24,):
+            raise EC.ScheduleError('A zone schedule must have 24 values.')
+        if not np.all((fraction >= 0) & (fraction <= 1)):
+            raise EC.ScheduleError('Schedule fractions must be between 0 ' +
+                                   'and 1.')
+        fraction.flags.writeable = False
         self.schdFrac = fraction 
+        self.key = fraction.tobytes()
 
 class BuildingSite():
     """
@@ -111,7 +153,7 @@ class BuildingSite():
                      self.lon = lon
                      self.lat = lat
                      self.UTC = UTC
-                     self.DST = 0
+                     self.DST = DST
                      self.DSTstart = DSTstart
                      self.DSTstop = DSTstop
                      self.weaFileType = weaFileType
@@ -6,8 +6,8 @@ Created on Thu Jul 10 14:19:07 2014
 """
 import numpy as np
 import helpFncs
+import annexCeqns as ISO
 from classes import errorClassesSHM as EC
-import pdb
 # Based on the peak gains and schedule fraction for the year, this script
 # generates an Nx2 array of phi_int to be passed to the building demand 
 # model.
@@ -21,97 +21,127 @@ def genIntGains(A_floor, occDen, actLev, oc_schd_wd, oc_schd_we,
                 adjDen = 0, adj_schd_wd = None, adj_schd_we = None,
                 qH2O = 0, H2Olen = 0, H2O_schd_wd = None, H2O_schd_we = None,
                 qHVAC = 0, HVAClen = 0,
-                HVAC_schd_wd = None, HVAC_schd_we = None):
-        """
-        Inputs:
-        
-        gross conditioned floor area [m2]
-        occupancy peak [m2/person]
-        metabolic rate [w/person]
-        appliance peak [W/person]
-        lighting peak [w/person]
-        outdoor air infiltration [L/s/person]
-        domestic hot water not used in thermal demand calculation
-        
-        Output:
-        print type(SchdList)
-        phi_int - internal gain at each hour [w]
-        vflo - infiltration flow rate at each hour [m3/s]
-        
-        calcQ_int(phi_oc, phi_app, phi_light, phi_wa, phi_hvac, phi_proc,
-                      phi_adj, adjFac = 0.5)
-        
-        calcPhi_oc(occDen, area, actLev, schFra) - phi_oc
-        
-        calcPhi_gen(peaDen, area, schFra) - phi_proc, phi_app, phi_light, phi_adj
-        
-        calcPhi_genDis(qAvg, lenDis, schFra) - phi_hvac, phi_wa
-        
-        """
+                HVAC_schd_wd = None, HVAC_schd_we = None, calendar = None,
+                registry = None):
+    """
+    Inputs:
+    
+    gross conditioned floor area [m2]
+    occupancy peak [people/m2]
+    metabolic rate [w/person]
+    appliance, lighting, process and adjacent space peaks [W/m2]
+    outdoor air infiltration [L/s/person]
+    average heat from hot water and HVAC distribution [W/m] and the
+    length of pipe or duct [m]
+    weekday and weekend schedules of 24 hourly fractions or ZoneSchedules
+    for each gain
+    start, stop - (month, day, hour) of the first and last hour
+    startDay - day of the week of the start date, numbered as genSchd
+    calendar - optional simCalendar.SimulationCalendar of the period, used
+               instead of start, stop and startDay.  The schedules then
+               follow the local clock through daylight saving time.
+    registry - optional scheduleRegistry.ScheduleRegistry shared by many
+               buildings.  The hourly schedules are then taken from its
+               cache instead of being expanded for every call.
+    
+    General gains with a peak of zero and distribution gains with either
+    an average heat or a length of zero are skipped and need no schedule.
+    The schedules of all other gains are stacked together and the gains
+    of every hour are calculated in one pass over the arrays.
+    
+    Output:
+    N x 2 array of
+    phi_int - internal gain at each hour [w]
+    vflo - infiltration flow rate at each hour [m3/s]
+    
+    calcQ_int(phi_oc, phi_app, phi_light, phi_wa, phi_hvac, phi_proc,
+                  phi_adj, adjFac = 0.5)
+    
+    calcPhi_oc(occDen, area, actLev, schFra) - phi_oc
+    
+    calcPhi_gen(peaDen, area, schFra) - phi_proc, phi_app, phi_light, phi_adj
+    
+    calcPhi_genDis(qAvg, lenDis, schFra) - phi_hvac, phi_wa
+    
+    """
+    area = float(A_floor)
 
-        __ = [[oc_schd_wd, app_schd_wd, light_schd_wd, 
-              proc_schd_wd, adj_schd_wd, H2O_schd_wd,
-              HVAC_schd_wd],
-              [oc_schd_we, app_schd_we, light_schd_we, 
-               proc_schd_we, adj_schd_we, H2O_schd_we,
-               HVAC_schd_we]]
-        
-        SchdList = []
-        for i in range(len(__)):
-            SchdList.append([schd for schd in __[i] if schd != None])
-        
-        
-        # need the occ, app, and light schedule for both weekday and weekends.
-        # need the total conditioned floor area
-        # need the occDen, actLev
-        # need the peak density of appliances and lighting
-        # need the outdoor air rate
-        # need the adjacent peak rate, hvac length, pipe lengths and avg q for
-        #       hvac and plumbing.
-        
-        # which hours are we calculating?
-        hIndex = np.array(helpFncs.timeDiff(start, stop))
+    # peak of every gain that is calculated, from the annex C equations
+    # with a schedule fraction of one
+    peaks = [('phi_oc', ISO.calcPhi_oc(float(occDen), area, float(actLev),
+                                       1.0), oc_schd_wd, oc_schd_we)]
+    for name, peaDen, wd, we in [('phi_app', appDen, app_schd_wd,
+                                  app_schd_we),
+                                 ('phi_light', lightDen, light_schd_wd,
+                                  light_schd_we),
+                                 ('phi_proc', procDen, proc_schd_wd,
+                                  proc_schd_we),
+                                 ('phi_adj', adjDen, adj_schd_wd,
+                                  adj_schd_we)]:
+        if peaDen != 0:
+            peaks.append((name, ISO.calcPhi_gen(float(peaDen), area, 1.0),
+                          wd, we))
+    for name, qAvg, lenDis, wd, we in [('phi_wa', qH2O, H2Olen, H2O_schd_wd,
+                                        H2O_schd_we),
+                                       ('phi_hvac', qHVAC, HVAClen,
+                                        HVAC_schd_wd, HVAC_schd_we)]:
+        if qAvg != 0 and lenDis != 0:
+            peaks.append((name, ISO.calcPhi_genDis(float(qAvg),
+                                                   float(lenDis), 1.0),
+                          wd, we))
+
+    wdSchds = np.column_stack(checkSchedules(peaks, 2))
+    weSchds = np.column_stack(checkSchedules(peaks, 3))
 
-        # how many hours are we calculating?
+    if calendar is not None:
+        nHours = len(calendar)
+        hourData = calendar.stackSchedules(wdSchds, weSchds)
+    elif registry is not None:
+        # shared read-only arrays, one per gain
+        hourData = [registry.expand(peak[2], peak[3], start, stop, startDay)
+                    for peak in peaks]
+        nHours = len(hourData[0])
+    else:
+        # which hours are we calculating?  Raises ValueError for leap days.
+        hIndex = helpFncs.timeDiff(start, stop)
         nHours = len(hIndex)
-        dIndex = np.array(helpFncs.genDayIndex(startDay, nHours))
         
-        # For that many days (given the start Day) generate the schedule for
-        # occ, lights, and appliances.  Should be a matrix that is n hours long 
-        # by 7 columns.  Accounts for weekends and weekdays.
-        
-        hourData = np.zeros((nHours, 2 + sum(map(len, SchdList))))
-        
-        hourData[:, 0:2] = [hIndex.reshape((nHours,1)), 
-                            dIndex.reshape((nHours,1))]
-        
-        
-        
-            
-            
-            
-        
-        # calculate the phi_oc with the appropriate schedule.
-        
-        # calculate the general gains with the appropriate schedule.
-        #   if peak density is zero, dont't require a schedule. 
-        
-        # calculate the distribution gains with appropriate schedules.
-        #   if either length or average q is zero do not require a schedule.
-        
-        # pass each of the vectors to the summation function.
-        
-        # return a vector that is n hours by 2 which is the q int at each desired
-        # hour and the H_ven.
-        
-        return 0
-
-genIntGains(1,1,1,np.ones(24),np.ones(24),
-                1, 1, np.ones(24), np.ones(24),
-                1, np.ones(24), np.ones(24),
-                start = (1,1,1), stop = (12,31,24), startDay = 1)
+        # stack from the start of the first day, then drop the hours before
+        # the start hour
+        offset = hIndex[0]%24
+        hourData = helpFncs.stackScheduleArray(offset + nHours, wdSchds,
+                                               weSchds, startDay)[offset:]
+    if isinstance(hourData, np.ndarray):
+        hourData = hourData.T
 
-print 'test'
+    # each gain is its hourly schedule times its peak
+    phi = dict.fromkeys(['phi_oc', 'phi_app', 'phi_light', 'phi_wa',
+                         'phi_hvac', 'phi_proc', 'phi_adj'], 0.0)
+    for peak, schd in zip(peaks, hourData):
+        phi[peak[0]] = peak[1]*schd
 
+    result = np.empty((nHours, 2))
+    result[:, 0] = ISO.calcQ_int(checkArgs = False, **phi)
+    # outdoor air follows the occupancy schedule, L/s to m3/s
+    result[:, 1] = (float(outAir)/1000*float(occDen)*area*hourData[0])
+    
+    return result
 
-#print getIntGains
\ No newline at end of file
+def checkSchedules(peaks, col):
+    """
+    Return the weekday (col 2) or weekend (col 3) schedules of the gains in
+    peaks.  Raises ScheduleError for a missing schedule, a schedule that is
+    not 24 hours long, or negative fractions.
+    """
+    schds = []
+    for peak in peaks:
+        if peak[col] is None:
+            raise EC.ScheduleError('A schedule is needed for ' + peak[0] +
+                                   ' when its peak is not zero.')
+        schd = np.asarray(getattr(peak[col], 'schdFrac', peak[col]),
+                          dtype = float)
+        if schd.shape != (24,) or np.any(schd < 0):
+            raise EC.ScheduleError('The schedules of ' + peak[0] + ' must ' +
+                                   'be 24 non-negative hourly fractions.')
+        schds.append(schd)
+    return schds
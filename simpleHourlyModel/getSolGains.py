@@ -4,16 +4,31 @@ Created on Tue Jul 15 10:25:56 2014
 
 @author: mstreet
 """
+import datetime
 from pysolsurface import solarEqns as se
+from pysolsurface import solarPosition as sp
 import numpy as np
 import annexCeqns as ISO
+import helpFncs
 
 # Based building, site, and start and stop information this script will
 # generate the hourly DHI and DNI on every eligible surface of the building.
 # Then this data will be used to generate Q sol at each hour for each surface.
+#
+# The position of the sun is taken from the table of the site, see
+# pysolsurface.solarPosition.  The irradiation of all surfaces and hours is
+# one array computation, with
+# the surfaces along the first axis and the hours along the second.  The
+# time invariant properties of the surfaces reduce to one weight and one sky
+# loss per surface, so phi_sol of every hour is a matrix-vector product.
+# Surfaces of the same orientation, also of different buildings, receive the
+# same irradiation per m2, so it is calculated once per distinct (tilt,
+# azimuth) and their weights are added up.
 
 
-def genSolGains(building, site, start = (1,1,1), stop = (12,31,24)):
+def genSolGains(building, site, start = (1,1,1), stop = (12,31,24),
+                DNI = None, DHI = None, rho = 0.2, extRes = 0.04, locId = 2,
+                calendar = None, cacheDir = None, nSub = 1):
     """
     Calculates the total solar gains for a building a specified site over a 
     defined calculation period.  From the standard, the sources to consider
@@ -26,14 +41,185 @@ def genSolGains(building, site, start = (1,1,1), stop = (12,31,24)):
     
     Inputs:
     
-    building - a building object
-    site - a site object
+    building - a building object, modelClasses.ZoneEnvelope.  Its zoneSol
+               surfaces are the solar sources.
+    site - a site object, modelClasses.BuildingSite
     start - tuple of month, day, and hour indicating calculation start time
     stop - tuple of month, day, and hour indicating calculation end time
+    DNI, DHI - hourly direct and diffuse irradiation, one value per hour of
+               the period or 8760 values of the whole year [W/m2]
+    rho - ground reflectance
+    extRes - external surface resistance of the surfaces [m2K/W]
+    locId - climate of the site for the sky radiation, see
+            annexCeqns.calcPhi_long
+    calendar - optional simCalendar.SimulationCalendar of the period, used
+               instead of start and stop.  Its hours are in standard time,
+               like weather files.  The sun is shifted by site.DST in every
+               year of the calendar as for start and stop, while the
+               daylight saving time of the calendar only moves the
+               schedules to the local clock.
+    cacheDir - optional directory in which the solar position tables of
+               the site are kept between runs
+    nSub - number of points per hour over which the beam geometry is
+           averaged, 1 for the midpoint of the hour
     
     Output:
     qSol - total solar gains per ISO 13790 at each hour to pass to
             calcBuildingDemand
     
     """
-    pass
\ No newline at end of file
+    return genPortfolioSolGains([building], site, start, stop, DNI, DHI, rho,
+                                extRes, locId, calendar, cacheDir, nSub)[0]
+
+def genPortfolioSolGains(buildings, site, start = (1,1,1), stop = (12,31,24),
+                         DNI = None, DHI = None, rho = 0.2, extRes = 0.04,
+                         locId = 2, calendar = None, cacheDir = None,
+                         nSub = 1):
+    """
+    genSolGains of several buildings at the same site.  The irradiation is
+    calculated once for every distinct orientation of the surfaces of all
+    buildings.
+    
+    Inputs:
+    
+    buildings - list of modelClasses.ZoneEnvelope
+    see genSolGains for the others
+    
+    Output:
+    qSol - buildings x hours array of the total solar gains [W]
+    """
+    if DNI is None or DHI is None:
+        raise ValueError('Hourly DNI and DHI are needed for the solar gains.')
+
+    beamTerms, hIndex = calcPeriodBeamTerms(site, start, stop, calendar,
+                                            cacheDir, nSub)
+    DNI, DHI = [periodValues(values, hIndex) for values in [DNI, DHI]]
+
+    tilt, azi, weight, skyLoss, owner = [], [], [], [], []
+    for bldg, building in enumerate(buildings):
+        values = calcSurfaceWeights(building.zoneSol, extRes, locId)
+        for column, value in zip([tilt, azi, weight, skyLoss], values):
+            column.append(value)
+        owner.append(np.repeat(bldg, len(values[0])))
+    tilt, azi, weight, skyLoss, owner = [np.concatenate(column) for column
+                                         in [tilt, azi, weight, skyLoss,
+                                             owner]]
+
+    # weight of every building on every distinct orientation
+    tilt, azi, orient = se.uniqueOrientations(tilt, azi)
+    bldgWeight = np.zeros((len(buildings), len(tilt)))
+    np.add.at(bldgWeight, (owner, orient), weight)
+
+    # 3 x orientations x hours, beam, diffuse and ground reflected
+    surIrrad = se.surfaceIrradiationArray(site.lat, tilt, azi, rho, DNI, DHI,
+                                          None, None, beamTerms = beamTerms)
+
+    # equation 43, caclPhi_sol_k, summed over the surfaces
+    qSol = bldgWeight.dot(surIrrad.Ibeam)
+    qSol += bldgWeight.dot(surIrrad.Idiff)
+    qSol += bldgWeight.dot(surIrrad.Irec)
+    qSol -= np.bincount(owner, skyLoss,
+                        minlength = len(buildings))[:, np.newaxis]
+
+    return qSol
+
+def calcPeriodBeamTerms(site, start, stop, calendar = None, cacheDir = None,
+                        nSub = 1):
+    """
+    Beam terms of the angle of incidence, see solarEqns.beamRatioTerms, of
+    every hour of the period from the position tables of the site.
+    
+    Output:
+    beamTerms - 3 x hours array
+    hIndex - hour of the year of every hour, counted from 0
+    """
+    if calendar is not None:
+        hIndex = calendar.hourOfYear - 1
+        beamTerms = np.empty((3, len(calendar)))
+        for year in np.unique(calendar.year):
+            table = sp.positionTable(site.lat, site.lon, site.UTC,
+                                     calcDstPeriod(site, year), year = year,
+                                     nSub = nSub, cacheDir = cacheDir)
+            inYear = calendar.year == year
+            beamTerms[:, inYear] = table.beamTerms[:, hIndex[inYear]]
+    else:
+        # raises ValueError for dates that do not exist
+        hIndex = helpFncs.timeDiff(start, stop)
+        table = sp.positionTable(site.lat, site.lon, site.UTC,
+                                 calcDstPeriod(site), nSub = nSub,
+                                 cacheDir = cacheDir)
+        beamTerms = table.beamTerms[:, hIndex]
+    return beamTerms, hIndex
+
+def calcSurfaceWeights(surfaces, extRes, locId):
+    """
+    Time invariant terms of equation 43 for every solar surface.  Glazed
+    surfaces are recognised by their gGl.
+    
+    Output:
+    tilt, azi - orientation of every surface [deg]
+    weight - shdFac*effArea of every surface [m2]
+    skyLoss - skyFac*phi_sky of every surface [W]
+    """
+    if len(surfaces) == 0:
+        raise ValueError('The building has no solar surfaces.')
+    tilt = []
+    azi = []
+    weight = []
+    skyLoss = []
+    for surface in surfaces:
+        if hasattr(surface, 'gGl'):
+            effArea = ISO.calcA_eff_gl(surface.movShd, surface.gGl,
+                                       surface.frmFra, surface.area)
+            emiLon = surface.emiLon
+        else:
+            absOpa = surface.extSur.matProps.absSol
+            effArea = ISO.calcA_eff_op(absOpa, extRes, surface.Utot,
+                                       surface.area)
+            emiLon = surface.extSur.matProps.emiLon
+        phi_sky = ISO.calcPhi_long(extRes, surface.Utot, surface.area,
+                                   emiLon, locId)
+        # view factor to the sky, 1 for a roof and 0.5 for a wall
+        skyFac = 0.5*(1 + np.cos(np.radians(surface.tilt)))
+
+        tilt.append(surface.tilt)
+        azi.append(surface.azi)
+        weight.append(surface.shdFac*effArea)
+        skyLoss.append(skyFac*phi_sky)
+
+    return [np.array(values, dtype = float) for values in
+            [tilt, azi, weight, skyLoss]]
+
+def calcDstPeriod(site, year = None):
+    """
+    None for a site without daylight saving time, otherwise the (first,
+    last) hours of the year, counted from 0, from site.DSTstart up to
+    site.DSTstop given as (month, day, hour).  The hours are counted in
+    year, or in a year of 365 days for year None.
+    """
+    if not site.DST:
+        return None
+    if site.DSTstart is None or site.DSTstop is None:
+        raise ValueError('The start and stop of daylight saving time are ' +
+                         'needed for a site that observes it.')
+    if year is None:
+        return (helpFncs.hourOfYear(site.DSTstart) - 1,
+                helpFncs.hourOfYear(site.DSTstop) - 1)
+    period = []
+    for month, day, hour in [site.DSTstart, site.DSTstop]:
+        dayOfYear = datetime.date(int(year), month, day).timetuple().tm_yday
+        period.append((dayOfYear - 1)*24 + hour - 1)
+    return tuple(period)
+
+def periodValues(values, hIndex):
+    """
+    Hourly values of the period from one value per hour of the period or
+    from the 8760 values of a whole year.
+    """
+    values = np.asarray(values, dtype = float)
+    if len(values) == len(hIndex):
+        return values
+    if len(values) == 8760 and np.all(hIndex < 8760):
+        return values[hIndex]
+    raise ValueError('Weather data must have one value per hour of the ' +
+                     'period or of the year.')
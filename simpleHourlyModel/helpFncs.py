@@ -5,35 +5,24 @@ Created on Thu Jul 10 12:11:34 2014
 @author: mstreet
 """
 import numpy as np
+import calendarTables as CT
 import pdb
 
 def dateConvert(month, day):
     """
-    Convert the month and day to day of year.
-    """    
-    day_in_month = np.array([31,28,31,30,31,30,31,31,30,31,30,31])
-    months = np.arange(1,13)
-    days = np.arange(1, 366)
-    
-    if month not in months:
+    Convert the month and day to day of year.  Looked up in
+    calendarTables.DAY_OF_YEAR.
+    """
+    if not np.isscalar(month) or month != int(month) or not 1 <= month <= 12:
         raise ValueError('Month must be integer between 1 and 12.')
-    
-    if day not in np.arange(1,day_in_month[month-1]+1):
+
+    nDays = CT.DAYS_IN_MONTH[int(month) - 1]
+    if not np.isscalar(day) or day != int(day) or not 1 <= day <= nDays:
         raise ValueError('Day ' + str(day) + ' not in range for Month '
                    + str(month) + '.  Must be an integer between 1 and ' 
-                   + str(day_in_month[month-1]))
-    
-    
-    if month == 1:
-        DoY = day
-    else:
-        DoY = sum(day_in_month[:month-1])+day
-    
-    if DoY not in days:
-        raise ValueError('The date ' + str(DoY) + ' is not in the range of'
-         + ' 1 to 365.')
-    
-    return DoY
+                   + str(nDays))
+
+    return int(CT.DAY_OF_YEAR[int(month), int(day)])
     
 def genSchd(startDay):
     """
@@ -50,87 +39,109 @@ def genSchd(startDay):
     return __
 def genDayIndex(startDay, nHours):
     """
-    Return list of days that is as long as nHours.  Indicates for each hour
-    the day of the week it belongs to.
+    Return an array that is as long as nHours.  Indicates for each hour
+    the day of the week it belongs to, numbered as genSchd.  Works for
+    any number of hours, including runs of several years.
     
     """
-    
-    dIndex = []
-    hours = 0
-    count = 0
-    while hours < nHours:
-        base = genSchd(startDay)
-        if hours > 0 and hours%24 == 0:
-            if count > len(base)-1:
-                count = 0
-            else:
-                count += 1
-        
-        dIndex.append(base[count])
-        hours += 1
-    
-    return dIndex
+    if startDay not in range(1, 8):
+        raise ValueError('Invalid start day for the week.')
+
+    return (np.arange(nHours)//24 + startDay - 1)%7 + 1
 
 def hourOfYear(dateTuple):
     """
-    Return the hour of the year given a tuple of (month, day, hour).
+    Return the hour of the year given a tuple of (month, day, hour).  Hours
+    of the day run from 1 to 24.
     """
-    yearDay = dateConvert(dateTuple[0],dateTuple[1])
-    if yearDay == 1:
-        yearHour = dateTuple[2]
-    else:
-        yearHour = (yearDay - 1)*24 + dateTuple[2]
-    
-    return yearHour
+    return int(CT.hourOfYear(dateTuple[0], dateTuple[1], dateTuple[2]))
+
+def weekdayMask(nHours, startDay):
+    """
+    Boolean array that is True for every hour of nHours that falls on a
+    weekday.  Days are numbered as in genSchd, 2 to 6 are the weekdays.
+    """
+    dayOfWeek = genDayIndex(startDay, nHours)
+    return (dayOfWeek >= 2) & (dayOfWeek <= 6)
+
+def stackScheduleArray(nHours, wdSchds, weSchds, startDay):
+    """
+    Stack any number of weekday and weekend schedules at once.
+
+    Input:
+    nHours - number of hours to generate
+    wdSchds, weSchds - weekday and weekend schedules, 24 hours by k
+                       schedules (or a single schedule of 24 hours)
+    startDay - day of the week of the first hour, 1 to 7
+
+    Output:
+    hourly - nHours by k array of the schedule value of every hour
+    """
+    wdSchds = np.asarray(wdSchds)
+    weSchds = np.asarray(weSchds)
+    if wdSchds.ndim == 1:
+        wdSchds = wdSchds.reshape((-1, 1))
+    if weSchds.ndim == 1:
+        weSchds = weSchds.reshape((-1, 1))
+    if wdSchds.shape != weSchds.shape or wdSchds.shape[0] != 24:
+        raise ValueError('Weekday and weekend schedules must be 24 hours by '
+                         + 'the same number of schedules.')
+
+    # table of weekend (0) and weekday (1) schedules, picked for every hour
+    table = np.array([weSchds, wdSchds])
+    isWeekday = weekdayMask(nHours, startDay).astype(int)
+    return table[isWeekday, np.arange(nHours)%24]
 
 def stackSchedules(nHours, wdSchd, weSchd, startDay):
     """
     Stack the schedules from each list based on whether weekday or weekend.
     """
-    holder = []
-    base = genSchd(startDay)
-    
-    schInd = 0
-    dayInd = 0
-    count = 0
-
-    while count < nHours:
-        
-        if schInd > 23:
-            schInd = 0
-            if dayInd > 6:
-                dayInd = 0
-            dayInd += 1      
-              
-        if base[dayInd] in range(2,7):
-            holder.append(wdSchd[schInd])
-        else:
-            holder.append(weSchd[schInd])
-        
-        schInd += 1
-        count += 1
-    
-    return np.array(holder)
-        
-        
-    
+    return stackScheduleArray(nHours, wdSchd, weSchd, startDay)[:, 0]
+
+def expandHourly(arg, nHours, startDay = None, calendar = None):
+    """
+    Expand a setting of the demand calculation to one value per hour.
+
+    Input:
+    arg - a single value, one value per hour, or a tuple of a weekday and a
+          weekend profile of 24 hourly values each, which are stacked with
+          stackSchedules.
+    nHours - number of hours of the calculation period
+    startDay - day of the week of the first hour, 1 to 7.  Only needed for
+               profiles.
+    calendar - optional simCalendar.SimulationCalendar of the period, used
+               instead of startDay.  Profiles then follow the local clock
+               through daylight saving time.
+
+    Output:
+    hourly - array of nHours values
+    """
+    if isinstance(arg, tuple):
+        if len(arg) != 2 or [np.shape(schd) for schd in arg] != [(24,)]*2:
+            raise ValueError('Profiles must be a tuple of a weekday and a ' +
+                             'weekend schedule of 24 hours each.')
+        if calendar is not None:
+            if len(calendar) != nHours:
+                raise ValueError('The calendar must have one hour for ' +
+                                 'every hour of the period.')
+            return np.asarray(calendar.stackSchedules(arg[0], arg[1])[:, 0],
+                              dtype = float)
+        if startDay is None:
+            raise ValueError('The start day is needed to stack profiles.')
+        return np.asarray(stackSchedules(nHours, arg[0], arg[1], startDay),
+                          dtype = float)
+
+    hourly = np.asarray(arg, dtype = float)
+    if hourly.ndim > 0 and len(hourly) != nHours:
+        raise ValueError('Hourly values must have one value per hour.')
+    return np.ones(nHours)*hourly
+
 def timeDiff(start, stop):
     """
     Convert two tuples of (month, day, hour) into the number of hours between
     each hour.  Includes the start hour and the last hour.  Returns an index
-    of the hours.
+    of the hours, counted from 0 for the first hour of the year.
     
     """
-    
-    dates = [start, stop]
-    hours = []
-    
-    for date in dates:
-        hours.append(hourOfYear(date))
-    
-    a = range(hours[0])
-    b = range(hours[-1])
-    
-    hIndex = b[len(a)-1:]
-    
-    return hIndex
+    first, last = CT.datesToHours([start, stop])
+    return np.arange(first - 1, last)
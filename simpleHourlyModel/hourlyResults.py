@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:36:12 2026
+
+@author: mstreet
+"""
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+import buildingCoeffs as BC
+
+# Results of a calculation period are kept in one structured array with a
+# named field for each quantity.  The first four fields are floats in the
+# column order of the N x 4 arrays returned by the demand functions, so the
+# engines write rows of those four columns into a plain float view of the
+# structured array, see demandColumns.
+#
+# The status field holds the flags below, combined with a bitwise or.  Hours
+# with a flag other than STATUS_LIMITED are only recorded when an engine is
+# run with strict = False, otherwise they raise as before.
+
+DEMAND_FIELDS = ('phi_hc_need_ac', 'theta_m_t', 'phi_hc_need_un', 'theta_air')
+NODE_FIELDS = ('phi_m_tot', 'theta_m', 'theta_s', 'theta_op')
+RESULT_FIELDS = DEMAND_FIELDS + NODE_FIELDS + ('status',)
+
+STATUS_OK = 0
+STATUS_OUT_OF_RANGE = 1     # input or mass temperature out of range
+STATUS_ZERO_NEED = 2        # zero unrestricted need in step 4, left floating
+STATUS_LIMITED = 4          # need limited by the heating/cooling capacity
+
+resultDtype = np.dtype([(name, float) for name in
+                        DEMAND_FIELDS + NODE_FIELDS] + [('status', np.int8)])
+
+
+def createResults(shape):
+    """
+    Allocate the results of a calculation period, filled with zeros.
+
+    Input:
+    shape - number of hours, or (hours, buildings) for a portfolio
+
+    Output:
+    results - structured array with the fields of RESULT_FIELDS [W] and [C]
+              and a status of STATUS_OK
+    """
+    return np.zeros(shape, dtype = resultDtype)
+
+def demandColumns(results):
+    """
+    Float view of the first four fields of a results array, with the shape of
+    results plus a last axis of 4 columns.  Writing to the view writes to
+    results.
+    """
+    if not isinstance(results, np.ndarray) or results.dtype != resultDtype:
+        raise TypeError('results must be an array created by createResults.')
+    # the demand fields are adjacent floats at the start of every record
+    first = results[DEMAND_FIELDS[0]]
+    return as_strided(first, shape = results.shape + (len(DEMAND_FIELDS),),
+                      strides = results.strides + (first.itemsize,))
+
+def fillNodeTemperatures(coef, results, phi_ia, phi_m, phi_st, theta_e,
+                         theta_sup, theta_m_0):
+    """
+    Fill the fields of NODE_FIELDS for every hour at once, from the actual
+    need and mass temperatures written by the engine.  Equations C.4 to C.11
+    are evaluated on whole arrays with buildingCoeffs.stepNodeTemperatures.
+    Hours that were not solved, with a mass temperature that is not finite,
+    get nan node temperatures, and the hours after them start from the last
+    finite mass temperature as the engines do in lenient runs.
+
+    Input:
+    coef - buildingCoeffs.BuildingCoefficients of the building(s)
+    results - results array with the fields of DEMAND_FIELDS filled in
+    phi_ia, phi_m, phi_st, theta_e, theta_sup - hourly drivers, broadcastable
+                                                to the shape of results
+    theta_m_0 - mass temperature before the first hour [C]
+    """
+    theta_m_t = results['theta_m_t']
+    theta_m_t_1 = np.empty_like(theta_m_t)
+    theta_m_t_1[0] = theta_m_0
+    theta_m_t_1[1:] = theta_m_t[:-1]
+
+    # carry the last finite mass temperature over the hours not solved
+    shape = (-1,) + (1,)*(theta_m_t.ndim - 1)
+    hours = np.arange(len(theta_m_t)).reshape(shape)
+    last = np.where(np.isfinite(theta_m_t_1), hours, 0)
+    np.maximum.accumulate(last, axis = 0, out = last)
+    if theta_m_t.ndim == 1:
+        theta_m_t_1 = theta_m_t_1[last]
+    else:
+        theta_m_t_1 = theta_m_t_1[last, np.arange(theta_m_t.shape[1])]
+
+    nodes = BC.stepNodeTemperatures(coef, phi_ia, phi_m, phi_st,
+                                    results['phi_hc_need_ac'], theta_e,
+                                    theta_m_t_1, theta_sup)
+    unsolved = ~np.isfinite(theta_m_t)
+    for name, values in zip(NODE_FIELDS, [nodes[0], nodes[2], nodes[3],
+                                          nodes[5]]):
+        results[name] = values
+        results[name][unsolved] = np.nan
+    return results
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:41:09 2026
+
+@author: mstreet
+"""
+import numpy as np
+import helpFncs
+from classes import errorClassesSHM as EC
+
+# Stochastic occupancy after Page et al. (2008), "A generalised stochastic
+# model for the simulation of occupant presence".  Each occupant is present
+# or absent, and moves between the two states as a Markov chain whose
+# transition probabilities follow a deterministic presence profile P(t), so
+# the expected fraction of occupants present is P(t).  The mobility sets
+# how often occupants come and go around that profile.
+#
+# Every building has its own random stream, RandomState([seed, bldgId]), so
+# the occupancy of a building does not depend on the other buildings of the
+# call and a portfolio can be split over several processes.
+
+
+def genOccupancy(wdSchd, weSchd, nBldgs, nHours = 8760, startDay = 1,
+                 nOccupants = 10, mobility = 0.5, seed = 0, bldgIds = None,
+                 calendar = None, blockHours = 168):
+    """
+    Generate the fraction of occupants present at every hour for many
+    buildings at once.
+    
+    Input:
+    wdSchd, weSchd - weekday and weekend presence profiles of 24 fractions,
+                     ZoneSchedules, or 24 x nBldgs arrays of one profile per
+                     building
+    nBldgs - number of buildings
+    nHours - number of hours, for any number of years
+    startDay - day of the week of the first hour, 1 to 7
+    nOccupants - number of occupants of every building
+    mobility - ratio of the probabilities of changing and keeping the
+               state, larger for more arrivals and departures [-]
+    seed - seed of the portfolio
+    bldgIds - integer id of every building, used for its random stream.
+              Defaults to 0 to nBldgs - 1.
+    calendar - optional simCalendar.SimulationCalendar of the period, used
+               instead of nHours and startDay
+    blockHours - hours of random numbers drawn at a time.  Does not change
+                 the result.
+    
+    Output:
+    occ - nBldgs x nHours array of the fraction of occupants present [],
+          the schFra of annexCeqns.calcPhi_ocArray
+    """
+    if bldgIds is None:
+        bldgIds = range(nBldgs)
+    bldgIds = [int(bId) for bId in bldgIds]
+    if len(bldgIds) != nBldgs:
+        raise ValueError('One id is needed for every building.')
+    if nOccupants < 1 or mobility <= 0:
+        raise ValueError('There must be at least one occupant and a ' +
+                         'positive mobility.')
+
+    wdSchd = getattr(wdSchd, 'schdFrac', wdSchd)
+    weSchd = getattr(weSchd, 'schdFrac', weSchd)
+    if calendar is not None:
+        nHours = len(calendar)
+        profile = calendar.stackSchedules(wdSchd, weSchd)
+    else:
+        profile = helpFncs.stackScheduleArray(nHours, wdSchd, weSchd,
+                                              startDay)
+    profile = np.asarray(profile, dtype = float)
+    if profile.shape[1] not in [1, nBldgs]:
+        raise ValueError('Give one profile, or one profile per building.')
+    if not np.all((profile >= 0) & (profile <= 1)):
+        raise EC.ScheduleError('Presence profiles must be fractions between ' +
+                               '0 and 1.')
+
+    T01, T11 = calcTransitions(profile, mobility)
+    # buildings x 1 columns, broadcast over the occupants
+    profile = profile.T[:, :, np.newaxis]
+    T01 = T01.T[:, :, np.newaxis]
+    T11 = T11.T[:, :, np.newaxis]
+
+    streams = [np.random.RandomState([seed, bId]) for bId in bldgIds]
+    occ = np.empty((nBldgs, nHours))
+    present = None
+    for first in range(0, nHours, blockHours):
+        last = min(first + blockHours, nHours)
+        rand = np.empty((nBldgs, last - first, nOccupants))
+        for i, stream in enumerate(streams):
+            rand[i] = stream.random_sample((last - first, nOccupants))
+
+        for hour in range(first, last):
+            if present is None:
+                prob = profile[:, 0]
+            else:
+                # transition from the previous hour
+                prob = np.where(present, T11[:, hour - 1],
+                                T01[:, hour - 1])
+            present = rand[:, hour - first] < prob
+            occ[:, hour] = present.sum(axis = 1)
+
+    return occ/nOccupants
+
+def calcTransitions(profile, mobility):
+    """
+    Transition probabilities of the presence chain from each hour to the
+    next, per Page et al. (2008).
+    
+    T01(t) = (mu - 1)/(mu + 1)*P(t) + P(t+1)
+    T11(t) = (P(t) - 1)/P(t)*T01(t) + P(t+1)/P(t)
+    
+    For steep changes of the profile these fall outside of 0 to 1.  T01 is
+    then limited to the range that keeps both in 0 to 1, and T11 follows
+    from P(t)*T11 + (1 - P(t))*T01 = P(t+1), so the expected presence still
+    follows the profile.  With nobody expected, P(t) = 0, T11 is taken as
+    T01.
+    
+    Input:
+    profile - hours x k presence profiles
+    mobility - mu [-]
+    
+    Output:
+    T01, T11 - (hours - 1) x k probabilities of being present at the next
+               hour when absent and when present
+    """
+    P = profile[:-1]
+    P1 = profile[1:]
+    T01 = (mobility - 1.)/(mobility + 1.)*P + P1
+
+    absent = P < 1
+    lower = np.zeros_like(T01)
+    upper = np.ones_like(T01)
+    lower[absent] = (P1[absent] - P[absent])/(1 - P[absent])
+    upper[absent] = P1[absent]/(1 - P[absent])
+    T01 = np.clip(T01, np.maximum(lower, 0), np.minimum(upper, 1))
+
+    T11 = T01.copy()
+    occupied = P > 0
+    T11[occupied] = (P1[occupied] - (1 - P[occupied])*T01[occupied])/\
+                    P[occupied]
+    return T01, np.clip(T11, 0, 1)
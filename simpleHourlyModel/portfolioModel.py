@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:20:14 2026
+
+@author: mstreet
+"""
+from classes import errorClassesSHM as EC
+import numpy as np
+import buildingCoeffs as BC
+import stateSpace as SS
+import ISOsimpleHourlyModel as isoSHM
+import hourlyResults as HR
+import helpFncs as hF
+
+# Simulates a portfolio of buildings together.  The hours are still solved
+# one after the other, but every hour is solved for all buildings at once.
+
+
+def calcPortfolioDemand(phi_ia,
+                        phi_m,
+                        phi_st,
+                        theta_e,
+                        theta_sup,
+                        theta_set_c,
+                        theta_set_h,
+                        deadBand,
+                        phi_h_max,
+                        phi_c_max,
+                        theta_m_0,
+                        C_m,
+                        H_1,
+                        H_2,
+                        H_3,
+                        H_em,
+                        H_is,
+                        H_ms,
+                        H_vent,
+                        H_win,
+                        validated = False,
+                        out = None,
+                        strict = True,
+                        startDay = None,
+                        calendar = None):
+    """
+    Calculate the hourly heating and cooling need of N buildings over the
+    same calculation period.  Each hour follows steps 1 to 4 of C.4 of ISO
+    13790-2008 in the state space form of stateSpace, using the need
+    sensitivities of buildingCoeffs.BuildingCoefficients to find the
+    unrestricted need.
+    The step taken by each building is selected with boolean masks.
+
+    Input:
+    phi_ia, phi_m, phi_st - heat flows to the air, mass and surface nodes [W].
+                            Arrays of n hours by N buildings.
+    theta_e, theta_sup - external and supply air temperatures [C].  Either
+                         n hours by N buildings or a vector of n hours
+                         shared by all buildings.
+    theta_set_c, theta_set_h, deadBand - set points and dead band [C].
+    phi_h_max, phi_c_max - heating and cooling capacity [W].
+    The set points, dead band and capacities are single values, N values,
+    n x 1, n x N or a tuple of weekday and weekend profiles of 24 hours
+    shared by all buildings, see helpFncs.expandHourly.
+    theta_m_0 - mass temperature before the first hour, single or N values.
+    C_m, H_1, H_2, H_3, H_em, H_is, H_ms, H_vent, H_win - building
+                            coefficients, single or N values.
+                            H_vent may also be n hours by N buildings, with
+                            H_1, H_2 and H_3 None, see
+                            buildingCoeffs.coefficientLevels.
+    validated - skip the check of the hourly inputs before the run and of
+                the mass temperatures in every hour, see
+                ISOsimpleHourlyModel.validateHourlyInputs.
+    out - optional n x N results array from hourlyResults.createResults,
+          written in place and returned with all of its fields filled in.
+    strict - raise for the first hour and building that can not be solved.
+             With strict False those are flagged in the status field of the
+             results and the run carries on, as in
+             ISOsimpleHourlyModel.calcBuildingDemandWrap.
+    startDay - day of the week of the first hour, 1 to 7.  Needed for
+               settings given as weekday and weekend profiles.
+    calendar - simCalendar.SimulationCalendar of the period, used instead of
+               startDay.
+
+    Output:
+    result - n hours by N buildings by 4 array of actual need, theta_m_t,
+             unrestricted need and theta_air, or out.  With strict False
+             the results array is always returned.
+    """
+    phi_ia = np.asarray(phi_ia, dtype = float)
+    if phi_ia.ndim != 2:
+        raise ValueError('Heat flows must be arrays of n hours by N ' +
+                         'buildings.')
+    nHours, nBldgs = phi_ia.shape
+
+    def hourly(arg):
+        if isinstance(arg, tuple):
+            arg = hF.expandHourly(arg, nHours, startDay, calendar)
+            arg = arg.reshape((nHours, 1))
+        return np.ones((nHours, nBldgs))*np.asarray(arg, dtype = float)
+
+    # a single weather series is shared by every building
+    theta_e, theta_sup = [np.asarray(arg, dtype = float) for arg in
+                          [theta_e, theta_sup]]
+    if theta_e.ndim == 1:
+        theta_e = theta_e.reshape((nHours, 1))
+    if theta_sup.ndim == 1:
+        theta_sup = theta_sup.reshape((nHours, 1))
+
+    phi_m, phi_st, theta_e, theta_sup, theta_set_c, theta_set_h, deadBand, \
+    phi_h_max, phi_c_max = [hourly(arg) for arg in
+                            [phi_m, phi_st, theta_e, theta_sup, theta_set_c,
+                             theta_set_h, deadBand, phi_h_max, phi_c_max]]
+
+    level = None
+    if np.ndim(H_vent) == 2:
+        if np.shape(H_vent) != (nHours, nBldgs):
+            raise ValueError('An hourly H_vent must be n hours by N ' +
+                             'buildings.')
+        if not (H_1 is None and H_2 is None and H_3 is None):
+            raise ValueError('H_1, H_2 and H_3 are calculated from an hourly ' +
+                             'H_vent and must be None.')
+        # coefficients of N buildings x L ventilation levels
+        coef, level = BC.coefficientLevels(C_m, H_em, H_is, H_ms, H_vent,
+                                           H_win)
+        ssLevels = SS.StateSpaceCoefficients(coef)
+    else:
+        C_m, H_1, H_2, H_3, H_em, H_is, H_ms, H_vent, H_win = \
+            [np.ones(nBldgs)*np.asarray(arg, dtype = float) for arg in
+             [C_m, H_1, H_2, H_3, H_em, H_is, H_ms, H_vent, H_win]]
+
+        coef = BC.BuildingCoefficients(C_m, H_em, H_is, H_ms, H_vent, H_win,
+                                       H_1 = H_1, H_2 = H_2, H_3 = H_3)
+        ssLevels = SS.StateSpaceCoefficients(coef)
+
+    if out is None and not strict:
+        out = HR.createResults((nHours, nBldgs))
+
+    if out is None:
+        result = np.zeros((nHours, nBldgs, 4))
+        status = None
+    else:
+        if out.shape != (nHours, nBldgs):
+            raise ValueError('out must hold n hours by N buildings.')
+        result = HR.demandColumns(out)
+        status = out['status']
+        status[:] = HR.STATUS_OK
+
+    # with levels only the driver weights are looked up for every hour
+    b, r = SS.calcDriverTerms(ssLevels if level is None else
+                              BC.pickLevels(ssLevels, level,
+                                            SS.DRIVER_WEIGHTS),
+                              phi_ia, phi_m, phi_st, theta_e, theta_sup)
+
+    if not validated and strict:
+        isoSHM.validateHourlyInputs(phi_ia, phi_m, phi_st, theta_e, theta_sup)
+    elif not validated:
+        with np.errstate(invalid = 'ignore'):
+            invalid = ~(np.isfinite(phi_ia) & np.isfinite(phi_m) &
+                        np.isfinite(phi_st) & (theta_e < 100) &
+                        (theta_e > -100) & (theta_sup < 100) &
+                        (theta_sup > -100))
+        status[invalid] |= HR.STATUS_OUT_OF_RANGE
+        b[invalid] = np.nan
+        r[invalid] = np.nan
+
+    # hours with invalid inputs are expected to give nan in lenient runs
+    invalidValues = np.geterr()['invalid'] if strict else 'ignore'
+    with np.errstate(invalid = invalidValues):
+        solveHours(ssLevels, b, r, theta_set_c, theta_set_h, deadBand,
+                   phi_h_max, phi_c_max, theta_m_0, result, status,
+                   validated, strict, level = level)
+
+    if out is None:
+        return result
+    if level is not None:
+        coef = BC.pickLevels(coef, level)
+    return HR.fillNodeTemperatures(coef, out, phi_ia, phi_m, phi_st, theta_e,
+                                   theta_sup, theta_m_0)
+
+def solveHours(ss, b, r, theta_set_c, theta_set_h, deadBand, phi_h_max,
+               phi_c_max, theta_m_0, result, status, validated, strict,
+               level = None):
+    """
+    Hour loop of calcPortfolioDemand.  Writes the n x N x 4 array result and
+    the status flags in place.  With an hourly ventilation coefficient ss
+    holds N buildings x L levels and level the n x N level of every hour.
+    """
+    nHours, nBldgs = result.shape[:2]
+    a, p, g, k = ss.a, ss.p, ss.g, ss.k
+    bldgs = np.arange(nBldgs)
+    theta_m_t_1 = np.ones(nBldgs)*np.asarray(theta_m_0, dtype = float)
+    lastFinite = theta_m_t_1
+    for hour in range(nHours):
+
+        if not validated:
+            if not strict:
+                # restart buildings after an hour that was not solved
+                theta_m_t_1 = np.where(np.isfinite(theta_m_t_1), theta_m_t_1,
+                                       lastFinite)
+                lastFinite = theta_m_t_1
+            outOfRange = ~((theta_m_t_1 < 100) & (theta_m_t_1 > -100))
+            if strict and np.any(outOfRange):
+                raise EC.TempOutOfBoundError('Error in calculating the ' +
+                    'temperature for the current timestep.  Temperature ' +
+                    'is out of range.')
+            if not strict:
+                status[hour, outOfRange] |= HR.STATUS_OUT_OF_RANGE
+
+        if level is not None:
+            pick = (bldgs, level[hour])
+            a, p, g, k = ss.a[pick], ss.p[pick], ss.g[pick], ss.k[pick]
+
+        # step 1, free floating state of every building
+        theta_m_t_0 = a*theta_m_t_1 + b[hour]
+        theta_air_0 = p*theta_m_t_1 + r[hour]
+
+        heating = theta_air_0 < theta_set_h[hour] - deadBand[hour]
+        cooling = theta_air_0 > theta_set_c[hour] + deadBand[hour]
+        conditioned = heating | cooling
+
+        # step 2, unrestricted need to reach the active set point
+        theta_air_set = np.where(cooling, theta_set_c[hour],
+                                 theta_set_h[hour])
+        delT_set = theta_air_set - theta_air_0
+        phi_hc_need_un = np.where(conditioned, delT_set/k, 0.0)
+
+        # step 3 or step 4, depending on the available capacity
+        limited = conditioned & ((phi_hc_need_un < phi_c_max[hour]) |
+                                 (phi_hc_need_un > phi_h_max[hour]))
+        zeroNeed = limited & (phi_hc_need_un == 0)
+        if np.any(zeroNeed):
+            if strict:
+                raise EC.ZoneResponseError('For some reason the '
+                 + 'un-restricted heating/cooling need is zero, but we are '
+                 + 'in Step 4 of the calculation.')
+            # left free floating
+            status[hour, zeroNeed] |= HR.STATUS_ZERO_NEED
+            limited = limited & ~zeroNeed
+            conditioned = conditioned & ~zeroNeed
+        if status is not None:
+            status[hour, limited] |= HR.STATUS_LIMITED
+
+        phi_hc_need_ac = np.where(limited,
+                                  np.where(phi_hc_need_un < 0,
+                                           phi_c_max[hour], phi_h_max[hour]),
+                                  phi_hc_need_un)
+
+        theta_m_t = theta_m_t_0 + g*phi_hc_need_ac
+
+        theta_air = np.where(limited,
+                             theta_air_0 + k*phi_hc_need_ac,
+                             np.where(conditioned, theta_air_set,
+                                      theta_air_0))
+
+        result[hour, :, 0] = phi_hc_need_ac
+        result[hour, :, 1] = theta_m_t
+        result[hour, :, 2] = phi_hc_need_un
+        result[hour, :, 3] = theta_air
+
+        theta_m_t_1 = theta_m_t
@@ -7,6 +7,14 @@ Created on Mon Jul 07 17:23:03 2014
 from collections import namedtuple
 import numpy as np
 
+# Irradiation on tilted surfaces [Wh/m2], see surfaceIrradiation.
+TiltedSurface = namedtuple('TiltedSurface', 'Ibeam, Idiff, Irec')
+
+# The beam on a surface is zero while the sun is below the horizon or
+# behind the surface.  Near sunrise and sunset cosTheta_z is clamped to the
+# cosine of 89 degrees, which bounds the ratio cosTheta/cosTheta_z.
+MIN_COS_ZENITH = np.cos(np.radians(89.))
+
 def dayAngle(day):
     """
     Calculation of day angle per equation 1.2.2 of An Introduction to Solar
@@ -80,6 +88,7 @@ def timeCorrectionFactor(lon, EoT, UTCoff, DST = 0):
     EoT - equation of time in minutes. [min]
     UTCoff - site timezone defined as hour offset relative to UTC. [h]
     DST - integer flag to indicate if the current hour is in observance of DST.
+          Can be an array of flags for many hours.
     
     Output:
     
@@ -87,10 +96,8 @@ def timeCorrectionFactor(lon, EoT, UTCoff, DST = 0):
     
 
     """
-    if DST:
-        TC = EoT - 4.*lon + 60.*UTCoff - 60 # Subtract an additional 60 mins.
-    else:
-        TC = EoT - 4.*lon + 60.*UTCoff     
+    # Subtract an additional 60 mins in DST.
+    TC = EoT - 4.*lon + 60.*UTCoff - 60.*np.asarray(DST, dtype = bool)
     return TC
 
 def localSolarTime(locTime, timeCorr):
@@ -110,11 +117,13 @@ def localSolarTime(locTime, timeCorr):
     
 def hourAngle(locSolTime):
     """
-    Calculate the sun's hour angle.
+    Calculate the sun's hour angle, zero at solar noon and positive in the
+    morning as in An Introduction to Solar Radiation by Iqbal, so that
+    eqn. 1.6.5a gives azimuths of 90 to the east.
     
     locSolTime - Local solar time in decimal hours.
     """
-    HRA = 15*(locSolTime - 12)
+    HRA = 15*(12 - locSolTime)
     return HRA
 
 def surfaceDirectIrradiation(decAngle, lat, tilt, azi, HRA, DNI):
@@ -128,34 +137,28 @@ def surfaceDirectIrradiation(decAngle, lat, tilt, azi, HRA, DNI):
     decAngle (delta) - Earth's declination angle.
     lat      (phi)   - site latitude in decimal degrees, north positive.
     tilt     (beta)  - object tilt in degrees
-    azi      (gamma) - object azimuth in degrees
+    azi      (gamma) - object azimuth in degrees (0 - S, 90 - E, -90 - W)
     HRA      (omega) - hour angle of the sun in degrees taken at the hour's 
-                       midpoint.
+                       midpoint, positive in the morning, see hourAngle.
     DNI              - average hourly normal irradiance on the surface [Wh/m2]
     
     Output:
     
     B                - Average power over the hour on an arbitrarily oriented 
-                       surface. [Wh/m2]    
+                       surface. [Wh/m2]  Zero with the sun below the horizon
+                       or behind the surface, see MIN_COS_ZENITH.
     """
-    # Unit Conversions
-    
-    decAngle = np.pi*decAngle/180.
-    lat      = np.pi*lat/180.
-    tilt     = np.pi*tilt/180.
-    azi      = np.pi*azi/180.
-    HRA      = np.pi*HRA/180.    
-    
-    # Calculations
+    # Calculations, cosTheta split into site and surface terms
     
-    cosTheta_z = np.sin(decAngle)*np.sin(lat) + np.cos(decAngle)*np.cos(lat)\
-    *np.cos(HRA)
+    siteTerms = siteTimeTerms(lat, decAngle, HRA)
+    surTerms = orientationTerms(tilt, azi)
     
-    cosTheta =  ((np.sin(lat)*np.cos(tilt) - np.cos(lat)*np.sin(tilt)*np.cos(azi))*np.sin(decAngle)
-         + (np.cos(lat)*np.cos(tilt) +  np.sin(lat)*np.sin(tilt)*np.cos(azi))*np.cos(decAngle)*np.cos(HRA)
-         +  np.cos(decAngle)*np.sin(tilt)*np.sin(azi)*np.sin(HRA))   
+    cosTheta = (surTerms[0]*siteTerms[0] + surTerms[1]*siteTerms[1] +
+                surTerms[2]*siteTerms[2])
     
-    B = DNI*cosTheta/cosTheta_z
+    cosTheta_z = siteTerms[0]
+    B = np.where(cosTheta_z > 0., DNI*np.maximum(cosTheta, 0.)/
+                 np.maximum(cosTheta_z, MIN_COS_ZENITH), 0.)[()]
     return B
 
 def surfaceDiffuseIrradiation(tilt, DHI):
@@ -229,17 +232,176 @@ def surfaceIrradiation(lat, lon, tilt, azi, rho, DNI, DHI, day, locTime, UTC,
     TC = timeCorrectionFactor(lon, EoT, UTC, DST)
     LST = localSolarTime(locTime, TC)
     HRA = hourAngle(LST)
+    
+    return tiltedIrradiation(lat, tilt, azi, rho, DNI, DHI, decAng, HRA)
+
+def tiltedIrradiation(lat, tilt, azi, rho, DNI, DHI, decAng, HRA):
+    """
+    surfaceIrradiation for a known position of the sun, e.g. from a table of
+    solarPosition.  The arguments broadcast, so surfaces x hours arrays are
+    calculated at once.
+    
+    Input:
+    
+    lat, tilt, azi, rho, DNI, DHI - see surfaceIrradiation
+    decAng - declination angle in degrees
+    HRA - hour angle of the sun in degrees, positive in the morning
+    
+    Output:
+    namedtuple of Ibeam, Idiff and Irec, see surfaceIrradiation.
+    """
     dniSur = surfaceDirectIrradiation(decAng, lat, tilt, azi, HRA, DNI)
     dhiSur = surfaceDiffuseIrradiation(tilt, DHI)
     Itot = dniSur + dhiSur
     Irec = surfaceGroundIrradiation(Itot, rho, tilt)
     
-    TiltedSurface = namedtuple('TiltedSurface', 'Ibeam, Idiff, Irec')
-    
     surIrrad = TiltedSurface(dniSur, dhiSur, Irec)
     
     return surIrrad
+
+def surfaceIrradiationArray(lat, tilt, azi, rho, DNI, DHI, decAng, HRA,
+                            out = None, siteTerms = None, beamTerms = None):
+    """
+    Batched tiltedIrradiation of k surfaces over n hours.  cosTheta is the
+    product of the orientation terms of the surfaces and the site terms of
+    the hours, so the trigonometry is done on k + n values and the surfaces
+    x hours arrays only take a matrix product and multiply-adds, written in
+    place.  The beam is only evaluated for the hours with the sun up, see
+    sunUpHours, and is zero for the others.
     
+    Input:
     
+    lat     - latitude of site in decimal degrees
+    tilt    - k surface tilts in degrees
+    azi     - k surface azimuths in degrees
+    rho     - surface reflectance
+    DNI, DHI - n hourly irradiation values [W/m2]
+    decAng  - n declination angles in degrees
+    HRA     - n hour angles in degrees
+    out     - optional 3 x k x n float array for the results
+    siteTerms - optional 3 x n siteTimeTerms of the hours, e.g. from a
+                solarPosition table, used instead of lat, decAng and HRA
+    beamTerms - optional 3 x n beamRatioTerms of the hours, e.g. averaged
+                over the hour in a solarPosition table, used instead of
+                siteTerms
     
-    
\ No newline at end of file
+    Output:
+    TiltedSurface of k x n arrays Ibeam, Idiff and Irec, views of out when
+    it is given.
+    """
+    tilt = np.asarray(tilt, dtype = float).reshape(-1)
+    azi = np.asarray(azi, dtype = float).reshape(-1)
+    if len(tilt) != len(azi):
+        raise ValueError('Give one azimuth for every surface tilt.')
+    DNI, DHI = [np.asarray(arg, dtype = float).reshape(-1)
+                for arg in [DNI, DHI]]
+    if beamTerms is None:
+        if siteTerms is None:
+            decAng, HRA = [np.asarray(arg, dtype = float).reshape(-1)
+                           for arg in [decAng, HRA]]
+            if len(decAng) != len(HRA):
+                raise ValueError('Give one hour angle for every declination.')
+            siteTerms = siteTimeTerms(lat, decAng, HRA)
+        beamTerms = beamRatioTerms(siteTerms)
+    nHours = len(DNI)
+    if len(DHI) != nHours or np.shape(beamTerms) != (3, nHours):
+        raise ValueError('Weather and sun position must have one value per ' +
+                         'hour.')
+
+    shape = (3, len(tilt), nHours)
+    if out is None:
+        out = np.empty(shape)
+    elif out.shape != shape or out.dtype != float:
+        raise ValueError('out must be a float array of 3 x surfaces x hours.')
+    Ibeam, Idiff, Irec = out
+
+    # cosTheta/cosTheta_z of every surface and daylight hour, then the beam
+    # of equation 11.2.9 as surfaceDirectIrradiation
+    sunUp = sunUpHours(beamTerms)
+    beam = np.dot(orientationTerms(tilt, azi).T, beamTerms[:, sunUp])
+    np.maximum(beam, 0., out = beam)
+    beam *= DNI[sunUp]
+    Ibeam.fill(0.)
+    Ibeam[:, sunUp] = beam
+
+    np.multiply(((180. - tilt)/180.)[:, np.newaxis], DHI, out = Idiff)
+
+    np.add(Ibeam, Idiff, out = Irec)
+    Irec *= (0.5*rho*(1. - np.cos(np.radians(tilt))))[:, np.newaxis]
+
+    return TiltedSurface(Ibeam, Idiff, Irec)
+
+def siteTimeTerms(lat, decAng, HRA):
+    """
+    Site and time terms of the angle of incidence, so that for a surface of
+    tilt beta and azimuth gamma
+    
+    cosTheta = cos(beta)*T1 + sin(beta)*cos(gamma)*T2
+               + sin(beta)*sin(gamma)*T3
+    
+    T1 is cosTheta_z, the cosine of the solar zenith angle.
+    
+    Input:
+    
+    lat     - latitude of site in decimal degrees
+    decAng  - declination angle(s) in degrees
+    HRA     - hour angle(s) in degrees
+    
+    Output:
+    array of T1, T2 and T3 along the first axis
+    """
+    lat = np.radians(lat)
+    decAng = np.radians(decAng)
+    HRA = np.radians(HRA)
+    sinDec = np.sin(decAng)
+    cosDecCosH = np.cos(decAng)*np.cos(HRA)
+    return np.array(np.broadcast_arrays(
+        sinDec*np.sin(lat) + cosDecCosH*np.cos(lat),
+        cosDecCosH*np.sin(lat) - sinDec*np.cos(lat),
+        np.cos(decAng)*np.sin(HRA)))
+
+def beamRatioTerms(siteTerms):
+    """
+    siteTimeTerms divided by cosTheta_z, clamped to MIN_COS_ZENITH, and zero
+    with the sun below the horizon.  The product with the orientationTerms
+    of a surface is the ratio cosTheta/cosTheta_z of equation 11.2.9.  Being
+    linear in the site terms, it can be averaged over points within an hour
+    before the surfaces are known, see solarPosition.calcPositionTable.
+    """
+    siteTerms = np.asarray(siteTerms, dtype = float)
+    cosTheta_z = siteTerms[0]
+    return np.where(cosTheta_z > 0.,
+                    siteTerms/np.maximum(cosTheta_z, MIN_COS_ZENITH), 0.)
+
+def sunUpHours(siteTerms):
+    """
+    Index of the hours with the sun above the horizon, cosTheta_z > 0, from
+    3 x n siteTimeTerms or beamRatioTerms.
+    """
+    return np.flatnonzero(siteTerms[0] > 0.)
+
+def orientationTerms(tilt, azi):
+    """
+    Surface terms of the angle of incidence, cos(beta), sin(beta)*cos(gamma)
+    and sin(beta)*sin(gamma) along the first axis, see siteTimeTerms.
+    """
+    tilt = np.radians(tilt)
+    azi = np.radians(azi)
+    return np.array(np.broadcast_arrays(np.cos(tilt),
+                                        np.sin(tilt)*np.cos(azi),
+                                        np.sin(tilt)*np.sin(azi)))
+
+def uniqueOrientations(tilt, azi):
+    """
+    Distinct (tilt, azimuth) pairs of a set of surfaces.  Surfaces of the
+    same orientation receive the same irradiation per m2, so it only needs
+    to be calculated for the distinct orientations.
+    
+    Output:
+    tilt, azi - distinct orientations [deg]
+    inverse - index of the orientation of every surface
+    """
+    pairs = np.column_stack((np.asarray(tilt, dtype = float).reshape(-1),
+                             np.asarray(azi, dtype = float).reshape(-1)))
+    unique, inverse = np.unique(pairs, axis = 0, return_inverse = True)
+    return unique[:, 0], unique[:, 1], inverse
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:12:40 2026
+
+@author: mstreet
+"""
+from collections import namedtuple
+import hashlib
+import os
+import tempfile
+import zipfile
+import zlib
+import numpy as np
+import solarEqns as se
+
+# The position of the sun only depends on the site and the hour, so it is
+# calculated once per site and year as a table of every hour of the year
+# and shared by all surfaces and buildings at the site.  Tables are kept in
+# memory and, when a cache directory is given, saved there with np.savez so
+# later runs load them instead of recalculating.
+#
+# Hour h of day d of the year is row (d - 1)*24 + h - 1 of a table, taken
+# at the midpoint of the hour.  Day of year numbering follows dayAngle.
+# siteTerms holds the 3 x nHours site and time terms of the angle of
+# incidence, see solarEqns.siteTimeTerms, so a surface only adds its three
+# orientation terms.  beamTerms holds solarEqns.beamRatioTerms averaged over
+# nSub points within every hour, which follows the sun better than the
+# midpoint in the hours of sunrise and sunset, in particular for east and
+# west facing surfaces.  With nSub = 1 they are taken at the midpoint.
+# Saved tables carry TABLE_VERSION, and files of another version, such as
+# those with hour angles negative in the morning, are calculated again.
+# Files are written under a temporary name and renamed into place, so
+# processes sharing a cache directory never read a partly written table.
+
+SolarPosition = namedtuple('SolarPosition',
+                           'decAng, EoT, HRA, siteTerms, beamTerms')
+
+TABLE_VERSION = 2
+
+tableCache = {}
+
+# errors of np.load and of reading the arrays of a damaged file
+READ_ERRORS = (IOError, ValueError, KeyError, EOFError, zipfile.BadZipfile,
+               zlib.error)
+
+
+def positionKey(lat, lon, UTC, dstPeriod = None, year = None, nSub = 1):
+    """
+    Key of the table of a site.  dstPeriod is None or the (first, last)
+    rows of the year observing daylight saving time, the last excluded.
+    year is None for a year of 365 days.  nSub is the number of points
+    within every hour of the beam terms.
+    """
+    if dstPeriod is not None:
+        dstPeriod = tuple([int(row) for row in dstPeriod])
+    if year is not None:
+        year = int(year)
+    if nSub != int(nSub) or nSub < 1:
+        raise ValueError('The number of points per hour must be a positive ' +
+                         'integer.')
+    return (float(lat), float(lon), float(UTC), dstPeriod, year, int(nSub))
+
+def hoursInYear(year = None):
+    """
+    8784 for leap years and 8760 otherwise or for year None.
+    """
+    if year is not None and (year%4 == 0 and
+                             (year%100 != 0 or year%400 == 0)):
+        return 8784
+    return 8760
+
+def calcPositionTable(lat, lon, UTC, dstPeriod = None, year = None,
+                      nSub = 1):
+    """
+    Solar position at every hour of a year.  The declination and equation
+    of time are calculated per day and repeated for the hours of the day.
+    The beam terms are the mean of nSub points at the midpoints of equal
+    parts of the hour, all evaluated in one array operation.
+    
+    Input:
+    lat, lon - site latitude and longitude in decimal degrees
+    UTC - UTC offset of the timezone
+    dstPeriod - None, or the (first, last) rows in daylight saving time
+    year - calendar year, or None for a year of 365 days
+    nSub - number of points per hour of the beam terms
+    
+    Output:
+    SolarPosition of arrays with one value per hour of the year
+    """
+    nHours = hoursInYear(year)
+    dayAng = se.dayAngle(np.arange(1, nHours//24 + 1))
+    decAng = np.repeat(se.declinAng(dayAng), 24)
+    EoT = np.repeat(se.eqnOfTime(dayAng), 24)
+
+    rows = np.arange(nHours)
+    DST = np.zeros(nHours, dtype = int)
+    if dstPeriod is not None:
+        DST[(rows >= dstPeriod[0]) & (rows < dstPeriod[1])] = 1
+    TC = se.timeCorrectionFactor(lon, EoT, UTC, DST)
+    LST = se.localSolarTime(rows%24 + 0.5, TC)
+    HRA = se.hourAngle(LST)
+
+    # hour angles of the points within the hour, nSub x nHours
+    offset = (np.arange(nSub) + 0.5)/nSub - 0.5
+    subHRA = se.hourAngle(LST + offset[:, np.newaxis])
+    subTerms = se.siteTimeTerms(lat, decAng, subHRA)
+    beamTerms = se.beamRatioTerms(subTerms).mean(axis = 1)
+
+    return SolarPosition(decAng, EoT, HRA, se.siteTimeTerms(lat, decAng, HRA),
+                         beamTerms)
+
+def positionTable(lat, lon, UTC, dstPeriod = None, year = None, nSub = 1,
+                  cacheDir = None):
+    """
+    Solar position table of a site and year from the memory cache, from
+    the files in cacheDir, or calculated with calcPositionTable and added
+    to both.  The arrays are read-only as they are shared.
+    
+    Input:
+    see calcPositionTable
+    cacheDir - optional directory of the table files
+    
+    Output:
+    SolarPosition of arrays with one value per hour of the year
+    """
+    key = positionKey(lat, lon, UTC, dstPeriod, year, nSub)
+    if key in tableCache:
+        return tableCache[key]
+
+    path = None
+    table = None
+    if cacheDir is not None:
+        name = hashlib.md5(repr(key).encode('utf-8')).hexdigest()
+        path = os.path.join(cacheDir, 'solarPosition_' + name + '.npz')
+        if os.path.exists(path):
+            table = loadTable(path, key)
+
+    if table is None:
+        table = calcPositionTable(*key)
+        if path is not None:
+            saveTable(path, key, table)
+
+    for values in table:
+        values.flags.writeable = False
+    tableCache[key] = table
+    return table
+
+def saveTable(path, key, table):
+    """
+    Save table to path through a temporary file in the same directory that
+    is renamed into place.  Where rename does not replace files a table
+    saved in the meantime by another process is kept.
+    """
+    handle, tmpPath = tempfile.mkstemp(suffix = '.npz',
+                                       dir = os.path.dirname(path))
+    try:
+        with os.fdopen(handle, 'wb') as tmpFile:
+            np.savez(tmpFile, key = repr(key), version = TABLE_VERSION,
+                     **table._asdict())
+        os.rename(tmpPath, path)
+    except OSError:
+        if not os.path.exists(path):
+            raise
+    finally:
+        if os.path.exists(tmpPath):
+            os.remove(tmpPath)
+
+def loadTable(path, key):
+    """
+    Table saved in path, or None when the file belongs to another key or
+    version, misses a field of SolarPosition or cannot be read.
+    """
+    # a partly written file has no central directory yet
+    if not zipfile.is_zipfile(path):
+        return None
+    try:
+        data = np.load(path)
+    except READ_ERRORS:
+        return None
+    try:
+        if str(data['key']) != repr(key):
+            return None
+        if 'version' not in data.files or data['version'] != TABLE_VERSION:
+            return None
+        if not set(SolarPosition._fields).issubset(data.files):
+            return None
+        return SolarPosition(*[data[name] for name in SolarPosition._fields])
+    except READ_ERRORS:
+        return None
+    finally:
+        data.close()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:02:37 2026
+
+@author: mstreet
+"""
+from collections import OrderedDict
+import helpFncs
+from classes import modelClasses as MC
+
+# Buildings of a portfolio share a few standard 24 hour schedules.  The
+# registry keeps one ZoneSchedule for every distinct schedule and the hourly
+# arrays expanded from pairs of weekday and weekend schedules, so each pair
+# is expanded once per calculation period.  The hourly arrays are read-only
+# and handed out without copying.
+
+
+class ScheduleRegistry(object):
+    """
+    Interned zone schedules and a bounded cache of their hourly expansions.
+
+    Input:
+    maxSize - number of hourly arrays kept.  The least recently used array is
+              dropped when a new one is added to a full cache.
+
+    Attributes:
+    hits, misses - number of expansions found in and added to the cache
+    """
+    def __init__(self, maxSize = 64):
+        if maxSize < 1:
+            raise ValueError('The cache must hold at least one array.')
+        self.maxSize = maxSize
+        self.schedules = {}
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.schedules)
+
+    def intern(self, schedule):
+        """
+        Return the registered ZoneSchedule with the fractions of schedule,
+        registering it if it is new.
+
+        Input:
+        schedule - ZoneSchedule or 24 hourly fractions
+        """
+        if not hasattr(schedule, 'schdFrac'):
+            schedule = MC.ZoneSchedule(schedule)
+        return self.schedules.setdefault(schedule.key, schedule)
+
+    def expand(self, wdSchd, weSchd, start = (1,1,1), stop = (12,31,24),
+               startDay = 1):
+        """
+        Hourly values of a weekday and a weekend schedule from start to stop,
+        as helpFncs.stackSchedules.
+
+        Input:
+        wdSchd, weSchd - ZoneSchedule or 24 hourly fractions
+        start, stop - (month, day, hour) of the first and last hour
+        startDay - day of the week of the start date, 1 to 7
+
+        Output:
+        hourly - read-only array of the hours from start to stop
+        """
+        wdSchd = self.intern(wdSchd)
+        weSchd = self.intern(weSchd)
+        key = (wdSchd.key, weSchd.key, startDay, tuple(start), tuple(stop))
+
+        hourly = self.cache.pop(key, None)
+        if hourly is None:
+            self.misses += 1
+            hIndex = helpFncs.timeDiff(start, stop)
+            offset = hIndex[0]%24
+            hourly = helpFncs.stackScheduleArray(offset + len(hIndex),
+                                                 wdSchd.schdFrac,
+                                                 weSchd.schdFrac,
+                                                 startDay)[offset:, 0]
+            hourly.flags.writeable = False
+            if len(self.cache) >= self.maxSize:
+                self.cache.popitem(last = False)
+        else:
+            self.hits += 1
+        # most recently used last
+        self.cache[key] = hourly
+        return hourly
+
+    def clear(self):
+        """
+        Drop the cached hourly arrays, keeping the registered schedules.
+        """
+        self.cache.clear()
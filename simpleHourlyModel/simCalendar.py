@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:05:51 2026
+
+@author: mstreet
+"""
+import datetime
+import numpy as np
+
+# Calendar of a calculation period of any length, with leap years and year
+# boundaries taken from numpy datetime64.  The hours are in local standard
+# time, as in weather files, and hour h of a day covers h - 1 to h o'clock.
+# Days of the week are numbered as helpFncs.genSchd, 1 is a Sunday.
+
+ONE_HOUR = np.timedelta64(1, 'h')
+
+
+class SimulationCalendar(object):
+    """
+    Hour by hour calendar of a calculation period.
+
+    Input:
+    start, stop - (year, month, day, hour) of the first and last hour of the
+                  period, both included.  Hours run from 1 to 24.
+    dst - daylight saving time rule, None for none, the default, or 'us'
+          for the second Sunday of March to the first Sunday of November
+          (at 2 am local time).  Schedules stacked by the calendar follow
+          the local clock, while the solar gains of getSolGains follow
+          the daylight saving time of the site.
+
+    Attributes, arrays with one value per hour:
+    year, month, day, hour - date and hour of the day 1 to 24
+    dayOfYear - 1 to 366
+    hourOfYear - 1 to 8784, restarts at every new year
+    dayOfWeek - 1 to 7
+    dst - True for hours in daylight saving time
+    nHours - number of hours of the period
+    startDay - day of the week of the first hour, for helpFncs
+    """
+    def __init__(self, start, stop, dst = None):
+        if dst not in [None, 'us']:
+            raise ValueError("Valid daylight saving time rules are: None, " +
+                             "'us'.")
+        first = toHour(start)
+        last = toHour(stop)
+        if last < first:
+            raise ValueError('The stop hour is before the start hour.')
+
+        # start time of every hour of the period
+        times = np.arange(first, last + ONE_HOUR, ONE_HOUR)
+        days = times.astype('datetime64[D]')
+        months = days.astype('datetime64[M]')
+        years = days.astype('datetime64[Y]')
+
+        self.times = times
+        self.year = years.astype(int) + 1970
+        self.month = months.astype(int)%12 + 1
+        self.day = (days - months).astype(int) + 1
+        self.hour = (times - days).astype(int) + 1
+        self.dayOfYear = (days - years).astype(int) + 1
+        self.hourOfYear = (self.dayOfYear - 1)*24 + self.hour
+        # 1 January 1970 was a Thursday, day 5
+        self.dayOfWeek = (days.astype(int) + 4)%7 + 1
+        self.dst = calcDstFlags(times, self.year, dst)
+
+        for value in [self.times, self.year, self.month, self.day,
+                      self.hour, self.dayOfYear, self.hourOfYear,
+                      self.dayOfWeek, self.dst]:
+            value.flags.writeable = False
+
+        self.nHours = len(times)
+        self.startDay = int(self.dayOfWeek[0])
+
+    def __len__(self):
+        return self.nHours
+
+    def weekdayMask(self, localTime = False):
+        """
+        True for every hour on a weekday, days 2 to 6.  With localTime the
+        day is taken from the local clock, shifted by daylight saving time.
+        """
+        dayOfWeek = self.localTime()[1] if localTime else self.dayOfWeek
+        return (dayOfWeek >= 2) & (dayOfWeek <= 6)
+
+    def localTime(self):
+        """
+        Hour of the day 1 to 24 and day of the week of every hour on the
+        local clock, which runs an hour ahead of standard time during
+        daylight saving time.
+
+        Output:
+        tuple of (hour, dayOfWeek)
+        """
+        times = self.times + self.dst*ONE_HOUR
+        days = times.astype('datetime64[D]')
+        return ((times - days).astype(int) + 1,
+                (days.astype(int) + 4)%7 + 1)
+
+    def stackSchedules(self, wdSchds, weSchds, localTime = True):
+        """
+        Hourly values of weekday and weekend schedules of 24 hours, as
+        helpFncs.stackScheduleArray.  With localTime the schedules follow
+        the local clock, so they move an hour earlier in standard time
+        during daylight saving time.
+
+        Input:
+        wdSchds, weSchds - 24 hours by k schedules, or single schedules
+
+        Output:
+        hourly - nHours by k array
+        """
+        wdSchds = np.asarray(wdSchds)
+        weSchds = np.asarray(weSchds)
+        if wdSchds.ndim == 1:
+            wdSchds = wdSchds.reshape((-1, 1))
+        if weSchds.ndim == 1:
+            weSchds = weSchds.reshape((-1, 1))
+        if wdSchds.shape != weSchds.shape or wdSchds.shape[0] != 24:
+            raise ValueError('Weekday and weekend schedules must be 24 hours '
+                             + 'by the same number of schedules.')
+
+        if localTime:
+            hour, dayOfWeek = self.localTime()
+        else:
+            hour, dayOfWeek = self.hour, self.dayOfWeek
+        isWeekday = ((dayOfWeek >= 2) & (dayOfWeek <= 6)).astype(int)
+        table = np.array([weSchds, wdSchds])
+        return table[isWeekday, hour - 1]
+
+    def yearStarts(self):
+        """
+        Index of the first hour of every calendar year in the period.
+        """
+        return np.flatnonzero(np.diff(np.concatenate(([0], self.year))))
+
+def toHour(date):
+    """
+    Start time of the hour (year, month, day, hour) as datetime64, with hours
+    1 to 24.  Raises ValueError for dates that do not exist, including the
+    29th of February of years that are not leap years.
+    """
+    year, month, day, hour = date
+    if hour != int(hour) or not 1 <= hour <= 24:
+        raise ValueError('Hours must be integers between 1 and 24.')
+    dayStart = np.datetime64(datetime.date(int(year), int(month), int(day)),
+                             'h')
+    return dayStart + (int(hour) - 1)*ONE_HOUR
+
+def calcDstFlags(times, years, rule):
+    """
+    True for the hours of times, in standard time, that fall in daylight
+    saving time.
+    """
+    dst = np.zeros(len(times), dtype = bool)
+    if rule is None:
+        return dst
+
+    for year in np.unique(years):
+        # second Sunday of March at 2 am standard time, to the first Sunday
+        # of November at 2 am daylight time, which is 1 am standard time
+        begin = nthSunday(year, 3, 2) + 2*ONE_HOUR
+        end = nthSunday(year, 11, 1) + ONE_HOUR
+        dst |= (times >= begin) & (times < end)
+    return dst
+
+def nthSunday(year, month, n):
+    """
+    Midnight at the start of the nth Sunday of the month, as datetime64.
+    """
+    first = np.datetime64('%04d-%02d-01' % (year, month), 'D')
+    # days to the first Sunday, 1 January 1970 was a Thursday
+    toSunday = (3 - first.astype(int))%7
+    return (first + toSunday + 7*(n - 1)).astype('datetime64[h]')
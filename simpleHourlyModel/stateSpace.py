@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:22:36 2026
+
+@author: mstreet
+"""
+from classes import errorClassesSHM as EC
+import numpy as np
+import hourlyResults as HR
+
+# State space form of the Annex C network.  With constant coefficients the
+# free floating mass and air temperatures of an hour are affine in the mass
+# temperature of the previous hour:
+#
+#     theta_m_t_0 = a*theta_m_t_1 + b_t
+#     theta_air_0 = p*theta_m_t_1 + r_t
+#
+# b_t and r_t only depend on the drivers of the hour and are calculated for
+# all hours at once.  When the air set point is met the update is again
+# affine, theta_m_t = aSet*theta_m_t_1 + b_t + gk*(theta_air_set - r_t), so
+# every hour of the loop costs a couple of multiply-adds.
+
+
+# coefficients used by calcDriverTerms
+DRIVER_WEIGHTS = ('w_m', 'w_st', 'w_ia', 'w_e', 'w_sup', 'v_st', 'v_ia',
+                  'v_e', 'v_sup', 'v_b')
+
+
+class StateSpaceCoefficients(object):
+    """
+    Read only update coefficients of a building, derived from a
+    buildingCoeffs.BuildingCoefficients object.
+
+    Attributes:
+    a - free floating response of theta_m_t to theta_m_t_1
+    p - free floating response of theta_air to theta_m_t_1
+    g - response of theta_m_t to one watt of need [K/W]
+    k - response of theta_air to one watt of need [K/W]
+    gk - g/k
+    aSet - response of theta_m_t to theta_m_t_1 with the set point met
+    w_m, w_st, w_ia, w_e, w_sup - weights of the drivers in b_t
+    v_st, v_ia, v_e, v_sup, v_b - weights of the drivers and b_t in r_t
+    """
+    __slots__ = ('a', 'p', 'g', 'k', 'gk', 'aSet', 'w_m', 'w_st', 'w_ia',
+                 'w_e', 'w_sup', 'v_st', 'v_ia', 'v_e', 'v_sup', 'v_b')
+
+    def __init__(self, coef):
+        a = coef.a_mt*coef.inv_b_mt
+        g = coef.dTheta_m_t
+        k = coef.dTheta_air
+
+        # q_s of eqn. C.10 without the mass node term
+        s_st = 1.0
+        s_ia = coef.H_1*coef.inv_H_vent
+        s_e = coef.H_win
+        s_sup = coef.H_1
+
+        # b_t = (phi_m + H_em*theta_e + H_3/H_2*q_s)/(c + 0.5*h)
+        w_m = coef.inv_b_mt
+        w_st = coef.r_32*s_st*coef.inv_b_mt
+        w_ia = coef.r_32*s_ia*coef.inv_b_mt
+        w_e = (coef.H_em + coef.r_32*s_e)*coef.inv_b_mt
+        w_sup = coef.r_32*s_sup*coef.inv_b_mt
+
+        # r_t = f*(0.5*H_ms*b_t + q_s) + (H_vent*theta_sup + phi_ia)*inv_b_i
+        f = coef.H_is*coef.inv_b_s*coef.inv_b_i
+        p = f*coef.H_ms*0.5*(1.0 + a)
+
+        values = dict(a = a, p = p, g = g, k = k, gk = g/k,
+                      aSet = a - g*p/k, w_m = w_m, w_st = w_st, w_ia = w_ia,
+                      w_e = w_e, w_sup = w_sup, v_st = f*s_st,
+                      v_ia = f*s_ia + coef.inv_b_i, v_e = f*s_e,
+                      v_sup = f*s_sup + coef.H_vent*coef.inv_b_i,
+                      v_b = f*coef.H_ms*0.5)
+
+        for name in self.__slots__:
+            value = np.array(values[name], dtype = float)
+            if value.ndim == 0:
+                value = float(value)
+            else:
+                value.flags.writeable = False
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('StateSpaceCoefficients are read only.')
+
+    def __delattr__(self, name):
+        raise AttributeError('StateSpaceCoefficients are read only.')
+
+def calcDriverTerms(ss, phi_ia, phi_m, phi_st, theta_e, theta_sup):
+    """
+    The parts of the free floating mass and air temperatures that do not
+    depend on the previous mass temperature.  Works on whole arrays of hours
+    (and buildings).
+
+    Output:
+    b - theta_m_t_0 - a*theta_m_t_1 [C]
+    r - theta_air_0 - p*theta_m_t_1 [C]
+    """
+    b = (ss.w_m*phi_m + ss.w_st*phi_st + ss.w_ia*phi_ia + ss.w_e*theta_e +
+         ss.w_sup*theta_sup)
+    r = (ss.v_b*b + ss.v_st*phi_st + ss.v_ia*phi_ia + ss.v_e*theta_e +
+         ss.v_sup*theta_sup)
+    return b, r
+
+def scanFreeFloat(a, theta_m_t_1, b):
+    """
+    Solve the free floating recurrence theta_m_t = a*theta_m_t_1 + b_t for
+    every hour of b at once, with a cumulative product and sum instead of a
+    loop.  a is a single value or one value per hour of b.  The block of b
+    should be short enough that a**-len(b) stays well within floating point
+    range, see calcScanLength.
+
+    Output:
+    theta_m_t - mass temperature at the end of each hour of the block [C]
+    """
+    if np.ndim(a) == 0:
+        pw = a**np.arange(1, len(b) + 1)
+    else:
+        pw = np.cumprod(a)
+    return pw*(theta_m_t_1 + np.cumsum(b/pw))
+
+def calcScanLength(a, maxLength):
+    """
+    Longest block for scanFreeFloat for which a**-n does not exceed 1e6.
+    """
+    if abs(a) < 1e-3:
+        return 1
+    if abs(a) >= 1:
+        return maxLength
+    return int(max(1, min(maxLength, np.floor(6*np.log(10)/-np.log(abs(a))))))
+
+def lastFinite(theta_m_t, theta_m_0):
+    """
+    The last finite mass temperature of a run, or theta_m_0 when there is
+    none.
+    """
+    finite = np.flatnonzero(np.isfinite(theta_m_t))
+    if len(finite) > 0:
+        return float(theta_m_t[finite[-1]])
+    return theta_m_0
+
+def runStateSpace(ss, b, r, theta_set_c, theta_set_h, deadBand, phi_h_max,
+                  phi_c_max, theta_m_0, scanBlock = 168, checkBounds = True,
+                  out = None, strict = True, status = None):
+    """
+    Advance the mass temperature of a single building through every hour of
+    b and r, following steps 1 to 4 of C.4 of ISO 13790-2008.
+
+    After a run of free floating hours the following hours are assumed to
+    float as well.  A block of them is solved at once with scanFreeFloat and
+    accepted up to the first hour in which the air temperature leaves the
+    dead band.  That hour is solved on its own.  The block starts at 24 hours
+    and doubles up to scanBlock hours as long as the zone keeps floating.
+    The run needed before trying a block starts at 4 hours and doubles with
+    every block that ends early, so that short daily free floating periods
+    are left to the single step.
+
+    Input:
+    ss - StateSpaceCoefficients of the building, or with one value per hour
+         for an hourly ventilation coefficient, see buildingCoeffs.pickLevels
+    b, r - driver terms from calcDriverTerms, one value per hour
+    theta_set_c, theta_set_h - set points [C]
+    deadBand - dead band around the set points [K]
+    phi_h_max, phi_c_max - heating and cooling capacity [W]
+    The set points, dead band and capacities are single values or one value
+    per hour.
+    theta_m_0 - mass temperature before the first hour [C]
+    scanBlock - longest block of free floating hours solved at once.  Set to
+                1 or less to step every hour on its own.
+    checkBounds - raise TempOutOfBoundError when the mass temperature leaves
+                  the range -100 to 100 C.  Can be turned off for inputs
+                  that have been validated before the run.
+    out - optional N x 4 float array the result is written to, for example
+          hourlyResults.demandColumns of a results array.
+    strict - raise TempOutOfBoundError and ZoneResponseError as soon as they
+             occur.  Otherwise the hour is flagged in status and the run goes
+             on: a mass temperature that is not finite is replaced by the
+             last finite one and an hour with zero need in step 4 is left
+             free floating.
+    status - optional integer array of N hours for the hourlyResults status
+             flags.  Required when strict is False.
+
+    Output:
+    result - N x 4 array with the columns actual need, theta_m_t,
+             unrestricted need and theta_air for every hour.
+    """
+    if not strict and status is None:
+        raise ValueError('A status array is required when strict is False.')
+
+    b = np.asarray(b, dtype = float)
+    r = np.asarray(r, dtype = float)
+    nHours = len(b)
+    theta_set_c, theta_set_h, deadBand, phi_h_max, phi_c_max = \
+        [np.ones(nHours)*np.asarray(arg, dtype = float) for arg in
+         [theta_set_c, theta_set_h, deadBand, phi_h_max, phi_c_max]]
+
+    # constant parts of the update of an hour in which the set point is met
+    c_c = (b + ss.gk*(theta_set_c - r)).tolist()
+    c_h = (b + ss.gk*(theta_set_h - r)).tolist()
+    upperArr = theta_set_c + deadBand
+    lowerArr = theta_set_h - deadBand
+    bArr = b
+    rArr = r
+    upper = upperArr.tolist()
+    lower = lowerArr.tolist()
+    set_c = theta_set_c.tolist()
+    set_h = theta_set_h.tolist()
+    h_max = phi_h_max.tolist()
+    c_max = phi_c_max.tolist()
+    b = b.tolist()
+    r = r.tolist()
+
+    # hourly lists of the coefficients, the same value in every hour unless
+    # the ventilation changes
+    hourlyCoef = np.ndim(ss.a) > 0
+    if hourlyCoef and len(ss.a) != nHours:
+        raise ValueError('Hourly coefficients must have one value per hour.')
+    a, p, g, k, aSet = [(np.ones(nHours)*getattr(ss, name)).tolist() for
+                        name in ['a', 'p', 'g', 'k', 'aSet']]
+    aBlock = ss.a
+    pBlock = ss.p
+
+    maxBlock = calcScanLength(np.min(np.abs(ss.a)), scanBlock)
+    block = min(24, maxBlock)
+    minRun = 4
+    floating = 0
+
+    if out is None:
+        result = np.zeros((nHours, 4))
+    else:
+        result = out
+
+    theta = theta_m_0
+    hour = 0
+    while hour < nHours:
+
+        if floating >= minRun and maxBlock > 1:
+            end = min(hour + block, nHours)
+            if hourlyCoef:
+                aBlock = ss.a[hour:end]
+                pBlock = ss.p[hour:end]
+            theta_m_t = scanFreeFloat(aBlock, theta, bArr[hour:end])
+            theta_m_t_1 = np.concatenate(([theta], theta_m_t[:-1]))
+            theta_air_0 = pBlock*theta_m_t_1 + rArr[hour:end]
+            free = ((theta_air_0 <= upperArr[hour:end]) &
+                    (theta_air_0 >= lowerArr[hour:end]))
+            nFree = len(free) if free.all() else int(np.argmin(free))
+
+            # leave an out of range hour to the check of the single step
+            if checkBounds:
+                outOfRange = np.abs(theta_m_t_1[:nFree]) >= 100
+                if np.any(outOfRange):
+                    nFree = int(np.argmax(outOfRange))
+
+            result[hour:hour + nFree, 0] = 0.0
+            result[hour:hour + nFree, 1] = theta_m_t[:nFree]
+            result[hour:hour + nFree, 2] = 0.0
+            result[hour:hour + nFree, 3] = theta_air_0[:nFree]
+            if nFree > 0:
+                theta = float(theta_m_t[nFree - 1])
+            hour += nFree
+
+            if nFree == len(free):
+                block = min(2*block, maxBlock)
+                minRun = 4
+                continue
+            block = min(24, maxBlock)
+            minRun = min(2*minRun, 256)
+            floating = 0
+
+        if not strict and not np.isfinite(theta):
+            # restart after an hour that was not solved
+            theta = lastFinite(result[:hour, 1], theta_m_0)
+
+        if checkBounds and not (theta < 100 and theta > -100):
+            if strict:
+                raise EC.TempOutOfBoundError('Error in calculating the ' +
+                    'temperature for the current timestep.  Temperature is ' +
+                    'out of range.')
+            status[hour] |= HR.STATUS_OUT_OF_RANGE
+
+        theta_air_0 = p[hour]*theta + r[hour]
+
+        if theta_air_0 > upper[hour]:
+            theta_air_set = set_c[hour]
+            c = c_c[hour]
+        elif theta_air_0 < lower[hour]:
+            theta_air_set = set_h[hour]
+            c = c_h[hour]
+        else:
+            theta = a[hour]*theta + b[hour]
+            result[hour] = (0.0, theta, 0.0, theta_air_0)
+            floating += 1
+            hour += 1
+            continue
+
+        phi_hc_need_un = (theta_air_set - theta_air_0)/k[hour]
+
+        if phi_hc_need_un >= c_max[hour] and phi_hc_need_un <= h_max[hour]:
+            theta = aSet[hour]*theta + c
+            result[hour] = (phi_hc_need_un, theta, phi_hc_need_un,
+                            theta_air_set)
+            floating = 0
+            hour += 1
+            continue
+
+        if phi_hc_need_un < 0:
+            phi_hc_need_max = c_max[hour]
+        elif phi_hc_need_un > 0:
+            phi_hc_need_max = h_max[hour]
+        elif strict:
+            raise EC.ZoneResponseError('For some reason the un-restricted '
+             + 'heating/cooling need is zero, but we are in Step 4 of the '
+             + 'calculation.')
+        else:
+            status[hour] |= HR.STATUS_ZERO_NEED
+            theta = a[hour]*theta + b[hour]
+            result[hour] = (0.0, theta, 0.0, theta_air_0)
+            floating = 0
+            hour += 1
+            continue
+
+        if status is not None:
+            status[hour] |= HR.STATUS_LIMITED
+
+        theta = a[hour]*theta + b[hour] + g[hour]*phi_hc_need_max
+        result[hour] = (phi_hc_need_max, theta, phi_hc_need_un,
+                        theta_air_0 + k[hour]*phi_hc_need_max)
+        floating = 0
+        hour += 1
+
+    return result
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:41:09 2026
+
+@author: mstreet
+"""
+# Requirements:
+# BuildingCoefficients should calculate H_1, H_2 and H_3 with annexCeqns
+#                      when they are not given.
+# BuildingCoefficients should not allow its attributes to be changed.
+# BuildingCoefficients should accept arrays of coefficients for N buildings.
+# stepNodeTemperatures should give the same temperatures as
+#                      ISOsimpleHourlyModel.calcNodeTemperatures.
+# coefficientLevels    should calculate the coefficients once for every
+#                      distinct H_vent, and pickLevels should give the same
+#                      coefficients as BuildingCoefficients of every hour.
+# stepFreeFloat should give the same temperatures as stepNodeTemperatures
+#                      with zero heating/cooling need.
+
+import unittest
+import numpy as np
+import annexCeqns as ISO
+import ISOsimpleHourlyModel as isoSHM
+import buildingCoeffs as BC
+
+
+class CoefficientTestData(unittest.TestCase):
+    def setUp(self):
+        self.C_m = np.array([165000.0, 80000.0, 370000.0])
+        self.H_is = ISO.calcH_is(np.array([1.0, 2.0, 3.0]))
+        self.H_vent = np.array([12.0, 60.0, 1200.0])
+        self.H_ms = ISO.calcH_ms(np.array([2.5, 5.0, 10.5]))
+        self.H_win = np.array([0.0, 1.0, 3.0])
+        self.H_em = ISO.calcH_em(np.array([6.0, 12.0, 18.0]), self.H_ms)
+        self.H_1 = ISO.calcH_1(self.H_vent, self.H_is)
+        self.H_2 = ISO.calcH_2(self.H_1, self.H_win)
+        self.H_3 = ISO.calcH_3(self.H_2, self.H_ms)
+
+        self.drivers = dict(phi_ia = np.array([0.0, 10.0, -5.0]),
+                            phi_m = np.array([0.5, 20.0, 3.0]),
+                            phi_st = np.array([0.2, 12.0, 1.0]),
+                            theta_e = np.array([0.0, 13.0, 30.0]),
+                            theta_m_t_1 = np.array([5.0, 11.0, 27.0]),
+                            theta_sup = np.array([0.0, 15.0, 28.0]))
+
+class CoefficientKnownValues(CoefficientTestData):
+
+    def test_DerivedConductances(self):
+        coef = BC.BuildingCoefficients(self.C_m, self.H_em, self.H_is,
+                                       self.H_ms, self.H_vent, self.H_win)
+        self.assertTrue(np.allclose(coef.H_1, self.H_1))
+        self.assertTrue(np.allclose(coef.H_2, self.H_2))
+        self.assertTrue(np.allclose(coef.H_3, self.H_3))
+
+    def test_StepMatchesAnnexC(self):
+        phi_hc_need = np.array([0.0, 150.0, -80.0])
+        for i in range(3):
+            coef = BC.BuildingCoefficients(self.C_m[i], self.H_em[i],
+                                           self.H_is[i], self.H_ms[i],
+                                           self.H_vent[i], self.H_win[i])
+            d = dict([(k, v[i]) for k, v in self.drivers.items()])
+            step = BC.stepNodeTemperatures(coef, d['phi_ia'], d['phi_m'],
+                                           d['phi_st'], phi_hc_need[i],
+                                           d['theta_e'], d['theta_m_t_1'],
+                                           d['theta_sup'])
+            known = isoSHM.calcNodeTemperatures(d['phi_ia'], d['phi_m'],
+                                    d['phi_st'], phi_hc_need[i],
+                                    d['theta_e'], d['theta_m_t_1'],
+                                    d['theta_sup'], self.C_m[i], self.H_1[i],
+                                    self.H_2[i], self.H_3[i], self.H_em[i],
+                                    self.H_is[i], self.H_ms[i],
+                                    self.H_vent[i], self.H_win[i])
+            self.assertTrue(np.allclose(step, known))
+
+    def test_FreeFloatArrays(self):
+        coef = BC.BuildingCoefficients(self.C_m, self.H_em, self.H_is,
+                                       self.H_ms, self.H_vent, self.H_win)
+        d = self.drivers
+        freeFloat = BC.stepFreeFloat(coef, d['phi_ia'], d['phi_m'],
+                                     d['phi_st'], d['theta_e'],
+                                     d['theta_m_t_1'], d['theta_sup'])
+        step = BC.stepNodeTemperatures(coef, d['phi_ia'], d['phi_m'],
+                                       d['phi_st'], 0.0, d['theta_e'],
+                                       d['theta_m_t_1'], d['theta_sup'])
+        self.assertTrue(np.allclose(freeFloat[0], step[1]))
+        self.assertTrue(np.allclose(freeFloat[1], step[4]))
+
+    def test_Levels(self):
+        hourly = np.array([[12.0, 60.0, 1200.0], [24.0, 60.0, 12.0],
+                           [12.0, 60.0, 24.0], [24.0, 60.0, 1200.0]])
+        coefLevels, level = BC.coefficientLevels(self.C_m, self.H_em,
+                                                 self.H_is, self.H_ms,
+                                                 hourly, self.H_win)
+        # the levels of every building, at most 3 per building
+        self.assertEqual(coefLevels.H_vent.shape, (3, 3))
+        self.assertEqual(coefLevels.H_vent.tolist(),
+                         [[12.0, 24.0, 24.0], [60.0, 60.0, 60.0],
+                          [12.0, 24.0, 1200.0]])
+        self.assertEqual(level.shape, hourly.shape)
+
+        picked = BC.pickLevels(coefLevels, level)
+        known = BC.BuildingCoefficients(self.C_m, self.H_em, self.H_is,
+                                        self.H_ms, hourly, self.H_win)
+        for name in known.__slots__:
+            self.assertTrue(np.allclose(getattr(picked, name),
+                                        np.ones(hourly.shape)*
+                                        getattr(known, name)))
+        # one hour of every building
+        hour = BC.pickLevels(coefLevels, level[1])
+        self.assertTrue(np.allclose(hour.H_1, known.H_1[1]))
+
+        # a single building
+        coefLevels, level = BC.coefficientLevels(self.C_m[0], self.H_em[0],
+                                                 self.H_is[0], self.H_ms[0],
+                                                 hourly[:, 2], self.H_win[0])
+        self.assertEqual(coefLevels.H_vent.shape, (3,))
+        picked = BC.pickLevels(coefLevels, level)
+        self.assertTrue(np.allclose(picked.H_vent, hourly[:, 2]))
+        self.assertFalse(picked.H_1.flags.writeable)
+
+    def test_LevelsPerBuilding(self):
+        # two levels in every building, all different across buildings
+        nBldgs = 500
+        H_vent = (np.arange(nBldgs) + 10.0)*np.array([[1.0], [2.0], [1.0]])
+        coefLevels, level = BC.coefficientLevels(1e7, 2e3, 5e3, 9e3, H_vent,
+                                                 100.0)
+        self.assertEqual(coefLevels.H_vent.shape, (nBldgs, 2))
+        self.assertEqual(level.tolist(), [[0]*nBldgs, [1]*nBldgs,
+                                          [0]*nBldgs])
+        self.assertTrue(np.all(BC.pickLevels(coefLevels, level).H_vent ==
+                               H_vent))
+
+class CoefficientReadOnly(CoefficientTestData):
+
+    def test_ReadOnly(self):
+        coef = BC.BuildingCoefficients(self.C_m, self.H_em, self.H_is,
+                                       self.H_ms, self.H_vent, self.H_win)
+        self.assertRaises(AttributeError, setattr, coef, 'H_1', 1.0)
+        self.assertRaises(AttributeError, setattr, coef, 'newAttr', 1.0)
+        self.assertRaises(ValueError, coef.H_1.__setitem__, 0, 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:40:26 2026
+
+@author: mstreet
+"""
+# Requirements:
+# dayOfYear    should convert arrays of months and days to the day of the
+#              year, the same as helpFncs.dateConvert for every date.
+# dayOfYear    should raise ValueError for dates that do not exist.
+# hourOfYear   should raise ValueError for hours outside of 1 to 24.
+# datesToHours should convert an array of (month, day, hour) rows.
+# dayOfWeek    should give the day of the week numbered as helpFncs.genSchd.
+# timeDiff     should return the hours from start to stop, both included.
+
+import unittest
+import numpy as np
+import calendarTables as CT
+from simpleHourlyModel import helpFncs as hF
+
+
+class CalendarKnownValues(unittest.TestCase):
+
+    def test_DayOfYear(self):
+        months = np.repeat(np.arange(1, 13), CT.DAYS_IN_MONTH)
+        days = np.concatenate([np.arange(1, n + 1) for n in
+                               CT.DAYS_IN_MONTH])
+        self.assertTrue(np.all(CT.dayOfYear(months, days) ==
+                               np.arange(1, 366)))
+        self.assertEqual(hF.dateConvert(12, 31), 365)
+        self.assertEqual(hF.dateConvert(3, 1), 60)
+
+    def test_HoursOfYear(self):
+        dates = np.array([[1, 1, 1], [1, 2, 24], [12, 31, 24]])
+        self.assertEqual(CT.datesToHours(dates).tolist(), [1, 48, 8760])
+        self.assertEqual(hF.hourOfYear((2, 1, 5)), 31*24 + 5)
+
+    def test_DayOfWeek(self):
+        for startDay in range(1, 8):
+            week = hF.genSchd(startDay)
+            output = CT.dayOfWeek(np.arange(1, 366), startDay)
+            self.assertTrue(np.all(output == np.resize(week, 365)))
+
+    def test_TimeDiff(self):
+        hours = hF.timeDiff((1, 2, 1), (1, 3, 24))
+        self.assertEqual(list(hours), range(24, 72))
+        self.assertEqual(len(hF.timeDiff((1, 1, 1), (12, 31, 24))), 8760)
+
+class CalendarExceptions(unittest.TestCase):
+
+    def test_InvalidDates(self):
+        self.assertRaises(ValueError, CT.dayOfYear, [1, 2], [31, 29])
+        self.assertRaises(ValueError, CT.dayOfYear, 13, 1)
+        self.assertRaises(ValueError, CT.dayOfYear, 1.5, 1)
+        self.assertRaises(ValueError, CT.hourOfYear, 1, 1, 0)
+        self.assertRaises(ValueError, CT.hourOfYear, 1, 1, 25)
+        self.assertRaises(ValueError, hF.hourOfYear, (1, 1, 25))
+        self.assertRaises(ValueError, CT.dayOfWeek, 1, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:02:31 2026
+
+@author: mstreet
+"""
+# Requirements:
+# calcBuildingDemandWrap should return one row of results for every hour of
+#                    the hourly input arrays.
+# calcBuildingDemandWrap should give the same result as calling
+#                    calcBuildingDemand in a loop and carrying theta_m_t
+#                    forward to the next hour.
+# calcBuildingDemandWrap should raise TempOutOfBoundError for an out of range
+#                    input or mass temperature.
+# calcBuildingDemandWrap should give the same result with the analytic solver
+#                    as with the iso solver, independent of phi_hc_need_10.
+# calcBuildingDemandWrap should raise ValueError for an unknown solver.
+# calcBuildingDemandWrap should accept hourly set points, dead band and
+#                    capacities, or weekday and weekend profiles of them, with
+#                    the same result for both solvers.
+# calcBuildingDemandWrap should give the same result with validated = True
+#                    for valid inputs.
+# calcBuildingDemandWrap should accept an hourly H_vent, with H_1, H_2 and
+#                    H_3 None, and match calcBuildingDemand in a loop with
+#                    the coefficients of each hour, for both solvers.
+# findInvalidHours       should report every hour with an out of range
+#                    temperature or a heat flow that is not finite.
+# validateHourlyInputs   should raise TempOutOfBoundError for out of range
+#                    temperatures and ValueError for heat flows that are not
+#                    finite.
+
+import unittest
+import numpy as np
+import ISOsimpleHourlyModel as isoSHM
+import annexCeqns as ISO
+from classes import errorClassesSHM as EC
+
+
+class DemandWrapTestData(unittest.TestCase):
+    """
+    A one square meter building driven through free floating, heating,
+    cooling and capacity limited hours.
+
+    """
+    def setUp(self):
+        self.A_floor = 1.0
+        self.A_t = 4.5*self.A_floor
+        self.A_m = ISO.calcA_m(self.A_floor, 3)
+        self.C_m = ISO.calcC_m(self.A_floor, 3)
+        self.H_is = ISO.calcH_is(self.A_floor)
+        self.H_vent = ISO.calcH_vent(0.01)
+        self.H_ms = ISO.calcH_ms(self.A_m)
+        self.H_win = 1.0
+        self.H_em = ISO.calcH_em(6.0, self.H_ms)
+        self.H_1 = ISO.calcH_1(self.H_vent, self.H_is)
+        self.H_2 = ISO.calcH_2(self.H_1, self.H_win)
+        self.H_3 = ISO.calcH_3(self.H_2, self.H_ms)
+
+        self.theta_set_c = 24.0
+        self.theta_set_h = 18.0
+        self.deadBand = 0.5
+        self.phi_h_max = 60.0
+        self.phi_c_max = -60.0
+        self.phi_need_10 = 10.0
+        self.theta_m_0 = 20.0
+
+        hours = np.arange(72)
+        self.theta_e = 15.0 + 15.0*np.sin(2*np.pi*(hours - 9)/24.)
+        self.theta_sup = self.theta_e.copy()
+        phi_int = 20.0*((hours%24 > 7) & (hours%24 < 18))
+        phi_sol = 40.0*np.clip(np.sin(2*np.pi*(hours - 6)/24.), 0, 1)
+        self.phi_ia = ISO.calcQ_ia(phi_int)
+        self.phi_m = ISO.calcQ_m(phi_int, phi_sol, self.A_m, self.A_t)
+        self.phi_st = ISO.calcQ_st(phi_int, phi_sol, self.A_m, self.A_t,
+                                   self.H_win)
+
+    def runWrap(self, **kwargs):
+        return isoSHM.calcBuildingDemandWrap(self.phi_ia, self.phi_m,
+                                             self.phi_st, self.theta_e,
+                                             self.theta_sup, self.theta_set_c,
+                                             self.theta_set_h, self.deadBand,
+                                             self.phi_h_max, self.phi_c_max,
+                                             self.phi_need_10, self.theta_m_0,
+                                             self.C_m, self.H_1, self.H_2,
+                                             self.H_3, self.H_em, self.H_is,
+                                             self.H_ms, self.H_vent,
+                                             self.H_win, **kwargs)
+
+    def runLoop(self):
+        result = []
+        theta_m_t_1 = self.theta_m_0
+        for hour in range(len(self.theta_e)):
+            res = isoSHM.calcBuildingDemand(self.phi_ia[hour],
+                                            self.phi_m[hour],
+                                            self.phi_st[hour],
+                                            self.phi_h_max, self.phi_c_max,
+                                            self.phi_need_10,
+                                            self.theta_set_c,
+                                            self.theta_set_h, self.deadBand,
+                                            self.theta_e[hour], theta_m_t_1,
+                                            self.theta_sup[hour], self.C_m,
+                                            self.H_1, self.H_2, self.H_3,
+                                            self.H_em, self.H_is, self.H_ms,
+                                            self.H_vent, self.H_win)
+            result.append(res)
+            theta_m_t_1 = res[1]
+        return np.array(result)
+
+class DemandWrapKnownOutput(DemandWrapTestData):
+
+    def test_HourlyVentilation(self):
+        known = self.runLoop()
+        # ventilation raised during opening hours
+        hours = np.arange(72)
+        H_vent = np.where((hours%24 > 7) & (hours%24 < 18), 3.0, 1.0)*\
+                 self.H_vent
+
+        loop = []
+        theta_m_t_1 = self.theta_m_0
+        for hour in hours:
+            H_1 = ISO.calcH_1(H_vent[hour], self.H_is)
+            H_2 = ISO.calcH_2(H_1, self.H_win)
+            H_3 = ISO.calcH_3(H_2, self.H_ms)
+            res = isoSHM.calcBuildingDemand(self.phi_ia[hour],
+                                            self.phi_m[hour],
+                                            self.phi_st[hour],
+                                            self.phi_h_max, self.phi_c_max,
+                                            self.phi_need_10,
+                                            self.theta_set_c,
+                                            self.theta_set_h, self.deadBand,
+                                            self.theta_e[hour], theta_m_t_1,
+                                            self.theta_sup[hour], self.C_m,
+                                            H_1, H_2, H_3, self.H_em,
+                                            self.H_is, self.H_ms,
+                                            H_vent[hour], self.H_win)
+            loop.append(res)
+            theta_m_t_1 = res[1]
+
+        self.H_1 = self.H_2 = self.H_3 = None
+        self.H_vent = H_vent
+        for solver in ['iso', 'analytic']:
+            result = self.runWrap(solver = solver)
+            self.assertTrue(np.allclose(result, loop, atol = 1e-08))
+        self.assertFalse(np.allclose(result, known, atol = 1e-08))
+
+        # a constant hourly H_vent gives the time invariant result
+        self.H_vent = np.ones(72)*ISO.calcH_vent(0.01)
+        self.assertTrue(np.allclose(self.runWrap(solver = 'analytic'), known,
+                                    atol = 1e-08))
+
+    def test_HourlyVentilationBadInput(self):
+        self.H_vent = np.ones(72)*self.H_vent
+        self.assertRaises(ValueError, self.runWrap)
+        self.H_1 = self.H_2 = self.H_3 = None
+        self.H_vent = self.H_vent[:48]
+        self.assertRaises(ValueError, self.runWrap)
+
+    def test_WrapMatchesHourLoop(self):
+        result = self.runWrap()
+        loop = self.runLoop()
+
+        self.assertTrue(result.shape == (72, 4))
+        self.assertTrue(np.allclose(result, loop, atol = 1e-08))
+
+        # the test period must exercise every step of the calculation
+        self.assertTrue(np.any(result[:, 0] == 0))
+        self.assertTrue(np.any(result[:, 0] == self.phi_h_max))
+        self.assertTrue(np.any(result[:, 0] == self.phi_c_max))
+        self.assertTrue(np.any((result[:, 0] != 0) &
+                               (result[:, 0] == result[:, 2])))
+
+    def test_AnalyticMatchesIso(self):
+        result = self.runWrap()
+        analytic = self.runWrap(solver = 'analytic')
+        self.assertTrue(np.allclose(result, analytic, atol = 1e-08))
+
+        self.phi_need_10 = 1.0e6
+        analytic = self.runWrap(solver = 'analytic')
+        self.assertTrue(np.allclose(result, analytic, atol = 1e-08))
+
+    def test_ValidatedMatches(self):
+        for solver in ['iso', 'analytic']:
+            result = self.runWrap(solver = solver)
+            validated = self.runWrap(solver = solver, validated = True)
+            self.assertTrue(np.allclose(result, validated))
+
+    def test_HourlySettings(self):
+        weekday = np.where((np.arange(24) > 6) & (np.arange(24) < 19),
+                           1.0, 0.0)
+        weekend = np.zeros(24)
+        profiles = dict(theta_set_c = (24.0 + 4*(1 - weekday),
+                                       28.0 + weekend),
+                        theta_set_h = (14.0 + 6*weekday, 14.0 + weekend),
+                        deadBand = (0.5 + 0*weekday, 1.0 + weekend),
+                        phi_h_max = (20.0 + 40*weekday, 20.0 + weekend),
+                        phi_c_max = (-20.0 - 40*weekday, -20.0 + weekend))
+        for name, profile in profiles.items():
+            setattr(self, name, profile)
+        result = self.runWrap(startDay = 6)
+
+        # day 6 is a weekday, followed by the weekend days 7 and 1
+        for name, profile in profiles.items():
+            setattr(self, name, np.concatenate((profile[0], profile[1],
+                                                profile[1])))
+        hourly = self.runWrap()
+        analytic = self.runWrap(solver = 'analytic')
+        self.assertTrue(np.allclose(result, hourly))
+        self.assertTrue(np.allclose(result, analytic, atol = 1e-08))
+        self.assertTrue(np.any(result[:, 0] == 20.0))
+        self.assertTrue(np.any(result[:, 0] == 60.0))
+
+class DemandWrapBadInput(DemandWrapTestData):
+
+    def test_OutOfBoundTemp(self):
+        self.theta_e[10] = 120.
+        self.assertRaises(EC.TempOutOfBoundError, self.runWrap)
+        self.assertRaises(EC.TempOutOfBoundError, self.runWrap,
+                          solver = 'analytic')
+
+        # the mass temperature is checked every hour
+        self.setUp()
+        self.theta_m_0 = 150.
+        self.assertRaises(EC.TempOutOfBoundError, self.runWrap)
+        self.assertRaises(EC.TempOutOfBoundError, self.runWrap,
+                          solver = 'analytic')
+
+    def test_InvalidHoursReport(self):
+        self.theta_e[[3, 40]] = 120.
+        self.theta_sup[7] = np.nan
+        self.phi_m[[2, 7]] = np.inf
+        report = isoSHM.findInvalidHours(self.phi_ia, self.phi_m,
+                                         self.phi_st, self.theta_e,
+                                         self.theta_sup)
+        self.assertEqual(sorted(report.keys()),
+                         ['phi_m', 'theta_e', 'theta_sup'])
+        self.assertEqual(list(report['theta_e']), [3, 40])
+        self.assertEqual(list(report['theta_sup']), [7])
+        self.assertEqual(list(report['phi_m']), [2, 7])
+
+        twoBldgs = np.column_stack((self.theta_e, self.theta_e - 200.))
+        report = isoSHM.findInvalidHours(0.0, 0.0, 0.0, twoBldgs, 0.0)
+        self.assertEqual(len(report['theta_e']), 72)
+
+    def test_ValidateHourlyInputs(self):
+        self.phi_st[5] = np.nan
+        self.assertRaises(ValueError, isoSHM.validateHourlyInputs,
+                          self.phi_ia, self.phi_m, self.phi_st,
+                          self.theta_e, self.theta_sup)
+        self.assertRaises(ValueError, self.runWrap)
+        self.theta_e[5] = -100.
+        self.assertRaises(EC.TempOutOfBoundError,
+                          isoSHM.validateHourlyInputs, self.phi_ia,
+                          self.phi_m, self.phi_st, self.theta_e,
+                          self.theta_sup)
+
+    def test_ProfilesWithoutStartDay(self):
+        self.theta_set_h = (np.ones(24)*18.0, np.ones(24)*14.0)
+        self.assertRaises(ValueError, self.runWrap)
+
+    def test_UnknownSolver(self):
+        self.assertRaises(ValueError, self.runWrap, solver = 'newton')
+
+if __name__ == '__main__':
+    unittest.main()
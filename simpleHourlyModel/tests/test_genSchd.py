@@ -11,6 +11,16 @@ Created on Thu Jul 10 14:39:54 2014
 # genSchd should return an np.array indicating the order of the week.
 # genSchd should raise a ValueError if the input is outside of the range 1 to
 #         7.
+# stackSchedules should stack weekday and weekend schedules for periods of
+#         more than one week.
+# stackScheduleArray should give for every schedule the same hourly values as
+#         stackSchedules, as an hours by schedules array.
+# genDayIndex should give the day of the week of every hour, repeating the
+#         week of genSchd for any number of hours.
+# weekdayMask should be True for the hours of days 2 to 6.
+# expandHourly should return one value per hour for a single value, hourly
+#         values or weekday and weekend profiles, and raise a ValueError for
+#         hourly values of the wrong length.
 import unittest
 import numpy as np
 from simpleHourlyModel import helpFncs as hF
@@ -54,5 +64,67 @@ class genSchdExceptions(GenSchdTestSetUp):
         self.assertRaises(ValueError, hF.genSchd, -1)
         self.assertRaises(ValueError, hF.genSchd, 33)
 
+class genDayIndexKnownValues(GenSchdTestSetUp):
+
+    def test_KnownValuesGenDayIndex(self):
+        for startDay in range(1, 8):
+            output = hF.genDayIndex(startDay, 24*800 + 7)
+            known = np.resize(np.repeat(hF.genSchd(startDay), 24),
+                              24*800 + 7)
+            self.assertTrue(np.all(output == known))
+        self.assertRaises(ValueError, hF.genDayIndex, 0, 24)
+
+class stackSchedulesKnownValues(GenSchdTestSetUp):
+
+    def test_KnownValuesStackSchedules(self):
+        # starting on a Sunday, days 1 and 7 are the weekend
+        output = hF.stackSchedules(24*15, range(24), range(100, 124), 1)
+        days = output.reshape((15, 24))
+        weekend = [0, 6, 7, 13, 14]
+        for day in range(15):
+            offset = 100 if day in weekend else 0
+            self.assertTrue(np.all(days[day] == np.arange(24) + offset))
+
+    def test_KnownValuesStackScheduleArray(self):
+        wd = np.arange(24*14).reshape((24, 14))
+        we = -wd
+        for startDay in range(1, 8):
+            output = hF.stackScheduleArray(24*10 + 5, wd, we, startDay)
+            self.assertEqual(output.shape, (24*10 + 5, 14))
+            for k in range(14):
+                known = hF.stackSchedules(24*10 + 5, wd[:, k], we[:, k],
+                                          startDay)
+                self.assertTrue(np.all(output[:, k] == known))
+
+    def test_KnownValuesWeekdayMask(self):
+        mask = hF.weekdayMask(24*7, 7)
+        self.assertTrue(np.all(mask.reshape((7, 24)).all(axis = 1) ==
+                               [False, False, True, True, True, True, True]))
+
+    def test_ExceptionsStackScheduleArray(self):
+        self.assertRaises(ValueError, hF.stackScheduleArray, 48,
+                          np.ones((24, 2)), np.ones((24, 3)), 1)
+        self.assertRaises(ValueError, hF.stackScheduleArray, 48,
+                          np.ones(23), np.ones(23), 1)
+        self.assertRaises(ValueError, hF.stackScheduleArray, 48,
+                          np.ones(24), np.ones(24), 8)
+
+class expandHourlyKnownValues(GenSchdTestSetUp):
+
+    def test_KnownValuesExpandHourly(self):
+        self.assertTrue(np.all(hF.expandHourly(2.0, 5) == 2.0))
+        self.assertTrue(np.all(hF.expandHourly(range(5), 5) == range(5)))
+        profiles = (np.ones(24), np.zeros(24))
+        output = hF.expandHourly(profiles, 48, 7)
+        self.assertTrue(np.all(output == np.repeat([0.0, 0.0], 24)))
+        output = hF.expandHourly(profiles, 48, 6)
+        self.assertTrue(np.all(output == np.repeat([1.0, 0.0], 24)))
+
+    def test_ExceptionsExpandHourly(self):
+        self.assertRaises(ValueError, hF.expandHourly, range(4), 5)
+        self.assertRaises(ValueError, hF.expandHourly,
+                          (np.ones(24), np.zeros(24)), 48)
+        self.assertRaises(ValueError, hF.expandHourly, (1.0, 2.0), 48, 1)
+
 if __name__ == '__main__':
     unittest.main()
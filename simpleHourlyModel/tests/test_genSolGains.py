@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 20:47:13 2026
+
+@author: mstreet
+"""
+# Requirements:
+# genSolGains should return the solar gain of every hour of the period.
+# genSolGains should equal the sum of caclPhi_sol_k over the surfaces of the
+#             envelope, with the irradiation of solarEqns.surfaceIrradiation
+#             calculated one surface and hour at a time.
+# genSolGains should accept weather data of the period or of a whole year.
+# genPortfolioSolGains should give genSolGains of every building, with the
+#             orientations of the surfaces of all buildings combined.
+# genSolGains should raise ValueError for dates that do not exist and for
+#             missing weather data.
+# ZoneEnvelope and BuiltUpSurface should not share surfaces or layers between
+#             objects.
+
+import unittest
+import numpy as np
+import annexCeqns as ISO
+import getSolGains as gsg
+from pysolsurface import solarEqns as se
+from classes import modelClasses as MC
+
+
+class SolarTestData(unittest.TestCase):
+    def setUp(self):
+        conc = MC.ConstructionMaterial(880., 1.4, 2300., 0.6, 0.9)
+        self.walls = []
+        for azi in [0., 90., 180., -90.]:
+            layers = [MC.ConstructionLayer(90., azi, 10., 0.2, conc),
+                      MC.ConstructionLayer(90., azi, 10., 0.1, conc)]
+            self.walls.append(MC.BuiltUpSurface(layers))
+        roof = MC.BuiltUpSurface([MC.ConstructionLayer(0., 0., 20., 0.3,
+                                                       conc)], shdFac = 0.8)
+        self.window = MC.GlazedSurface(90., 0., 4., 2.8, 0.6, 0.25,
+                                       movShd = 0.9)
+        self.surfaces = self.walls + [roof, self.window]
+        self.building = MC.ZoneEnvelope(60., 20., solar = self.surfaces)
+        self.site = MC.BuildingSite(-122.3, 37.8, -8)
+
+        hours = np.arange(8760)
+        sun = np.clip(np.sin(2*np.pi*(hours%24 - 6)/24.), 0, 1)
+        self.DNI = 600.*sun
+        self.DHI = 100.*sun
+        self.start = (1,15,1)
+        self.stop = (1,16,24)
+
+    def loopGains(self, hIndex, dst = 0):
+        """
+        Equation 43 one surface and hour at a time.
+        """
+        qSol = []
+        for hour in hIndex:
+            total = 0.0
+            for surface in self.surfaces:
+                if hasattr(surface, 'gGl'):
+                    effArea = ISO.calcA_eff_gl(surface.movShd, surface.gGl,
+                                               surface.frmFra, surface.area)
+                    emiLon = surface.emiLon
+                else:
+                    mat = surface.extSur.matProps
+                    effArea = ISO.calcA_eff_op(mat.absSol, 0.04,
+                                               surface.Utot, surface.area)
+                    emiLon = mat.emiLon
+                irr = se.surfaceIrradiation(self.site.lat, self.site.lon,
+                                            surface.tilt, surface.azi, 0.2,
+                                            self.DNI[hour], self.DHI[hour],
+                                            hour//24 + 1, hour%24 + 0.5,
+                                            self.site.UTC, dst)
+                phi_sky = ISO.calcPhi_long(0.04, surface.Utot, surface.area,
+                                           emiLon)
+                skyFac = 0.5*(1 + np.cos(np.radians(surface.tilt)))
+                total += ISO.caclPhi_sol_k(surface.shdFac, effArea,
+                                           sum(irr), skyFac, phi_sky)
+            qSol.append(total)
+        return np.array(qSol)
+
+class SolarKnownValues(SolarTestData):
+
+    def test_MatchesSurfaceLoop(self):
+        result = gsg.genSolGains(self.building, self.site, self.start,
+                                 self.stop, DNI = self.DNI, DHI = self.DHI)
+        self.assertEqual(result.shape, (48,))
+        known = self.loopGains(range(14*24, 16*24))
+        self.assertTrue(np.allclose(result, known))
+
+        period = gsg.genSolGains(self.building, self.site, self.start,
+                                 self.stop, DNI = self.DNI[14*24:16*24],
+                                 DHI = self.DHI[14*24:16*24])
+        self.assertTrue(np.allclose(period, result))
+
+    def test_Portfolio(self):
+        other = MC.ZoneEnvelope(10., 5., solar = [self.window, self.walls[2]])
+        result = gsg.genPortfolioSolGains([self.building, other], self.site,
+                                          self.start, self.stop,
+                                          DNI = self.DNI, DHI = self.DHI)
+        self.assertEqual(result.shape, (2, 48))
+        for row, building in zip(result, [self.building, other]):
+            known = gsg.genSolGains(building, self.site, self.start,
+                                    self.stop, DNI = self.DNI, DHI = self.DHI)
+            self.assertTrue(np.allclose(row, known))
+
+        self.surfaces = [self.window, self.walls[2]]
+        self.assertTrue(np.allclose(result[1],
+                                    self.loopGains(range(14*24, 16*24))))
+
+    def test_SeparateObjects(self):
+        other = MC.ZoneEnvelope(10., 5., solar = [self.window])
+        self.assertEqual(len(other.zoneSol), 1)
+        self.assertEqual(len(self.building.zoneSol), 6)
+        self.assertEqual(len(self.walls[0].surf), 2)
+        self.assertTrue(np.allclose(self.walls[0].Rtot, 1.4/0.2 + 1.4/0.1))
+
+class SolarBadInput(SolarTestData):
+
+    def test_BadDates(self):
+        for start, stop in [((2,28,22), (2,29,15)), ((1,1,1), (1,33,3)),
+                            ((1,1,0), (1,1,15)), ((1,1,1), (1,1,35))]:
+            self.assertRaises(ValueError, gsg.genSolGains, self.building,
+                              self.site, start, stop, DNI = self.DNI,
+                              DHI = self.DHI)
+        self.assertRaises(ValueError, gsg.genSolGains, self.building,
+                          self.site, self.start, self.stop)
+        self.assertRaises(ValueError, gsg.genSolGains, self.building,
+                          self.site, self.start, self.stop,
+                          DNI = self.DNI[:100], DHI = self.DHI[:100])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,8 +9,8 @@ Created on Thu Jul 10 16:15:02 2014
 # getIntGains should correctly generate the number of simulation hours from a
 #             given start and stop date.
 # getIntGains should explicitly not handle leap years.
-# getIntGains should return a single vector of type numpy.ndarray that is the 
-#             zone internal gain at each hour.
+# getIntGains should return an N x 2 numpy.ndarray of the zone internal gain
+#             and the outdoor air flow at each hour.
 # getIntGains should be able to handle up to 14 different schedules (7 gain 
 #             types with weekday or weekend schedule)
 # getIntGains should not do the calculation for a general gain if the peak is
@@ -18,13 +18,15 @@ Created on Thu Jul 10 16:15:02 2014
 # getIntGains should not do the calculation for a distribution gain if either
 #               the average heat or distribution length is zero.
 # getIntGains should return a known solution for known inputs.
+# getIntGains should raise ScheduleError for a missing schedule of a gain
+#             with a non-zero peak.
 
 
 import unittest
 import numpy as np
 import annexCeqns as ISO
 from classes import errorClassesSHM as EC
-from simpleHourlyModel import genIntGains as gig
+import genIntGains as gig
 # import pdb
 
 
@@ -36,7 +38,7 @@ class GainsTestData(unittest.TestCase):
             self.appDen = 10
             self.outAir = 10 # L/s/per
             self.lightDen = 10
-            self.stop = (1,3,1) # stop 48 hours later
+            self.stop = (1,2,24) # stop 48 hours later
             self.wd_oc_sch = np.ones(24)
             self.we_oc_sch = np.ones(24)*0.5
             self.wd_app_sch = np.ones(24)
@@ -44,8 +46,26 @@ class GainsTestData(unittest.TestCase):
             self.wd_light_sch = np.ones(24)
             self.we_light_sch = np.ones(24)*0.5
             self.startDay = 6 # start on friday
-            self.resGains = np.hstack([2400*3*np.ones(24), 
-                                       1200*3*np.ones(24)])
+            # occupants 10*10*100 W, appliances and lights 10*10 W each
+            self.resGains = np.hstack([10200*np.ones(24), 
+                                       5100*np.ones(24)])
+            # 10 L/s for each of 100 people
+            self.resFlow = np.hstack([np.ones(24), 0.5*np.ones(24)])
+
+        def runGains(self, **kwargs):
+            args = dict(A_floor = self.area, occDen = self.occDen,
+                        actLev = self.actLev, outAir = self.outAir,
+                        oc_schd_wd = self.wd_oc_sch,
+                        oc_schd_we = self.we_oc_sch,
+                        appDen = self.appDen, 
+                        app_schd_wd = self.wd_app_sch,
+                        app_schd_we = self.we_app_sch,
+                        lightDen = self.lightDen,
+                        light_schd_wd = self.wd_light_sch, 
+                        light_schd_we = self.we_light_sch,
+                        stop = self.stop, startDay = self.startDay)
+            args.update(kwargs)
+            return gig.genIntGains(**args)
             
         
 class GainsTestKnownValues(GainsTestData):
@@ -72,7 +92,36 @@ class GainsTestKnownValues(GainsTestData):
         self.assertTrue(isinstance(result, np.ndarray))
         
         # Test that the result equals a known value
-        self.assertTrue(np.allclose(self.resGains, result))        
+        self.assertEqual(result.shape, (48, 2))
+        self.assertTrue(np.allclose(self.resGains, result[:, 0]))
+        self.assertTrue(np.allclose(self.resFlow, result[:, 1]))
+
+    def test_SkippedGains(self):
+        known = self.runGains()
+        # zero peaks and zero lengths need no schedule
+        result = self.runGains(procDen = 0, qH2O = 5, H2Olen = 0,
+                               qHVAC = 0, HVAClen = 3)
+        self.assertTrue(np.allclose(known, result))
+
+        # all seven gains, the adjacent space gain is halved
+        sch = np.ones(24)
+        result = self.runGains(procDen = 1, proc_schd_wd = sch,
+                               proc_schd_we = sch,
+                               adjDen = 2, adj_schd_wd = sch,
+                               adj_schd_we = sch,
+                               qH2O = 3, H2Olen = 2, H2O_schd_wd = sch,
+                               H2O_schd_we = sch,
+                               qHVAC = -1, HVAClen = 4, HVAC_schd_wd = sch,
+                               HVAC_schd_we = sch)
+        self.assertTrue(np.allclose(result[:, 0] - known[:, 0],
+                                    10 + 10 + 6 - 4))
+        self.assertTrue(np.allclose(result[:, 1], known[:, 1]))
+
+    def test_StartHour(self):
+        # start at 6 pm on the Friday, the Saturday starts at hour 7
+        result = self.runGains(start = (1,1,18))
+        self.assertEqual(len(result), 31)
+        self.assertTrue(np.allclose(result[:, 0], self.resGains[17:]))
         
 class GainsTestBadInput(GainsTestData):
     def test_BadInputGenIntGains(self):
@@ -92,6 +141,11 @@ class GainsTestBadInput(GainsTestData):
                         light_schd_wd = self.wd_light_sch, 
                         light_schd_we = self.we_light_sch,
                         stop = (2,29,12), startDay = self.startDay)
+
+    def test_MissingSchedule(self):
+        self.assertRaises(EC.ScheduleError, self.runGains, procDen = 1)
+        self.assertRaises(EC.ScheduleError, self.runGains,
+                          app_schd_we = np.ones(12))
             
              
 if __name__ == '__main__':
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:58:40 2026
+
+@author: mstreet
+"""
+# Requirements:
+# createResults  should return a zero filled structured array with a named
+#                field for every result of the calculation.
+# demandColumns  should return a view, so that writing the N x 4 columns
+#                writes the fields of the results array.
+# calcBuildingDemandWrap should write the same need and temperatures to out as
+#                it returns without out, for both solvers.
+# fillNodeTemperatures should give the node temperatures of
+#                ISOsimpleHourlyModel.getAirTemperatures for the actual need.
+# calcPortfolioDemand should write the same results to out as it returns
+#                without out.
+# calcBuildingDemand should write its result to a row of a results array.
+# calcBuildingDemandWrap with strict = False should flag hours with invalid
+#                inputs in the status field instead of raising, give the
+#                same result with both solvers, and set STATUS_LIMITED for
+#                capacity limited hours.
+# calcPortfolioDemand with strict = False should flag only the building with
+#                invalid inputs and leave the other buildings unchanged.
+# strict = False should restart the hour after invalid hours from the last
+#                finite mass temperature without flagging it, in all
+#                engines and without numpy warnings.
+# fillNodeTemperatures should give nan node temperatures on hours that were
+#                not solved and finite ones on the hour after them.
+
+import unittest
+import warnings
+import numpy as np
+import ISOsimpleHourlyModel as isoSHM
+import portfolioModel as pM
+import hourlyResults as HR
+import stateSpace as SS
+from test_demandWrap import DemandWrapTestData
+
+
+class ResultsKnownOutput(DemandWrapTestData):
+
+    def test_CreateResults(self):
+        results = HR.createResults((5, 2))
+        self.assertEqual(results.shape, (5, 2))
+        self.assertEqual(results.dtype.names, HR.RESULT_FIELDS)
+        self.assertTrue(np.all(results['theta_op'] == 0))
+
+        columns = HR.demandColumns(results)
+        self.assertEqual(columns.shape, (5, 2, 4))
+        columns[3, 1] = (1.0, 2.0, 3.0, 4.0)
+        self.assertEqual(results['phi_hc_need_un'][3, 1], 3.0)
+        self.assertEqual(results['theta_air'][3, 1], 4.0)
+        self.assertRaises(TypeError, HR.demandColumns, np.zeros((5, 4)))
+
+    def test_WrapWritesOut(self):
+        for solver in ['iso', 'analytic']:
+            result = self.runWrap(solver = solver)
+            out = HR.createResults(len(self.theta_e))
+            returned = self.runWrap(solver = solver, out = out)
+            self.assertTrue(returned is out)
+            for i, name in enumerate(HR.DEMAND_FIELDS):
+                self.assertTrue(np.allclose(out[name], result[:, i]))
+
+        theta_m_t_1 = self.theta_m_0
+        for hour in range(len(self.theta_e)):
+            known = isoSHM.getAirTemperatures(self.phi_ia[hour],
+                                      self.phi_m[hour], self.phi_st[hour],
+                                      self.phi_h_max, self.phi_c_max,
+                                      out['phi_hc_need_ac'][hour],
+                                      self.theta_e[hour], theta_m_t_1,
+                                      self.theta_sup[hour], self.C_m,
+                                      self.H_1, self.H_2, self.H_3,
+                                      self.H_em, self.H_is, self.H_ms,
+                                      self.H_vent, self.H_win)
+            row = [out[name][hour] for name in isoSHM.NODE_RESULT_FIELDS]
+            self.assertTrue(np.allclose(row, known, atol = 1e-08))
+            theta_m_t_1 = out['theta_m_t'][hour]
+
+    def test_PortfolioWritesOut(self):
+        phi_ia = np.column_stack((self.phi_ia, 2*self.phi_ia))
+        phi_m = np.column_stack((self.phi_m, 2*self.phi_m))
+        phi_st = np.column_stack((self.phi_st, 2*self.phi_st))
+        args = (phi_ia, phi_m, phi_st, self.theta_e, self.theta_sup,
+                self.theta_set_c, self.theta_set_h, self.deadBand,
+                self.phi_h_max, self.phi_c_max, self.theta_m_0, self.C_m,
+                self.H_1, self.H_2, self.H_3, self.H_em, self.H_is,
+                self.H_ms, self.H_vent, self.H_win)
+        result = pM.calcPortfolioDemand(*args)
+        out = pM.calcPortfolioDemand(*args,
+                                     out = HR.createResults(phi_ia.shape))
+        self.assertTrue(np.allclose(HR.demandColumns(out), result))
+        self.assertTrue(np.all(out['theta_op'] != 0))
+
+    def test_HourWritesRow(self):
+        args = (self.phi_ia[12], self.phi_m[12], self.phi_st[12],
+                self.phi_h_max, self.phi_c_max, self.phi_need_10,
+                self.theta_set_c, self.theta_set_h, self.deadBand,
+                self.theta_e[12], self.theta_m_0, self.theta_sup[12],
+                self.C_m, self.H_1, self.H_2, self.H_3, self.H_em, self.H_is,
+                self.H_ms, self.H_vent, self.H_win)
+        known = isoSHM.calcBuildingDemand(*args)
+        results = HR.createResults(3)
+        isoSHM.calcBuildingDemand(*args, out = results[1])
+        self.assertTrue(np.allclose(HR.demandColumns(results)[1], known))
+        self.assertTrue(np.all(results['theta_m_t'][[0, 2]] == 0))
+
+class ResultsStatus(DemandWrapTestData):
+
+    def test_WrapFlagsHours(self):
+        strict = self.runWrap()
+        self.theta_e[10] = 120.
+        self.theta_sup[30] = np.nan
+        iso = self.runWrap(strict = False)
+        analytic = self.runWrap(solver = 'analytic', strict = False)
+
+        for results in [iso, analytic]:
+            flagged = np.flatnonzero(results['status'] &
+                                     HR.STATUS_OUT_OF_RANGE)
+            self.assertEqual(list(flagged), [10, 30])
+            self.assertTrue(np.all(np.isfinite(results['theta_m_t'][:10])))
+            self.assertTrue(np.allclose(results['theta_m_t'][:10],
+                                        strict[:10, 1]))
+            self.assertTrue(np.all(np.isfinite(results['theta_m_t'][32:])))
+
+            limited = results['phi_hc_need_ac'] != results['phi_hc_need_un']
+            self.assertTrue(np.any(limited))
+            self.assertTrue(np.all((results['status'] & HR.STATUS_LIMITED
+                                    != 0) == limited))
+
+        self.assertTrue(np.allclose(HR.demandColumns(iso),
+                                    HR.demandColumns(analytic),
+                                    atol = 1e-08, equal_nan = True))
+
+    def test_ConsecutiveInvalidHours(self):
+        # hour 22 falls inside a free floating scan of the analytic solver
+        self.theta_e[[22, 50, 51]] = np.nan
+        with warnings.catch_warnings(record = True) as caught:
+            warnings.simplefilter('always')
+            iso = self.runWrap(strict = False)
+            analytic = self.runWrap(solver = 'analytic', strict = False)
+            portfolio = pM.calcPortfolioDemand(
+                self.phi_ia[:, None], self.phi_m[:, None],
+                self.phi_st[:, None], self.theta_e,
+                self.theta_sup, self.theta_set_c, self.theta_set_h,
+                self.deadBand, self.phi_h_max, self.phi_c_max, self.theta_m_0,
+                self.C_m, self.H_1, self.H_2, self.H_3, self.H_em, self.H_is,
+                self.H_ms, self.H_vent, self.H_win, strict = False)[:, 0]
+        self.assertEqual([str(warning.message) for warning in caught], [])
+
+        for results in [iso, analytic, portfolio]:
+            flagged = np.flatnonzero(results['status'] &
+                                     HR.STATUS_OUT_OF_RANGE)
+            self.assertEqual(list(flagged), [22, 50, 51])
+            self.assertTrue(np.all(np.isfinite(results['theta_m_t'][23:50])))
+            self.assertTrue(np.all(np.isfinite(results['theta_m_t'][52:])))
+            self.assertTrue(np.allclose(results['theta_m_t'],
+                                        iso['theta_m_t'], equal_nan = True))
+
+    def test_NodesAroundInvalidHour(self):
+        self.theta_e[10] = 500.
+        iso = self.runWrap(strict = False)
+        analytic = self.runWrap(solver = 'analytic', strict = False)
+        portfolio = pM.calcPortfolioDemand(
+            self.phi_ia[:, None], self.phi_m[:, None], self.phi_st[:, None],
+            self.theta_e, self.theta_sup, self.theta_set_c, self.theta_set_h,
+            self.deadBand, self.phi_h_max, self.phi_c_max, self.theta_m_0,
+            self.C_m, self.H_1, self.H_2, self.H_3, self.H_em, self.H_is,
+            self.H_ms, self.H_vent, self.H_win, strict = False)[:, 0]
+
+        for results in [iso, analytic, portfolio]:
+            self.assertEqual(results['status'][11], HR.STATUS_OK)
+            for name in HR.NODE_FIELDS:
+                self.assertTrue(np.isnan(results[name][10]))
+                self.assertTrue(np.all(np.isfinite(results[name][11:])))
+            self.assertTrue(np.allclose(results['theta_m'][11],
+                                        (results['theta_m_t'][9] +
+                                         results['theta_m_t'][11])/2))
+
+    def test_StatusRequired(self):
+        self.assertRaises(ValueError, SS.runStateSpace, None, np.zeros(3),
+                          np.zeros(3), 24.0, 18.0, 0.5, 60.0, -60.0, 20.0,
+                          strict = False)
+
+    def test_PortfolioFlagsBuilding(self):
+        phi_ia = np.column_stack((self.phi_ia, self.phi_ia))
+        phi_m = np.column_stack((self.phi_m, self.phi_m))
+        phi_st = np.column_stack((self.phi_st, self.phi_st))
+        phi_m[40, 1] = np.inf
+        results = pM.calcPortfolioDemand(phi_ia, phi_m, phi_st, self.theta_e,
+                                         self.theta_sup, self.theta_set_c,
+                                         self.theta_set_h, self.deadBand,
+                                         self.phi_h_max, self.phi_c_max,
+                                         self.theta_m_0, self.C_m, self.H_1,
+                                         self.H_2, self.H_3, self.H_em,
+                                         self.H_is, self.H_ms, self.H_vent,
+                                         self.H_win, strict = False)
+        flagged = np.argwhere(results['status'] & HR.STATUS_OUT_OF_RANGE)
+        self.assertEqual(flagged.tolist(), [[40, 1]])
+        self.assertTrue(np.allclose(HR.demandColumns(results)[:, 0],
+                                    self.runWrap(), atol = 1e-08))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,6 +19,12 @@ Created on Wed Jul 09 14:45:11 2014
 #             specified with more than 1 value.
 # calcPhi_genDis should meet all requirements of other heat functions.
 # calcQ_int   If arguments not  the same length raise ScheduleError.  
+# calcPhi_ocArray, calcPhi_genArray and calcPhi_genDisArray should accept one
+#             value per building and hourly schedules, and return buildings x
+#             hours arrays equal to the single building functions.  Else
+#             raise ScheduleError.
+# calcPhi_ocArray should take a 2-D activity level as buildings x hours and
+#             a 1-D one as one value per building, whatever its length.
 
 
 import unittest
@@ -74,6 +80,42 @@ class test_KnownValues(GainsTestData):
             res = ISO.calcQ_int(inp, inp, inp, inp, inp, inp, inp)
             self.assertTrue(np.allclose(res, out))
 
+    def test_KnownArrays(self):
+        dens = np.array([1., 2., 0.5])
+        area = np.array([10., 20., 30.])
+        schFra = np.linspace(0, 1, 24)
+        res = ISO.calcPhi_ocArray(dens, area, self.actLev, schFra)
+        res2 = ISO.calcPhi_genArray(dens, area, schFra)
+        res3 = ISO.calcPhi_genDisArray(-dens, area, schFra)
+        self.assertEqual(res.shape, (3, 24))
+        for i in range(3):
+            self.assertTrue(np.allclose(res[i],
+                            ISO.calcPhi_oc(dens[i], area[i], self.actLev,
+                                           schFra)))
+            self.assertTrue(np.allclose(res2[i],
+                            ISO.calcPhi_gen(dens[i], area[i], schFra)))
+            self.assertTrue(np.allclose(res3[i],
+                            ISO.calcPhi_genDis(-dens[i], area[i], schFra)))
+
+        # one schedule per building and an hourly activity level
+        schFra = np.vstack([schFra, 1 - schFra, 0.5*np.ones(24)])
+        res = ISO.calcPhi_ocArray(dens, 1., self.actLev*schFra, schFra)
+        self.assertTrue(np.allclose(res, dens.reshape((3, 1))*200*schFra**2))
+        res = ISO.calcPhi_genArray(self.dens, self.area, self.schFraLon)
+        self.assertEqual(res.shape, (1, 24))
+
+    def test_HourlyActivityLevel(self):
+        actLev = 100*np.linspace(0, 1, 24)
+        res = ISO.calcPhi_ocArray(0.1, 10., actLev[np.newaxis], np.ones(24))
+        self.assertEqual(res.shape, (1, 24))
+        self.assertTrue(np.allclose(res[0], ISO.calcPhi_oc(0.1, 10., actLev,
+                                                           np.ones(24))))
+        # one activity level per building, also for 24 buildings
+        res = ISO.calcPhi_ocArray(0.1, 10., actLev, np.ones(24))
+        self.assertTrue(np.allclose(res, actLev.reshape((24, 1))))
+        res = ISO.calcPhi_ocArray(0.1, np.ones(24), actLev, np.ones(24))
+        self.assertTrue(np.allclose(res, 0.1*actLev.reshape((24, 1))))
+
 class test_BadInput(GainsTestData):
     """
     Functions should fail for conditions specified in the requirements.
@@ -140,6 +182,21 @@ class test_BadInput(GainsTestData):
         res =  ISO.calcPhi_genDis(self.dens, self.dens, self.densLon)                                                        
     
         self.assertTrue(np.allclose(res, self.densLon))
+    def test_Arrays_BadInput(self):
+        dens = np.ones(3)
+        self.assertRaises(EC.ScheduleError, ISO.calcPhi_genArray, dens,
+                          np.ones(2), self.schFraLon)
+        self.assertRaises(EC.ScheduleError, ISO.calcPhi_genArray, dens,
+                          self.area, np.ones((2, 24)))
+        self.assertRaises(EC.ScheduleError, ISO.calcPhi_genArray, dens,
+                          self.area, self.SchFra)
+        self.assertRaises(EC.ScheduleError, ISO.calcPhi_ocArray, dens,
+                          self.area, -self.actLev, self.schFraLon)
+        self.assertRaises(EC.ScheduleError, ISO.calcPhi_ocArray, dens,
+                          self.area, np.ones((3, 12)), self.schFraLon)
+        self.assertRaises(EC.ScheduleError, ISO.calcPhi_genDisArray, dens,
+                          np.nan, self.schFraLon)
+
     def test_Q_int_BadInput(self):
 #        # Test that vectors all be same shape
         self.assertRaises(EC.ScheduleError, ISO.calcQ_int, self.densLon,
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:58:30 2026
+
+@author: mstreet
+"""
+# Requirements:
+# genOccupancy should return a buildings x hours array of fractions of the
+#              occupants present.
+# genOccupancy should follow the presence profile on average.
+# genOccupancy should give the same occupancy for a building whatever the
+#              other buildings of the call, and for any block of hours.
+# genOccupancy should raise ScheduleError for profiles outside of 0 to 1.
+# calcTransitions should keep the expected presence equal to the profile.
+
+import unittest
+import numpy as np
+import helpFncs as hF
+import occupancyModel as OM
+import annexCeqns as ISO
+from classes import errorClassesSHM as EC
+
+
+class OccupancyTestData(unittest.TestCase):
+    def setUp(self):
+        self.wd = np.hstack([np.zeros(8), 0.9*np.ones(10), 0.2*np.ones(6)])
+        self.we = np.hstack([np.zeros(10), 0.3*np.ones(4), np.zeros(10)])
+
+class OccupancyKnownValues(OccupancyTestData):
+
+    def test_Shape(self):
+        occ = OM.genOccupancy(self.wd, self.we, 3, nHours = 24*14,
+                              startDay = 2, nOccupants = 4)
+        self.assertEqual(occ.shape, (3, 24*14))
+        self.assertTrue(np.all(np.in1d(occ, [0, 0.25, 0.5, 0.75, 1])))
+        # nobody present at night
+        self.assertTrue(np.all(occ[:, :8] == 0))
+
+        gains = ISO.calcPhi_ocArray(0.1, 100., 100., occ)
+        self.assertEqual(gains.shape, occ.shape)
+
+    def test_MeanPresence(self):
+        occ = OM.genOccupancy(self.wd, self.we, 200, nHours = 24*7,
+                              startDay = 2, seed = 7)
+        profile = hF.stackSchedules(24*7, self.wd, self.we, 2)
+        self.assertTrue(np.allclose(occ.mean(axis = 0), profile,
+                                    atol = 0.05))
+
+    def test_Streams(self):
+        occ = OM.genOccupancy(self.wd, self.we, 6, nHours = 500, seed = 3)
+        part = OM.genOccupancy(self.wd, self.we, 2, nHours = 500, seed = 3,
+                               bldgIds = [4, 1], blockHours = 37)
+        self.assertTrue(np.all(part == occ[[4, 1]]))
+        other = OM.genOccupancy(self.wd, self.we, 6, nHours = 500, seed = 4)
+        self.assertFalse(np.all(other == occ))
+
+    def test_Transitions(self):
+        profile = np.array([[0.], [0.5], [0.9], [0.1], [0.]])
+        for mobility in [0.1, 0.5, 1.]:
+            T01, T11 = OM.calcTransitions(profile, mobility)
+            expected = profile[:-1]*T11 + (1 - profile[:-1])*T01
+            self.assertTrue(np.allclose(expected, profile[1:]))
+
+class OccupancyBadInput(OccupancyTestData):
+
+    def test_BadProfiles(self):
+        self.assertRaises(EC.ScheduleError, OM.genOccupancy, 2*self.wd,
+                          self.we, 2)
+        self.assertRaises(ValueError, OM.genOccupancy, self.wd, self.we, 2,
+                          bldgIds = [1])
+        self.assertRaises(ValueError, OM.genOccupancy, np.ones((24, 3)),
+                          np.ones((24, 3)), 2)
+
+if __name__ == '__main__':
+    unittest.main()
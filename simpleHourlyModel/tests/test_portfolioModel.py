@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:48:02 2026
+
+@author: mstreet
+"""
+# Requirements:
+# calcPortfolioDemand should return an n hours by N buildings by 4 array.
+# calcPortfolioDemand should give the same result for every building as
+#                     calcBuildingDemandWrap run for that building alone.
+# calcPortfolioDemand should accept a single weather series shared by all
+#                     buildings.
+# calcPortfolioDemand should raise TempOutOfBoundError for an out of range
+#                     temperature.
+# calcPortfolioDemand should accept set point profiles and hourly capacities
+#                     and match calcBuildingDemandWrap given the same.
+# calcPortfolioDemand should accept an hourly H_vent of n hours by N
+#                     buildings and match calcBuildingDemandWrap given the
+#                     same, also for the node temperatures written to out.
+
+import unittest
+import numpy as np
+import ISOsimpleHourlyModel as isoSHM
+import portfolioModel as pM
+import hourlyResults as HR
+import annexCeqns as ISO
+from classes import errorClassesSHM as EC
+
+
+class PortfolioTestData(unittest.TestCase):
+    """
+    Three buildings of different size, construction class and ventilation
+    driven by the same weather.
+
+    """
+    def setUp(self):
+        A_floor = np.array([1.0, 2.0, 1.5])
+        classNum = [1, 3, 5]
+        v_flo = np.array([0.01, 0.05, 0.02])
+        A_t = 4.5*A_floor
+        A_m = np.array([ISO.calcA_m(A_floor[i], classNum[i])
+                        for i in range(3)])
+        self.C_m = np.array([ISO.calcC_m(A_floor[i], classNum[i])
+                             for i in range(3)])
+        self.H_is = ISO.calcH_is(A_floor)
+        self.H_vent = ISO.calcH_vent(v_flo)
+        self.H_ms = ISO.calcH_ms(A_m)
+        self.H_win = np.array([1.0, 0.5, 2.0])
+        self.H_em = ISO.calcH_em(6.0*A_floor, self.H_ms)
+        self.H_1 = ISO.calcH_1(self.H_vent, self.H_is)
+        self.H_2 = ISO.calcH_2(self.H_1, self.H_win)
+        self.H_3 = ISO.calcH_3(self.H_2, self.H_ms)
+
+        self.theta_set_c = np.array([24.0, 25.0, 24.0])
+        self.theta_set_h = np.array([18.0, 20.0, 19.0])
+        self.deadBand = 0.5
+        self.phi_h_max = 60.0*A_floor
+        self.phi_c_max = -60.0*A_floor
+        self.theta_m_0 = 20.0
+
+        hours = np.arange(72)
+        self.theta_e = 15.0 + 15.0*np.sin(2*np.pi*(hours - 9)/24.)
+        self.theta_sup = self.theta_e.copy()
+        phi_int = 20.0*((hours%24 > 7) & (hours%24 < 18))
+        phi_sol = 40.0*np.clip(np.sin(2*np.pi*(hours - 6)/24.), 0, 1)
+        phi_int = np.outer(phi_int, A_floor)
+        phi_sol = np.outer(phi_sol, A_floor)
+        self.phi_ia = ISO.calcQ_ia(phi_int)
+        self.phi_m = ISO.calcQ_m(phi_int, phi_sol, A_m, A_t)
+        self.phi_st = ISO.calcQ_st(phi_int, phi_sol, A_m, A_t, self.H_win)
+
+    def runPortfolio(self, **kwargs):
+        return pM.calcPortfolioDemand(self.phi_ia, self.phi_m, self.phi_st,
+                                      self.theta_e, self.theta_sup,
+                                      self.theta_set_c, self.theta_set_h,
+                                      self.deadBand, self.phi_h_max,
+                                      self.phi_c_max, self.theta_m_0,
+                                      self.C_m, self.H_1, self.H_2, self.H_3,
+                                      self.H_em, self.H_is, self.H_ms,
+                                      self.H_vent, self.H_win, **kwargs)
+
+class PortfolioKnownOutput(PortfolioTestData):
+
+    def test_PortfolioMatchesWrap(self):
+        result = self.runPortfolio()
+        self.assertTrue(result.shape == (72, 3, 4))
+
+        for b in range(3):
+            wrap = isoSHM.calcBuildingDemandWrap(self.phi_ia[:, b],
+                                     self.phi_m[:, b], self.phi_st[:, b],
+                                     self.theta_e, self.theta_sup,
+                                     self.theta_set_c[b],
+                                     self.theta_set_h[b], self.deadBand,
+                                     self.phi_h_max[b], self.phi_c_max[b],
+                                     10.0, self.theta_m_0, self.C_m[b],
+                                     self.H_1[b], self.H_2[b], self.H_3[b],
+                                     self.H_em[b], self.H_is[b],
+                                     self.H_ms[b], self.H_vent[b],
+                                     self.H_win[b])
+            self.assertTrue(np.allclose(result[:, b, :], wrap,
+                                        atol = 1e-08))
+
+    def test_HourlySettings(self):
+        night = (np.arange(24) < 7) | (np.arange(24) > 18)
+        self.theta_set_h = (np.where(night, 15.0, 20.0), np.ones(24)*15.0)
+        # capacity halved in the second half of the period
+        capacity = np.outer(np.where(np.arange(72) < 36, 1.0, 0.5),
+                            self.phi_h_max)
+        self.phi_h_max = capacity
+        self.phi_c_max = -capacity
+        result = self.runPortfolio(startDay = 2)
+
+        for b in range(3):
+            wrap = isoSHM.calcBuildingDemandWrap(self.phi_ia[:, b],
+                                     self.phi_m[:, b], self.phi_st[:, b],
+                                     self.theta_e, self.theta_sup,
+                                     self.theta_set_c[b], self.theta_set_h,
+                                     self.deadBand, capacity[:, b],
+                                     -capacity[:, b], 10.0, self.theta_m_0,
+                                     self.C_m[b], self.H_1[b], self.H_2[b],
+                                     self.H_3[b], self.H_em[b],
+                                     self.H_is[b], self.H_ms[b],
+                                     self.H_vent[b], self.H_win[b],
+                                     startDay = 2)
+            self.assertTrue(np.allclose(result[:, b, :], wrap,
+                                        atol = 1e-08))
+
+    def test_HourlyVentilation(self):
+        hours = np.arange(72)
+        H_vent = np.outer(np.where((hours%24 > 7) & (hours%24 < 18), 2.0,
+                                   1.0), self.H_vent)
+        # the third building keeps a constant ventilation
+        H_vent[:, 2] = self.H_vent[2]
+        self.H_vent = H_vent
+        self.H_1 = self.H_2 = self.H_3 = None
+        result = self.runPortfolio()
+        out = self.runPortfolio(out = HR.createResults((72, 3)))
+        self.assertTrue(np.allclose(HR.demandColumns(out), result))
+
+        for b in range(3):
+            wrap = isoSHM.calcBuildingDemandWrap(self.phi_ia[:, b],
+                                     self.phi_m[:, b], self.phi_st[:, b],
+                                     self.theta_e, self.theta_sup,
+                                     self.theta_set_c[b],
+                                     self.theta_set_h[b], self.deadBand,
+                                     self.phi_h_max[b], self.phi_c_max[b],
+                                     10.0, self.theta_m_0, self.C_m[b],
+                                     None, None, None, self.H_em[b],
+                                     self.H_is[b], self.H_ms[b],
+                                     H_vent[:, b], self.H_win[b],
+                                     out = HR.createResults(72))
+            self.assertTrue(np.allclose(result[:, b, :],
+                                        HR.demandColumns(wrap),
+                                        atol = 1e-08))
+            for name in HR.NODE_FIELDS:
+                self.assertTrue(np.allclose(out[name][:, b], wrap[name],
+                                            atol = 1e-08))
+
+class PortfolioBadInput(PortfolioTestData):
+
+    def test_OutOfBoundTemp(self):
+        self.theta_sup[5] = -101.
+        self.assertRaises(EC.TempOutOfBoundError, self.runPortfolio)
+
+if __name__ == '__main__':
+    unittest.main()
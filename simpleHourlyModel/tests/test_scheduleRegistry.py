@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:20:48 2026
+
+@author: mstreet
+"""
+# Requirements:
+# ZoneSchedule     should only hold 24 fractions between 0 and 1.  Else raise
+#                  ScheduleError.
+# ScheduleRegistry should keep one ZoneSchedule for schedules with equal
+#                  fractions.
+# ScheduleRegistry should expand a pair of schedules once per start day and
+#                  period and hand out the same read-only array after that.
+# ScheduleRegistry should drop the least recently used array when full.
+# genIntGains      should give the same gains with or without a registry.
+
+import unittest
+import numpy as np
+import helpFncs as hF
+import genIntGains as gig
+import scheduleRegistry as SR
+from classes import modelClasses as MC
+from classes import errorClassesSHM as EC
+
+
+class RegistryTestData(unittest.TestCase):
+    def setUp(self):
+        self.wd = np.linspace(0, 1, 24)
+        self.we = 0.5*np.ones(24)
+        self.registry = SR.ScheduleRegistry(maxSize = 2)
+
+class RegistryKnownValues(RegistryTestData):
+
+    def test_Intern(self):
+        first = self.registry.intern(self.wd)
+        self.assertTrue(self.registry.intern(list(self.wd)) is first)
+        self.assertTrue(self.registry.intern(MC.ZoneSchedule(self.wd))
+                        is first)
+        self.assertFalse(self.registry.intern(self.we) is first)
+        self.assertEqual(len(self.registry), 2)
+
+    def test_Expand(self):
+        hourly = self.registry.expand(self.wd, self.we, stop = (1,14,24),
+                                      startDay = 3)
+        known = hF.stackSchedules(24*14, self.wd, self.we, 3)
+        self.assertTrue(np.all(hourly == known))
+        self.assertFalse(hourly.flags.writeable)
+
+        again = self.registry.expand(MC.ZoneSchedule(self.wd), self.we,
+                                     stop = (1,14,24), startDay = 3)
+        self.assertTrue(again is hourly)
+        self.assertEqual((self.registry.hits, self.registry.misses), (1, 1))
+
+        # a start hour within the day
+        part = self.registry.expand(self.wd, self.we, start = (1,1,5),
+                                    stop = (1,14,24), startDay = 3)
+        self.assertTrue(np.all(part == known[4:]))
+
+    def test_Eviction(self):
+        first = self.registry.expand(self.wd, self.we, stop = (1,7,24))
+        self.registry.expand(self.wd, self.we, stop = (1,8,24))
+        # use the first array again, the second is now the oldest
+        self.registry.expand(self.wd, self.we, stop = (1,7,24))
+        self.registry.expand(self.wd, self.we, stop = (1,9,24))
+        self.assertEqual(len(self.registry.cache), 2)
+        self.assertTrue(self.registry.expand(self.wd, self.we,
+                                             stop = (1,7,24)) is first)
+        self.assertEqual(self.registry.misses, 3)
+
+    def test_GainsWithRegistry(self):
+        args = dict(A_floor = 10, occDen = 0.1, actLev = 100,
+                    oc_schd_wd = self.wd, oc_schd_we = self.we,
+                    appDen = 10, outAir = 10,
+                    app_schd_wd = self.we, app_schd_we = self.we,
+                    lightDen = 5, light_schd_wd = self.wd,
+                    light_schd_we = self.wd, start = (1,1,3),
+                    stop = (2,1,24), startDay = 2)
+        known = gig.genIntGains(**args)
+        registry = SR.ScheduleRegistry()
+        for i in range(2):
+            result = gig.genIntGains(registry = registry, **args)
+            self.assertTrue(np.allclose(result, known))
+        self.assertEqual(registry.misses, 3)
+        self.assertEqual(registry.hits, 3)
+
+class RegistryBadInput(RegistryTestData):
+
+    def test_BadSchedules(self):
+        self.assertRaises(EC.ScheduleError, MC.ZoneSchedule, np.ones(12))
+        self.assertRaises(EC.ScheduleError, MC.ZoneSchedule, 2*self.wd)
+        self.assertRaises(ValueError, SR.ScheduleRegistry, 0)
+        self.assertRaises(ValueError, self.registry.expand, self.wd,
+                          self.we, stop = (2,29,1))
+
+if __name__ == '__main__':
+    unittest.main()
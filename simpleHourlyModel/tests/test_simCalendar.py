@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:31:14 2026
+
+@author: mstreet
+"""
+# Requirements:
+# SimulationCalendar should cover every hour from start to stop over year
+#                    boundaries, with 8784 hours in leap years.
+# SimulationCalendar should give the date, hour, day of year and day of week
+#                    of every hour.
+# SimulationCalendar should flag the hours of US daylight saving time when
+#                    asked to, and none by default.
+# SimulationCalendar should raise ValueError for dates that do not exist.
+# stackSchedules     should follow the local clock during daylight saving
+#                    time and match helpFncs.stackScheduleArray without it.
+# calcBuildingDemandWrap should accept a calendar for settings given as
+#                    weekday and weekend profiles.
+
+import unittest
+import numpy as np
+import simCalendar as SC
+import helpFncs as hF
+from test_demandWrap import DemandWrapTestData
+
+
+class CalendarKnownValues(unittest.TestCase):
+
+    def test_MultiYear(self):
+        cal = SC.SimulationCalendar((2015, 1, 1, 1), (2017, 12, 31, 24))
+        self.assertEqual(len(cal), 8760 + 8784 + 8760)
+        self.assertEqual(list(cal.yearStarts()), [0, 8760, 8760 + 8784])
+        self.assertEqual(cal.hourOfYear.max(), 8784)
+
+        # 29 February 2016, hour 13, was a Monday
+        leapDay = 8760 + (31 + 28)*24 + 12
+        self.assertEqual((cal.year[leapDay], cal.month[leapDay],
+                          cal.day[leapDay], cal.hour[leapDay]),
+                         (2016, 2, 29, 13))
+        self.assertEqual(cal.dayOfYear[leapDay], 60)
+        self.assertEqual(cal.dayOfWeek[leapDay], 2)
+        # 1 January 2015 was a Thursday
+        self.assertEqual(cal.startDay, 5)
+        self.assertTrue(np.all(cal.dayOfWeek ==
+                               hF.genDayIndex(cal.startDay, len(cal))))
+
+    def test_DaylightSaving(self):
+        cal = SC.SimulationCalendar((2016, 1, 1, 1), (2016, 12, 31, 24),
+                                    dst = 'us')
+        # 13 March 2016 2 am to 6 November 2016 1 am standard time
+        first = ((31 + 29 + 12)*24 + 2, (31 + 29 + 31 + 30 + 31 + 30 + 31 +
+                                         31 + 30 + 31 + 5)*24 + 1)
+        self.assertEqual(list(np.flatnonzero(np.diff(cal.dst)) + 1),
+                         list(first))
+        noDst = SC.SimulationCalendar((2016, 1, 1, 1), (2016, 12, 31, 24))
+        self.assertFalse(np.any(noDst.dst))
+        self.assertTrue(np.all(noDst.stackSchedules(np.arange(24),
+                                                    np.arange(24) + 100) ==
+                               noDst.stackSchedules(np.arange(24),
+                                                    np.arange(24) + 100,
+                                                    localTime = False)))
+
+    def test_StackSchedules(self):
+        cal = SC.SimulationCalendar((2016, 3, 6, 1), (2016, 3, 26, 24),
+                                    dst = 'us')
+        wd = np.arange(24*2).reshape((24, 2))
+        we = 100 + wd
+        standard = cal.stackSchedules(wd, we, localTime = False)
+        self.assertTrue(np.all(standard ==
+                               hF.stackScheduleArray(len(cal), wd, we,
+                                                     cal.startDay)))
+        local = cal.stackSchedules(wd, we)
+        self.assertTrue(np.all(local[cal.dst][:-1] ==
+                               standard[cal.dst][1:]))
+        self.assertTrue(np.all(local[~cal.dst] == standard[~cal.dst]))
+
+class CalendarExceptions(unittest.TestCase):
+
+    def test_InvalidDates(self):
+        self.assertRaises(ValueError, SC.SimulationCalendar,
+                          (2015, 2, 29, 1), (2015, 3, 1, 1))
+        self.assertRaises(ValueError, SC.SimulationCalendar,
+                          (2015, 1, 1, 0), (2015, 3, 1, 1))
+        self.assertRaises(ValueError, SC.SimulationCalendar,
+                          (2015, 3, 1, 1), (2015, 1, 1, 1))
+        self.assertRaises(ValueError, SC.SimulationCalendar,
+                          (2015, 1, 1, 1), (2015, 3, 1, 1), dst = 'eu')
+
+class CalendarDemand(DemandWrapTestData):
+
+    def test_WrapWithCalendar(self):
+        # Friday to Sunday, outside of daylight saving time
+        cal = SC.SimulationCalendar((2015, 1, 2, 1), (2015, 1, 4, 24))
+        self.theta_set_h = (np.ones(24)*20.0, np.ones(24)*12.0)
+        result = self.runWrap(calendar = cal)
+        known = self.runWrap(startDay = 6)
+        self.assertTrue(np.allclose(result, known))
+
+        short = SC.SimulationCalendar((2015, 1, 2, 1), (2015, 1, 3, 24))
+        self.assertRaises(ValueError, self.runWrap, calendar = short)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:10:47 2026
+
+@author: mstreet
+"""
+# Requirements:
+# surfaceIrradiationArray should give the beam, diffuse and ground reflected
+#                         irradiation of tiltedIrradiation for every surface
+#                         and hour, as surfaces x hours arrays.
+# surfaceIrradiationArray should fill a given out array in place.
+# surfaceIrradiationArray should raise ValueError for mismatched surfaces,
+#                         hours or out arrays.
+# tiltedIrradiation       should return the same TiltedSurface type on every
+#                         call.
+# siteTimeTerms           should give cosTheta of Iqbal eqn. 1.6.5a with
+#                         orientationTerms, and cosTheta_z as its first term.
+# uniqueOrientations      should give the distinct (tilt, azimuth) pairs and
+#                         the orientation of every surface.
+# surfaceDirectIrradiation should give no beam with the sun below the horizon
+#                         or behind the surface, and a bounded beam near
+#                         sunrise and sunset.
+
+import unittest
+import numpy as np
+from pysolsurface import solarEqns as se
+from pysolsurface import solarPosition as sp
+
+
+class IrradiationTestData(unittest.TestCase):
+
+    def setUp(self):
+        self.lat = 37.8
+        self.tilt = np.array([90., 90., 90., 90., 0., 30.])
+        self.azi = np.array([0., 90., 180., -90., 0., 45.])
+        self.rho = 0.2
+        # one summer and one winter morning, from before sunrise
+        hours = np.concatenate((np.arange(4200, 4212), np.arange(100, 108)))
+        table = sp.calcPositionTable(self.lat, -122.3, -8)
+        self.decAng = table.decAng[hours]
+        self.HRA = table.HRA[hours]
+        self.DNI = np.linspace(200., 800., len(hours))
+        self.DHI = np.linspace(50., 150., len(hours))
+
+    def runArray(self, out = None):
+        return se.surfaceIrradiationArray(self.lat, self.tilt, self.azi,
+                                          self.rho, self.DNI, self.DHI,
+                                          self.decAng, self.HRA, out = out)
+
+class IrradiationKnownValues(IrradiationTestData):
+
+    def test_MatchSurfaceIrradiation(self):
+        result = self.runArray()
+        self.assertEqual(result.Ibeam.shape, (len(self.tilt), len(self.DNI)))
+        for k in range(len(self.tilt)):
+            for n in range(len(self.DNI)):
+                known = se.tiltedIrradiation(self.lat, self.tilt[k],
+                                             self.azi[k], self.rho,
+                                             self.DNI[n], self.DHI[n],
+                                             self.decAng[n], self.HRA[n])
+                self.assertTrue(np.allclose([result.Ibeam[k, n],
+                                             result.Idiff[k, n],
+                                             result.Irec[k, n]], known))
+
+    def test_OutBuffer(self):
+        out = np.empty((3, len(self.tilt), len(self.DNI)))
+        result = self.runArray(out = out)
+        self.assertTrue(np.may_share_memory(result.Ibeam, out))
+        self.assertTrue(np.all(out[0] == result.Ibeam))
+        self.assertTrue(np.all(out[2] == result.Irec))
+        self.assertTrue(np.allclose(out, np.array(self.runArray())))
+
+    def test_NamedTupleType(self):
+        first = se.tiltedIrradiation(self.lat, 90., 0., self.rho, 500., 100.,
+                                     10., 15.)
+        second = se.tiltedIrradiation(self.lat, 0., 0., self.rho, 500., 100.,
+                                      10., 15.)
+        self.assertTrue(type(first) is type(second) is se.TiltedSurface)
+        self.assertTrue(type(self.runArray()) is se.TiltedSurface)
+
+    def test_OrientationFactoring(self):
+        lat, dec, HRA = np.radians([self.lat, self.decAng[3], self.HRA[3]])
+        tilt = np.radians(self.tilt)
+        azi = np.radians(self.azi)
+        known = ((np.sin(lat)*np.cos(tilt) -
+                  np.cos(lat)*np.sin(tilt)*np.cos(azi))*np.sin(dec) +
+                 (np.cos(lat)*np.cos(tilt) +
+                  np.sin(lat)*np.sin(tilt)*np.cos(azi))*np.cos(dec)*np.cos(HRA)
+                 + np.cos(dec)*np.sin(tilt)*np.sin(azi)*np.sin(HRA))
+        siteTerms = se.siteTimeTerms(self.lat, self.decAng[3], self.HRA[3])
+        cosTheta = se.orientationTerms(self.tilt, self.azi).T.dot(siteTerms)
+        self.assertTrue(np.allclose(cosTheta, known))
+        self.assertTrue(np.isclose(siteTerms[0],
+                                   np.sin(dec)*np.sin(lat) +
+                                   np.cos(dec)*np.cos(lat)*np.cos(HRA)))
+
+        siteTerms = se.siteTimeTerms(self.lat, self.decAng, self.HRA)
+        self.assertEqual(siteTerms.shape, (3, len(self.DNI)))
+        result = self.runArray()
+        given = se.surfaceIrradiationArray(self.lat, self.tilt, self.azi,
+                                           self.rho, self.DNI, self.DHI, None,
+                                           None, siteTerms = siteTerms)
+        self.assertTrue(np.allclose(np.array(given), np.array(result)))
+
+    def test_UniqueOrientations(self):
+        tilt = [90., 0., 90., 90., 0.]
+        azi = [0., 0., 90., 0., 0.]
+        uTilt, uAzi, inverse = se.uniqueOrientations(tilt, azi)
+        self.assertEqual(len(uTilt), 3)
+        self.assertEqual(list(uTilt[inverse]), tilt)
+        self.assertEqual(list(uAzi[inverse]), azi)
+
+    def test_SunUpMask(self):
+        result = self.runArray()
+        siteTerms = se.siteTimeTerms(self.lat, self.decAng, self.HRA)
+        night = siteTerms[0] <= 0
+        self.assertTrue(np.any(night) and not np.all(night))
+        self.assertTrue(np.all(result.Ibeam[:, night] == 0))
+        self.assertTrue(np.all(result.Ibeam >= 0))
+        # the north wall only sees the sun in the summer morning
+        self.assertTrue(np.all(result.Ibeam[2, 12:] == 0))
+        self.assertTrue(np.any(result.Ibeam[2, :12] > 0))
+
+        # sun just above the horizon, in front of an east wall
+        grazing = se.surfaceDirectIrradiation(0., 0., 90., 90., 89.99, 100.)
+        self.assertTrue(0 < grazing <= 100./se.MIN_COS_ZENITH)
+        self.assertEqual(se.surfaceDirectIrradiation(0., 0., 90., 90., 95.,
+                                                     100.), 0)
+        # afternoon sun behind the east wall
+        self.assertEqual(se.surfaceDirectIrradiation(0., 0., 90., 90., -60.,
+                                                     100.), 0)
+
+class IrradiationBadInput(IrradiationTestData):
+
+    def test_BadShapes(self):
+        self.azi = self.azi[:-1]
+        self.assertRaises(ValueError, self.runArray)
+        self.setUp()
+        self.DHI = self.DHI[:-1]
+        self.assertRaises(ValueError, self.runArray)
+        self.setUp()
+        self.assertRaises(ValueError, self.runArray,
+                          np.empty((3, len(self.DNI), len(self.tilt))))
+        self.assertRaises(ValueError, self.runArray,
+                          np.empty((3, len(self.tilt), len(self.DNI)),
+                                   dtype = np.float32))
+        self.assertRaises(ValueError, se.surfaceIrradiationArray, self.lat,
+                          self.tilt, self.azi, self.rho, self.DNI, self.DHI,
+                          None, None, siteTerms = np.zeros((3, 5)))
+
+if __name__ == '__main__':
+    unittest.main()
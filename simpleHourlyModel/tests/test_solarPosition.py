@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:35:02 2026
+
+@author: mstreet
+"""
+# Requirements:
+# calcPositionTable should give the declination, equation of time and hour
+#                   angle of solarEqns for every hour of the year.
+# calcPositionTable should shift the hour angle by an hour in daylight saving
+#                   time, and have 8784 hours in leap years.
+# calcPositionTable should hold the siteTimeTerms of every hour.
+# calcPositionTable should average the beam terms over nSub points of every
+#                   hour, and take them at the midpoint for nSub = 1.
+# positionTable     should calculate the table of a site once, share it
+#                   read-only, and save it to and load it from a cache
+#                   directory, recalculating files without all fields, of
+#                   another TABLE_VERSION or that cannot be read.
+# genSolGains       should use the daylight saving time of the site with
+#                   start and stop and with a calendar.
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import getSolGains as gsg
+import simCalendar as SC
+from pysolsurface import solarEqns as se
+from pysolsurface import solarPosition as sp
+from test_genSolGains import SolarTestData
+
+
+class PositionKnownValues(unittest.TestCase):
+
+    def setUp(self):
+        sp.tableCache.clear()
+        self.site = (37.8, -122.3, -8)
+
+    def test_MatchesSolarEqns(self):
+        table = sp.calcPositionTable(*self.site)
+        hours = np.arange(8760)
+        dayAng = se.dayAngle(hours//24 + 1)
+        EoT = se.eqnOfTime(dayAng)
+        TC = se.timeCorrectionFactor(self.site[1], EoT, self.site[2], 0)
+        HRA = se.hourAngle(se.localSolarTime(hours%24 + 0.5, TC))
+        self.assertTrue(np.allclose(table.decAng, se.declinAng(dayAng)))
+        self.assertTrue(np.allclose(table.EoT, EoT))
+        self.assertTrue(np.allclose(table.HRA, HRA))
+        self.assertTrue(np.allclose(table.siteTerms,
+                                    se.siteTimeTerms(self.site[0],
+                                                     table.decAng, HRA)))
+        self.assertTrue(np.all(table.beamTerms ==
+                               se.beamRatioTerms(table.siteTerms)))
+
+    def test_SubHourPoints(self):
+        table = sp.calcPositionTable(*self.site, nSub = 60)
+        midpoint = sp.calcPositionTable(*self.site)
+        # sunrise to the morning of 21 June, in front of an east wall
+        rows = 171*24 + np.arange(3, 11)
+        east = se.orientationTerms(90., 90.)
+        beam = np.maximum(east.dot(table.beamTerms[:, rows]), 0)
+        # the hour angle decreases by 15 degrees over the hour
+        minutes = (np.arange(60) + 0.5)/60. - 0.5
+        known = [np.mean(se.surfaceDirectIrradiation(table.decAng[row],
+                                                     self.site[0], 90., 90.,
+                                                     table.HRA[row] -
+                                                     15*minutes, 1.))
+                 for row in rows]
+        self.assertTrue(np.allclose(beam, known))
+        self.assertEqual(beam[0], 0)
+        # the sun rises during the second hour, after its midpoint
+        self.assertTrue(beam[1] > 0)
+        self.assertEqual(midpoint.beamTerms[0, rows[1]], 0)
+        # the morning sun stays behind a west wall
+        west = se.orientationTerms(90., -90.)
+        self.assertTrue(np.all(west.dot(table.beamTerms[:, rows]) <= 0))
+        self.assertTrue(np.allclose(table.decAng, midpoint.decAng))
+
+        self.assertRaises(ValueError, sp.positionTable, *self.site, nSub = 0)
+        self.assertFalse(sp.positionTable(*self.site, nSub = 4) is
+                         sp.positionTable(*self.site))
+
+    def test_DstAndLeapYears(self):
+        table = sp.calcPositionTable(*self.site)
+        dst = sp.calcPositionTable(*self.site, dstPeriod = (100, 200))
+        # the clock runs ahead, so the sun is an hour further to the east
+        self.assertTrue(np.allclose(dst.HRA[100:200] - table.HRA[100:200],
+                                    15))
+        self.assertTrue(np.allclose(table.HRA[200:], dst.HRA[200:]))
+        self.assertEqual(len(sp.calcPositionTable(*self.site,
+                                                  year = 2016).HRA), 8784)
+        self.assertEqual(len(sp.calcPositionTable(*self.site,
+                                                  year = 2100).HRA), 8760)
+
+    def test_Cache(self):
+        table = sp.positionTable(*self.site)
+        self.assertTrue(sp.positionTable(*self.site) is table)
+        self.assertFalse(table.HRA.flags.writeable)
+
+        cacheDir = tempfile.mkdtemp()
+        try:
+            saved = sp.positionTable(*self.site, year = 2015,
+                                     cacheDir = cacheDir)
+            self.assertEqual(len(os.listdir(cacheDir)), 1)
+            sp.tableCache.clear()
+            loaded = sp.positionTable(*self.site, year = 2015,
+                                      cacheDir = cacheDir)
+            self.assertFalse(loaded is saved)
+            for name in sp.SolarPosition._fields:
+                self.assertTrue(np.all(getattr(loaded, name) ==
+                                       getattr(saved, name)))
+
+            # a file of an older table without the site terms
+            path = os.path.join(cacheDir, os.listdir(cacheDir)[0])
+            key = sp.positionKey(*self.site, year = 2015)
+            np.savez(path, key = repr(key), version = sp.TABLE_VERSION,
+                     decAng = saved.decAng, EoT = saved.EoT, HRA = saved.HRA)
+            self.assertTrue(sp.loadTable(path, key) is None)
+            # a file of an older version, with the hour angle sign flipped
+            np.savez(path, key = repr(key), **saved._replace(
+                HRA = -saved.HRA)._asdict())
+            self.assertTrue(sp.loadTable(path, key) is None)
+            sp.tableCache.clear()
+            loaded = sp.positionTable(*self.site, year = 2015,
+                                      cacheDir = cacheDir)
+            self.assertTrue(np.all(loaded.siteTerms == saved.siteTerms))
+            self.assertFalse(sp.loadTable(path, key) is None)
+
+            # a partly written file
+            with open(path, 'rb') as tableFile:
+                content = tableFile.read()
+            for size in [0, 100, len(content)//2]:
+                with open(path, 'wb') as tableFile:
+                    tableFile.write(content[:size])
+                self.assertTrue(sp.loadTable(path, key) is None)
+            sp.tableCache.clear()
+            loaded = sp.positionTable(*self.site, year = 2015,
+                                      cacheDir = cacheDir)
+            self.assertTrue(np.all(loaded.HRA == saved.HRA))
+            self.assertFalse(sp.loadTable(path, key) is None)
+            # no temporary files are left behind
+            self.assertEqual(os.listdir(cacheDir), [os.path.basename(path)])
+        finally:
+            shutil.rmtree(cacheDir)
+
+class PositionSolarGains(SolarTestData):
+
+    def test_DaylightSaving(self):
+        known = gsg.genSolGains(self.building, self.site, self.start,
+                                self.stop, DNI = self.DNI, DHI = self.DHI)
+        # daylight saving time over the whole period moves the sun an hour
+        self.site.DST = 1
+        self.site.DSTstart = (1,1,1)
+        self.site.DSTstop = (12,31,24)
+        result = gsg.genSolGains(self.building, self.site, self.start,
+                                 self.stop, DNI = self.DNI, DHI = self.DHI)
+        shifted = self.loopGains(range(14*24, 16*24), dst = 1)
+        self.assertTrue(np.allclose(result, shifted))
+        self.assertFalse(np.allclose(result, known))
+
+    def test_Calendar(self):
+        known = gsg.genSolGains(self.building, self.site, self.start,
+                                self.stop, DNI = self.DNI, DHI = self.DHI)
+        cal = SC.SimulationCalendar((2015, 1, 15, 1), (2015, 1, 16, 24))
+        result = gsg.genSolGains(self.building, self.site, DNI = self.DNI,
+                                 DHI = self.DHI, calendar = cal)
+        self.assertTrue(np.allclose(result, known))
+
+    def test_CalendarDaylightSaving(self):
+        self.site.DST = 1
+        self.site.DSTstart = (1,1,1)
+        self.site.DSTstop = (12,31,24)
+        known = gsg.genSolGains(self.building, self.site, self.start,
+                                self.stop, DNI = self.DNI, DHI = self.DHI)
+        cal = SC.SimulationCalendar((2015, 1, 15, 1), (2015, 1, 16, 24))
+        result = gsg.genSolGains(self.building, self.site, DNI = self.DNI,
+                                 DHI = self.DHI, calendar = cal)
+        self.assertTrue(np.allclose(result, known))
+
+        # the period is counted in the days of every year
+        self.site.DSTstart = (3,1,1)
+        self.assertEqual(gsg.calcDstPeriod(self.site)[0], 59*24)
+        self.assertEqual(gsg.calcDstPeriod(self.site, 2016),
+                         (60*24, 8784 - 1))
+
+if __name__ == '__main__':
+    unittest.main()
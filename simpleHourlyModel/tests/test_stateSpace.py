@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:58:50 2026
+
+@author: mstreet
+"""
+# Requirements:
+# calcDriverTerms should reproduce the free floating mass and air temperature
+#                 of buildingCoeffs.stepFreeFloat as a*theta + b, p*theta + r.
+# runStateSpace   should raise TempOutOfBoundError when the mass temperature
+#                 leaves the range -100 to 100 C.
+# scanFreeFloat   should give the same mass temperatures as the free floating
+#                 recurrence solved hour by hour.
+# runStateSpace   should give the same result with and without solving blocks
+#                 of free floating hours with scanFreeFloat.
+
+import unittest
+import numpy as np
+import annexCeqns as ISO
+import buildingCoeffs as BC
+import stateSpace as SS
+from classes import errorClassesSHM as EC
+
+
+class StateSpaceTestData(unittest.TestCase):
+    def setUp(self):
+        self.coef = BC.BuildingCoefficients(C_m = 165000.0,
+                                            H_em = ISO.calcH_em(6.0, 22.75),
+                                            H_is = ISO.calcH_is(1.0),
+                                            H_ms = 22.75,
+                                            H_vent = 12.0,
+                                            H_win = 1.0)
+        self.ss = SS.StateSpaceCoefficients(self.coef)
+
+        hours = np.arange(96)
+        self.theta_e = 15.0 + 15.0*np.sin(2*np.pi*(hours - 9)/24.)
+        self.theta_sup = self.theta_e + 2.0
+        self.phi_ia = 10.0*((hours%24 > 7) & (hours%24 < 18))
+        self.phi_m = 8.0*np.clip(np.sin(2*np.pi*(hours - 6)/24.), 0, 1)
+        self.phi_st = 0.5*self.phi_m + 3.0
+        self.theta_set_c = np.where(hours%24 < 12, 24.0, 26.0)
+        self.theta_set_h = np.where(hours%24 < 12, 18.0, 16.0)
+        self.deadBand = 0.5
+        self.phi_h_max = 60.0
+        self.phi_c_max = -60.0
+
+class StateSpaceKnownOutput(StateSpaceTestData):
+
+    def test_DriverTerms(self):
+        theta_m_t_1 = np.linspace(-5., 35., len(self.theta_e))
+        b, r = SS.calcDriverTerms(self.ss, self.phi_ia, self.phi_m,
+                                  self.phi_st, self.theta_e, self.theta_sup)
+        known = BC.stepFreeFloat(self.coef, self.phi_ia, self.phi_m,
+                                 self.phi_st, self.theta_e, theta_m_t_1,
+                                 self.theta_sup)
+        self.assertTrue(np.allclose(self.ss.a*theta_m_t_1 + b, known[0]))
+        self.assertTrue(np.allclose(self.ss.p*theta_m_t_1 + r, known[1]))
+
+    def test_ScanFreeFloat(self):
+        b, r = SS.calcDriverTerms(self.ss, self.phi_ia, self.phi_m,
+                                  self.phi_st, self.theta_e, self.theta_sup)
+        n = SS.calcScanLength(self.ss.a, 168)
+        self.assertTrue(n > 1)
+        self.assertTrue(abs(self.ss.a)**-n <= 1e6)
+
+        known = []
+        theta = 20.0
+        for hour in range(n):
+            theta = self.ss.a*theta + b[hour]
+            known.append(theta)
+        self.assertTrue(np.allclose(SS.scanFreeFloat(self.ss.a, 20.0, b[:n]),
+                                    known))
+
+    def test_ScanMatchesSingleStep(self):
+        b, r = SS.calcDriverTerms(self.ss, self.phi_ia, self.phi_m,
+                                  self.phi_st, self.theta_e, self.theta_sup)
+        # set back to a wide band for the last two days
+        set_c = np.where(np.arange(96) < 48, self.theta_set_c, 35.0)
+        set_h = np.where(np.arange(96) < 48, self.theta_set_h, 5.0)
+        for setPoints in [(set_c, set_h), (60.0, -60.0),
+                          (self.theta_set_c, self.theta_set_h)]:
+            args = (self.ss, b, r, np.ones(96)*setPoints[0],
+                    np.ones(96)*setPoints[1], self.deadBand, self.phi_h_max,
+                    self.phi_c_max, 20.0)
+            scan = SS.runStateSpace(*args)
+            single = SS.runStateSpace(*args, scanBlock = 0)
+            self.assertTrue(np.allclose(scan, single, atol = 1e-08))
+
+class StateSpaceBadInput(StateSpaceTestData):
+
+    def test_OutOfBoundTemp(self):
+        b, r = SS.calcDriverTerms(self.ss, self.phi_ia, self.phi_m,
+                                  self.phi_st, self.theta_e, self.theta_sup)
+        self.assertRaises(EC.TempOutOfBoundError, SS.runStateSpace, self.ss,
+                          b, r, self.theta_set_c, self.theta_set_h,
+                          self.deadBand, self.phi_h_max, self.phi_c_max,
+                          150.0)
+
+if __name__ == '__main__':
+    unittest.main()